@@ -0,0 +1,93 @@
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from starlette.concurrency import run_in_threadpool
+from typing import Literal
+import asyncio
+from app.config import settings
+from app.models.file_upload import FileType
+from app.models.ingest_job import JobStatus
+from app.services import batch_ingest, ingest
+from app.utils.auth import get_current_admin_user
+from app.utils.file_handler import too_large
+from app.models.user import User
+
+router = APIRouter(prefix="/api/admin/batch", tags=["admin-batch"])
+
+# File types are written one after another (one transaction each) in this order
+WRITE_ORDER = [
+    FileType.REVENUE.value,
+    FileType.PAYMENTS.value,
+    FileType.SYSTEM_PERFORMANCE.value,
+    FileType.EMPLOYEE_DATA.value,
+]
+
+
+@router.post("/upload")
+async def upload_batch(
+    file: UploadFile = File(...),
+    payments_mode: Literal["latest", "history"] = Query("latest"),
+    employees_mode: Literal["upsert", "delta"] = Query("upsert"),
+    force: bool = Query(False),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Upload a zip of revenue, payments, system performance and employee files.
+    Each file is identified by its sheets / columns and all are parsed in
+    parallel; each file type is then committed in one transaction. Returns a
+    result (or error) per file. payments_mode / employees_mode are the `mode`
+    options of the single-file endpoints.
+    """
+    if not file.filename.lower().endswith('.zip'):
+        raise HTTPException(status_code=400, detail="File must be a .zip archive")
+
+    # Read from the request's spooled file; members are extracted to the store as they are read
+    if file.size is not None and file.size > settings.max_file_size_mb * 1024 * 1024:
+        raise too_large(file.filename)
+    try:
+        members = await run_in_threadpool(
+            batch_ingest.read_archive,
+            file.file,
+            settings.batch_max_total_mb * 1024 * 1024,
+            settings.batch_max_files,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    options = {
+        FileType.PAYMENTS.value: {"mode": payments_mode},
+        FileType.EMPLOYEE_DATA.value: {"mode": employees_mode},
+    }
+    parsed = await asyncio.gather(
+        *(ingest.run_in_pool(batch_ingest.parse_member, member.saved.path, options) for member in members),
+        return_exceptions=True,
+    )
+
+    results = []
+    by_type = {}
+    for member, outcome in zip(members, parsed):
+        if isinstance(outcome, BaseException):
+            outcome = {"file_type": None, "error": f"Ingest worker failed: {outcome}"}
+        if "error" in outcome:
+            results.append({"filename": member.name, "file_type": outcome["file_type"],
+                            "status": JobStatus.FAILED, "error": outcome["error"]})
+        else:
+            by_type.setdefault(outcome["file_type"], []).append((member, outcome["parsed"]))
+
+    for file_type in WRITE_ORDER:
+        if file_type not in by_type:
+            continue
+        type_members, type_parsed = zip(*by_type[file_type])
+        results.extend(await run_in_threadpool(
+            batch_ingest.write_file_type,
+            file_type,
+            list(type_members),
+            list(type_parsed),
+            options.get(file_type, {}),
+            current_user.email,
+            force,
+        ))
+
+    succeeded = sum(1 for result in results if result["status"] == JobStatus.SUCCEEDED)
+    return {
+        "message": f"Processed {succeeded} of {len(results)} files",
+        "files": sorted(results, key=lambda result: result["filename"]),
+    }
@@ -0,0 +1,255 @@
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from datetime import datetime, timezone
+import hashlib
+import uuid
+from app.database import get_db
+from app.models.file_upload import FileType
+from app.models.upload_session import UploadChunk, UploadSession, UploadStatus
+from app.schemas.upload_session import UploadSessionCreate, UploadSessionResponse
+from app.services import chunked_uploads
+from app.services.uploads import stored_upload
+from app.utils.file_handler import max_upload_mb, too_large
+from app.api.jobs import queue_ingest
+from app.api.slideshow import use_uploaded_deck
+from app.utils.auth import get_current_admin_user
+from app.models.user import User
+
+router = APIRouter(prefix="/api/admin/uploads", tags=["admin-uploads"])
+
+
+def _session_response(db: Session, session: UploadSession) -> UploadSessionResponse:
+    received = chunked_uploads.received_chunks(db, session.id)
+    have = set(received)
+    # Chunk rows are dropped on completion; only an open session can be missing chunks
+    missing = [index for index in range(chunked_uploads.chunk_count(session)) if index not in have] \
+        if session.status == UploadStatus.OPEN else []
+    return UploadSessionResponse(
+        id=session.id,
+        filename=session.filename,
+        file_type=session.file_type,
+        size=session.size,
+        chunk_size=session.chunk_size,
+        chunk_count=chunked_uploads.chunk_count(session),
+        status=session.status,
+        received=received,
+        missing=missing,
+        file_upload_id=session.file_upload_id,
+        error_message=session.error_message,
+        created_at=session.created_at,
+        completed_at=session.completed_at,
+    )
+
+
+def _get_session(db: Session, upload_id: str) -> UploadSession:
+    session = db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return session
+
+
+def _fail(
+    db: Session, session: UploadSession, status_code: int, message: str, expected: str = UploadStatus.OPEN
+) -> HTTPException:
+    """
+    Mark the session failed and drop its partial file, but only if it is
+    still ``expected`` (checked atomically): a session another request has
+    claimed or completed is left alone. Returns the HTTPException to raise.
+    """
+    failed = db.query(UploadSession).filter(
+        UploadSession.id == session.id, UploadSession.status == expected
+    ).update({UploadSession.status: UploadStatus.FAILED, UploadSession.error_message: message[:500]},
+             synchronize_session=False)
+    db.commit()
+    if failed:
+        chunked_uploads.discard(session.id)
+    return HTTPException(status_code=status_code, detail=message)
+
+
+@router.post("", response_model=UploadSessionResponse, status_code=201)
+async def create_upload(
+    body: UploadSessionCreate,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Start a resumable upload of a slideshow deck or a dashboard file. Send the
+    chunks with PUT /{id}/chunks?offset=..., then POST /{id}/complete.
+    """
+    extensions = chunked_uploads.ACCEPTED_EXTENSIONS.get(body.file_type)
+    if extensions is None:
+        raise HTTPException(status_code=400, detail=f"Chunked uploads are not supported for file type {body.file_type!r}")
+    if not body.filename.lower().endswith(extensions):
+        raise HTTPException(status_code=400, detail=f"File must be one of: {', '.join(extensions)}")
+    if body.size <= 0:
+        raise HTTPException(status_code=400, detail="size must be positive")
+    if body.size > max_upload_mb(body.filename) * 1024 * 1024:
+        raise too_large(body.filename)
+    chunk_size = body.chunk_size or chunked_uploads.DEFAULT_CHUNK_SIZE
+    if not chunked_uploads.MIN_CHUNK_SIZE <= chunk_size <= chunked_uploads.MAX_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"chunk_size must be between {chunked_uploads.MIN_CHUNK_SIZE} and {chunked_uploads.MAX_CHUNK_SIZE} bytes",
+        )
+    try:
+        content_hash = chunked_uploads.validate_hash(body.sha256)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    session = UploadSession(
+        id=str(uuid.uuid4()),
+        filename=body.filename,
+        file_type=body.file_type,
+        size=body.size,
+        chunk_size=chunk_size,
+        content_hash=content_hash,
+        status=UploadStatus.OPEN,
+        uploaded_by=current_user.email,
+    )
+    await run_in_threadpool(chunked_uploads.create_part_file, session.id, session.size)
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return _session_response(db, session)
+
+
+@router.get("/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Status of a resumable upload, including which chunks are still missing"""
+    return _session_response(db, _get_session(db, upload_id))
+
+
+@router.put("/{upload_id}/chunks")
+async def put_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    chunk_sha256: Optional[str] = Header(None, alias="X-Chunk-SHA256"),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Store one chunk (the raw request body) at byte ``offset``, which must be a
+    multiple of the session's chunk size. Chunks may be sent in any order and
+    in parallel, and re-sent. With an X-Chunk-SHA256 header the chunk is
+    rejected (422) unless it matches; the computed hash is returned either way.
+    """
+    session = _get_session(db, upload_id)
+    if session.status != UploadStatus.OPEN:
+        raise HTTPException(status_code=409, detail=f"Upload is {session.status}")
+    if offset % session.chunk_size or offset >= session.size:
+        raise HTTPException(status_code=400, detail=f"offset must be a multiple of {session.chunk_size} below {session.size}")
+    index = offset // session.chunk_size
+    expected_length = chunked_uploads.chunk_length(session, index)
+
+    digest = hashlib.sha256()
+    parts = []
+    length = 0
+    async for part in request.stream():
+        length += len(part)
+        if length > expected_length:
+            raise HTTPException(status_code=413, detail=f"Chunk {index} must be {expected_length} bytes")
+        digest.update(part)
+        parts.append(part)
+    if length != expected_length:
+        raise HTTPException(status_code=400, detail=f"Chunk {index} must be {expected_length} bytes, got {length}")
+    if chunk_sha256 is not None and chunk_sha256.strip().lower() != digest.hexdigest():
+        raise HTTPException(status_code=422, detail=f"Chunk {index} does not match its SHA-256; send it again")
+
+    # Completion may have claimed the session while the body was arriving
+    db.refresh(session)
+    if session.status != UploadStatus.OPEN:
+        raise HTTPException(status_code=409, detail=f"Upload is {session.status}")
+    try:
+        await run_in_threadpool(chunked_uploads.write_chunk, session.id, offset, b"".join(parts))
+    except FileNotFoundError:
+        db.refresh(session)
+        if session.status != UploadStatus.OPEN:
+            raise HTTPException(status_code=409, detail=f"Upload is {session.status}")
+        raise _fail(db, session, 410, "Upload expired; start a new one")
+    chunked_uploads.record_chunk(db, session.id, index, length, digest.hexdigest())
+    db.commit()
+    return {"index": index, "offset": offset, "size": length, "sha256": digest.hexdigest()}
+
+
+@router.post("/{upload_id}/complete")
+async def complete_upload(
+    upload_id: str,
+    mode: Optional[str] = Query(None),
+    wait: bool = Query(False),
+    force: bool = Query(False),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Assemble a fully received upload, verify its SHA-256 and hand it on like
+    the single-request endpoint of its file type: a deck becomes the slideshow
+    file; a dashboard file is queued for ingest (``mode``, ``wait`` and
+    ``force`` as on those endpoints). 409 lists missing chunks; 422 means the
+    whole-file hash did not match and the upload must be restarted.
+    """
+    session = _get_session(db, upload_id)
+    modes = chunked_uploads.MODES.get(session.file_type)
+    if mode is not None and (modes is None or mode not in modes):
+        raise HTTPException(status_code=400, detail=f"Unsupported mode {mode!r} for {session.file_type}")
+
+    # Claim the session so a repeated or concurrent complete cannot assemble it twice
+    claimed = db.query(UploadSession).filter(
+        UploadSession.id == upload_id, UploadSession.status == UploadStatus.OPEN
+    ).update({UploadSession.status: UploadStatus.COMPLETING}, synchronize_session=False)
+    db.commit()
+    if not claimed:
+        db.refresh(session)
+        raise HTTPException(status_code=409, detail=f"Upload is {session.status}")
+
+    db.refresh(session)
+    assembled = False
+    try:
+        have = set(chunked_uploads.received_chunks(db, session.id))
+        missing = [index for index in range(chunked_uploads.chunk_count(session)) if index not in have]
+        if missing:
+            session.status = UploadStatus.OPEN
+            db.commit()
+            raise HTTPException(status_code=409, detail={"message": "Chunks are missing", "missing": missing})
+
+        try:
+            saved = await run_in_threadpool(chunked_uploads.assemble, session)
+        except ValueError as e:
+            raise _fail(db, session, 422, str(e), expected=UploadStatus.COMPLETING)
+        except FileNotFoundError:
+            raise _fail(db, session, 410, "Upload expired; start a new one", expected=UploadStatus.COMPLETING)
+        assembled = True
+
+        file_type = FileType(session.file_type)
+        db.query(UploadChunk).filter(UploadChunk.upload_id == session.id).delete(synchronize_session=False)
+        session.status = UploadStatus.COMPLETED
+        session.completed_at = datetime.now(timezone.utc)
+        if file_type == FileType.SLIDESHOW:
+            db.commit()
+            return {**use_uploaded_deck(db, saved, session.filename, current_user.email), "upload_id": session.id}
+
+        upload = stored_upload(db, saved, session.filename, file_type, current_user.email)
+        db.flush()
+        session.file_upload_id = upload.file_upload.id
+        options = {"mode": mode or modes[0]} if modes else None
+        return await queue_ingest(db, upload, options, wait=wait, force=force)
+    except HTTPException:
+        raise
+    except Exception as e:
+        # Never leave the session stuck in COMPLETING: reopen it while its part
+        # file is intact, otherwise fail it (the stored file is left to the GC)
+        db.rollback()
+        if assembled:
+            _fail(db, session, 500, f"Upload could not be completed: {e}", expected=UploadStatus.COMPLETING)
+        else:
+            db.query(UploadSession).filter(
+                UploadSession.id == upload_id, UploadSession.status == UploadStatus.COMPLETING
+            ).update({UploadSession.status: UploadStatus.OPEN}, synchronize_session=False)
+            db.commit()
+        raise
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime, timezone, date
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.revenue import Revenue, RevenueTrend, RevenueProportion, SharePrice
 from app.models.posts import SocialPost
 from app.models.employees import EmployeeMilestone
@@ -28,7 +28,7 @@ router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 
 @router.get("/revenue", response_model=RevenueResponse)
-async def get_revenue(db: Session = Depends(get_db)):
+async def get_revenue(db: Session = Depends(get_read_db)):
     """Get current total revenue"""
     revenue = db.query(Revenue).order_by(Revenue.last_updated.desc()).first()
     if not revenue:
@@ -75,7 +75,7 @@ async def get_share_price(db: Session = Depends(get_db)):
 
 
 @router.get("/card-titles")
-async def get_card_titles(db: Session = Depends(get_db)):
+async def get_card_titles(db: Session = Depends(get_read_db)):
     """Get configurable dashboard card titles and subtitles for payments and system performance."""
     default_payments = "Payments Processed Today"
     default_system = "System Performance"
@@ -118,7 +118,7 @@ async def get_card_titles(db: Session = Depends(get_db)):
 
 
 @router.get("/revenue-trends", response_model=List[RevenueTrendResponse])
-async def get_revenue_trends(db: Session = Depends(get_db)):
+async def get_revenue_trends(db: Session = Depends(get_read_db)):
     """Get revenue trends for chart"""
     current_year = datetime.now().year
     trends = db.query(RevenueTrend).filter(
@@ -167,7 +167,7 @@ async def get_revenue_trends(db: Session = Depends(get_db)):
 
 
 @router.get("/revenue-proportions", response_model=List[RevenueProportionResponse])
-async def get_revenue_proportions(db: Session = Depends(get_db)):
+async def get_revenue_proportions(db: Session = Depends(get_read_db)):
     """Get revenue proportions for pie chart"""
     proportions = db.query(RevenueProportion).all()
     
@@ -183,7 +183,7 @@ async def get_revenue_proportions(db: Session = Depends(get_db)):
 
 
 @router.get("/posts", response_model=List[SocialPostResponse])
-async def get_corpay_posts(limit: int = 10, db: Session = Depends(get_db)):
+async def get_corpay_posts(limit: int = 10, db: Session = Depends(get_read_db)):
     """Get Corpay LinkedIn posts - returns both manual and API posts"""
     try:
         # Get all active posts from database (both manual and API)
@@ -215,7 +215,7 @@ async def get_corpay_posts(limit: int = 10, db: Session = Depends(get_db)):
 
 
 @router.get("/cross-border-posts", response_model=List[SocialPostResponse])
-async def get_cross_border_posts(limit: int = 10, db: Session = Depends(get_db)):
+async def get_cross_border_posts(limit: int = 10, db: Session = Depends(get_read_db)):
     """Get Cross-Border LinkedIn posts - returns both manual and API posts"""
     try:
         # Get all active posts from database (both manual and API)
@@ -246,7 +246,7 @@ async def get_cross_border_posts(limit: int = 10, db: Session = Depends(get_db))
 
 
 @router.get("/employees", response_model=List[EmployeeMilestoneResponse])
-async def get_employee_milestones(limit: int = 20, db: Session = Depends(get_db)):
+async def get_employee_milestones(limit: int = 20, db: Session = Depends(get_read_db)):
     """Get employee milestones"""
     milestones = db.query(EmployeeMilestone).filter(
         EmployeeMilestone.is_active == 1
@@ -256,7 +256,7 @@ async def get_employee_milestones(limit: int = 20, db: Session = Depends(get_db)
 
 
 @router.get("/payments", response_model=PaymentDataResponse)
-async def get_payments_today(db: Session = Depends(get_db)):
+async def get_payments_today(db: Session = Depends(get_read_db)):
     """Get today's payment data"""
     try:
         today = date.today()
@@ -294,7 +294,7 @@ async def get_payments_today(db: Session = Depends(get_db)):
 
 
 @router.get("/system-performance", response_model=SystemPerformanceResponse)
-async def get_system_performance(db: Session = Depends(get_db)):
+async def get_system_performance(db: Session = Depends(get_read_db)):
     """Get latest system performance metrics"""
     try:
         performance = db.query(SystemPerformance).order_by(
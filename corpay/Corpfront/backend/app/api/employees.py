@@ -1,17 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+import json
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.exc import IntegrityError
+from typing import List, Literal
 from app.database import get_db
 from app.models.employees import EmployeeMilestone
 from app.models.file_upload import FileUpload, FileType
 from app.schemas.employees import EmployeeMilestoneCreate, EmployeeMilestoneUpdate, EmployeeMilestoneResponse
 from app.utils.auth import get_current_admin_user
-from app.utils.file_handler import save_uploaded_file, get_file_size_mb
-from app.services.excel_parser import ExcelParser
+from app.utils.file_handler import save_uploaded_file, save_upload_stream
+from app.services import avatars
+from app.services.uploads import receive_upload, retain_file, replace_reference
 from app.models.user import User
+from app.api.jobs import queue_ingest
 
 router = APIRouter(prefix="/api/admin/employees", tags=["admin-employees"])
 
+def _same_key(db: Session, milestone):
+    """Milestones with the natural key (name, type, date) of ``milestone``, deleted ones included."""
+    return db.query(EmployeeMilestone).filter(
+        EmployeeMilestone.name == milestone.name,
+        EmployeeMilestone.milestone_type == milestone.milestone_type,
+        EmployeeMilestone.milestone_date == milestone.milestone_date,
+    )
+
+
+def _new_milestone(db: Session, milestone: EmployeeMilestoneCreate) -> EmployeeMilestone:
+    """
+    A new milestone, or, since the natural key's unique index also covers
+    soft-deleted rows, the deleted one with the same key revived with these
+    fields (as sheet uploads revive it). Not committed.
+    """
+    fields = milestone.dict(exclude={"avatar_path"})
+    db_milestone = _same_key(db, milestone).filter(EmployeeMilestone.is_active == 0).first()
+    if db_milestone is None:
+        db_milestone = EmployeeMilestone(**fields)
+        db.add(db_milestone)
+        return db_milestone
+    for field, value in fields.items():
+        setattr(db_milestone, field, value)
+    db_milestone.is_active = 1
+    # Created by hand now, so delta sheet uploads leave it alone
+    db_milestone.row_key = db_milestone.row_fingerprint = None
+    return db_milestone
+
+
+def _commit_milestone(db: Session, db_milestone: EmployeeMilestone, milestone) -> EmployeeMilestone:
+    """Commit a created/updated milestone, mapping natural-key collisions to 409."""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        existing = _same_key(db, milestone).first()
+        if existing is not None and not existing.is_active:
+            detail = "A deleted milestone with this name, type and date already exists (creating it again restores it)"
+        else:
+            detail = "A milestone with this name, type and date already exists"
+        raise HTTPException(status_code=409, detail=detail)
+    db.refresh(db_milestone)
+    return db_milestone
+
+
+async def _set_avatar(db: Session, db_milestone: EmployeeMilestone, avatar_path, variants=None) -> None:
+    """
+    Point a milestone at a stored photo: render its avatar variants (unless
+    given) and move the file reference.
+    """
+    if avatar_path != db_milestone.avatar_path or db_milestone.avatar_variants is None:
+        # Rendered before any write so the transaction is not held open meanwhile
+        db_milestone.avatar_variants = variants or await avatars.create_variants(avatar_path)
+    replace_reference(db, db_milestone.avatar_path, avatar_path)
+    db_milestone.avatar_path = avatar_path
+
 
 @router.post("/dev", response_model=EmployeeMilestoneResponse)
 async def create_employee_milestone_dev(
@@ -19,11 +79,9 @@ async def create_employee_milestone_dev(
     db: Session = Depends(get_db)
 ):
     """Create a new employee milestone (development mode - no auth required)"""
-    db_milestone = EmployeeMilestone(**milestone.dict())
-    db.add(db_milestone)
-    db.commit()
-    db.refresh(db_milestone)
-    return db_milestone
+    db_milestone = _new_milestone(db, milestone)
+    await _set_avatar(db, db_milestone, milestone.avatar_path)
+    return _commit_milestone(db, db_milestone, milestone)
 
 
 @router.post("", response_model=EmployeeMilestoneResponse)
@@ -33,11 +91,9 @@ async def create_employee_milestone(
     db: Session = Depends(get_db)
 ):
     """Create a new employee milestone"""
-    db_milestone = EmployeeMilestone(**milestone.dict())
-    db.add(db_milestone)
-    db.commit()
-    db.refresh(db_milestone)
-    return db_milestone
+    db_milestone = _new_milestone(db, milestone)
+    await _set_avatar(db, db_milestone, milestone.avatar_path)
+    return _commit_milestone(db, db_milestone, milestone)
 
 
 @router.put("/dev/{milestone_id}", response_model=EmployeeMilestoneResponse)
@@ -51,11 +107,10 @@ async def update_employee_milestone_dev(
     db_milestone = db.query(EmployeeMilestone).filter(EmployeeMilestone.id == milestone_id).first()
     if not db_milestone:
         raise HTTPException(status_code=404, detail="Milestone not found")
-    for key, value in milestone.dict().items():
+    await _set_avatar(db, db_milestone, milestone.avatar_path)
+    for key, value in milestone.dict(exclude={"avatar_path"}).items():
         setattr(db_milestone, key, value)
-    db.commit()
-    db.refresh(db_milestone)
-    return db_milestone
+    return _commit_milestone(db, db_milestone, milestone)
 
 
 @router.put("/{milestone_id}", response_model=EmployeeMilestoneResponse)
@@ -70,11 +125,10 @@ async def update_employee_milestone(
     db_milestone = db.query(EmployeeMilestone).filter(EmployeeMilestone.id == milestone_id).first()
     if not db_milestone:
         raise HTTPException(status_code=404, detail="Milestone not found")
-    for key, value in milestone.dict().items():
+    await _set_avatar(db, db_milestone, milestone.avatar_path)
+    for key, value in milestone.dict(exclude={"avatar_path"}).items():
         setattr(db_milestone, key, value)
-    db.commit()
-    db.refresh(db_milestone)
-    return db_milestone
+    return _commit_milestone(db, db_milestone, milestone)
 
 
 @router.get("/dev", response_model=List[EmployeeMilestoneResponse])
@@ -105,42 +159,24 @@ async def list_employee_milestones(
 @router.post("/upload")
 async def upload_employee_file(
     file: UploadFile = File(...),
+    mode: Literal["upsert", "delta"] = Query("upsert"),
+    wait: bool = Query(False),
+    force: bool = Query(False),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Upload employee data Excel file"""
+    """
+    Upload employee data Excel file (processed in the background unless wait=true).
+    mode=upsert adds or updates every row; mode=delta treats the sheet as the
+    full list, writes only the rows that changed, deactivates milestones no
+    longer in it and returns a summary of the changes.
+    """
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="File must be Excel format")
     
-    file_path = save_uploaded_file(file, "employees")
-    file_size = get_file_size_mb(file_path)
+    upload = await receive_upload(db, file, FileType.EMPLOYEE_DATA, current_user.email)
     
-    file_upload = FileUpload(
-        original_filename=file.filename,
-        stored_path=file_path,
-        file_type=FileType.EMPLOYEE_DATA,
-        file_size=int(file_size * 1024 * 1024),
-        uploaded_by=current_user.email
-    )
-    db.add(file_upload)
-    
-    try:
-        parser = ExcelParser()
-        employees = parser.parse_employee_file(f"uploads/{file_path}")
-        
-        for emp_data in employees:
-            milestone = EmployeeMilestone(**emp_data)
-            db.add(milestone)
-        
-        file_upload.processed = 1
-        db.commit()
-        
-        return {"message": f"Processed {len(employees)} employee milestones", "file_id": file_upload.id}
-    
-    except Exception as e:
-        file_upload.error_message = str(e)
-        db.commit()
-        raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+    return await queue_ingest(db, upload, {"mode": mode}, wait=wait, force=force)
 
 
 @router.post("/upload-photo-dev")
@@ -153,16 +189,18 @@ async def upload_employee_photo_dev(
     if not file.content_type or not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="File must be an image")
     
-    file_path = save_uploaded_file(file, "employee-photos")
+    file_path = await save_uploaded_file(file)
+    variants = await avatars.create_variants(file_path)
     
     # If employee_id is provided and > 0, update the milestone
     if employee_id > 0:
         milestone = db.query(EmployeeMilestone).filter(EmployeeMilestone.id == employee_id).first()
         if milestone:
-            milestone.avatar_path = file_path
+            await _set_avatar(db, milestone, file_path, variants)
             db.commit()
     
-    return {"message": "Photo uploaded successfully", "avatar_path": file_path}
+    return {"message": "Photo uploaded successfully", "avatar_path": file_path,
+            "avatar_variants": json.loads(variants) if variants else None}
 
 
 @router.post("/upload-photo")
@@ -176,7 +214,8 @@ async def upload_employee_photo(
     if not file.content_type or not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="File must be an image")
     
-    file_path = save_uploaded_file(file, "employee-photos")
+    file_path, content_hash, file_size = await save_upload_stream(file)
+    variants = await avatars.create_variants(file_path)
     
     # If employee_id is provided and > 0, update the milestone
     if employee_id > 0:
@@ -188,14 +227,18 @@ async def upload_employee_photo(
             original_filename=file.filename,
             stored_path=file_path,
             file_type=FileType.EMPLOYEE_PHOTO,
+            file_size=file_size,
+            content_hash=content_hash,
             uploaded_by=current_user.email
         )
         db.add(file_upload)
+        retain_file(db, file_path, content_hash, file_size)
         
-        milestone.avatar_path = file_path
+        await _set_avatar(db, milestone, file_path, variants)
         db.commit()
     
-    return {"message": "Photo uploaded successfully", "avatar_path": file_path}
+    return {"message": "Photo uploaded successfully", "avatar_path": file_path,
+            "avatar_variants": json.loads(variants) if variants else None}
 
 
 @router.delete("/dev/{milestone_id}")
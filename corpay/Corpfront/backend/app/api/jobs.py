@@ -0,0 +1,97 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+import json
+from app.database import get_db
+from app.models.ingest_job import IngestJob, JobStatus
+from app.schemas.ingest_job import IngestJobResponse
+from app.services import ingest
+from app.services.uploads import ReceivedUpload
+from app.utils.auth import get_current_admin_user
+from app.models.user import User
+
+router = APIRouter(prefix="/api/admin/jobs", tags=["admin-jobs"])
+
+
+def _job_response(job: IngestJob) -> IngestJobResponse:
+    return IngestJobResponse(
+        id=job.id,
+        file_upload_id=job.file_upload_id,
+        file_type=job.file_type,
+        status=job.status,
+        stage=job.stage,
+        rows_parsed=job.rows_parsed,
+        rows_written=job.rows_written,
+        result=json.loads(job.result) if job.result else None,
+        error_message=job.error_message,
+        attempts=job.attempts or 0,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def queue_ingest(
+    db: Session,
+    upload: ReceivedUpload,
+    options: Optional[Dict[str, Any]] = None,
+    wait: bool = False,
+    force: bool = False,
+):
+    """
+    Queue background processing of a received upload.
+
+    For a small spreadsheet the job parses the upload's bytes straight away
+    while the original is still being written to disk; larger uploads are
+    already stored and the job reads them from there. The response waits for
+    the stored copy (a resumed job needs it): 202 with the job id by default.
+    With ``wait`` the request also awaits the job (still off the event loop)
+    and answers like the old synchronous endpoints: the ingest summary, or 400
+    with the error. Content identical to the last processed upload of the same
+    type is answered immediately without re-ingesting, unless ``force``.
+    """
+    file_upload = upload.file_upload
+    job = ingest.create_job(db, file_upload, options, force=force)
+    db.commit()
+    if job.status == JobStatus.SUCCEEDED:
+        await _stored(upload)
+        return {**json.loads(job.result), "file_id": file_upload.id, "job_id": job.id}
+    task = ingest.submit_job(job.id, upload.content)
+    await _stored(upload)
+
+    if not wait:
+        return JSONResponse(status_code=202, content={
+            "message": "File queued for processing",
+            "file_id": file_upload.id,
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/api/admin/jobs/{job.id}",
+        })
+
+    await task
+    db.refresh(job)
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(status_code=400, detail=f"Error processing file: {job.error_message}")
+    return {**json.loads(job.result), "file_id": file_upload.id, "job_id": job.id}
+
+
+async def _stored(upload: ReceivedUpload) -> None:
+    # The ingest already has the content; a failed write only loses the archived original
+    try:
+        await upload.persisted
+    except Exception as e:
+        print(f"Warning: could not store upload {upload.file_upload.stored_path}: {e}")
+
+
+@router.get("/{job_id}", response_model=IngestJobResponse)
+async def get_ingest_job(
+    job_id: str,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Status, progress, row counts and error of an upload ingest job"""
+    job = db.query(IngestJob).filter(IngestJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+from app.config import settings
+from app.utils.auth import get_current_admin_user
+from app.utils import sql_metrics
+from app.models.user import User
+
+router = APIRouter(prefix="/api/admin/metrics", tags=["admin-metrics"])
+
+
+@router.get("/sql")
+async def get_sql_metrics(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Per-route query counts, DB time and suspected N+1 statements since startup (or last reset)"""
+    return {
+        "slow_query_ms": settings.sql_slow_query_ms,
+        "n_plus_one_threshold": settings.sql_n_plus_one_threshold,
+        "routes": sql_metrics.get_route_stats(),
+    }
+
+
+@router.delete("/sql")
+async def reset_sql_metrics(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Reset the per-route SQL metrics"""
+    sql_metrics.reset_route_stats()
+    return {"message": "SQL metrics reset"}
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from sqlalchemy.orm import Session
 from datetime import date
+from typing import Literal
 from app.database import get_db
 from app.models.payments import PaymentData
-from app.models.file_upload import FileUpload, FileType
+from app.models.file_upload import FileType
 from app.schemas.payments import PaymentDataCreate, PaymentDataResponse
 from app.utils.auth import get_current_admin_user
-from app.utils.file_handler import save_uploaded_file, get_file_size_mb
-from app.services.excel_parser import ExcelParser
+from app.services.uploads import receive_upload
+from app.services import tabular_stream
+from app.api.jobs import queue_ingest
 from app.models.user import User
 
 router = APIRouter(prefix="/api/admin/payments", tags=["admin-payments"])
@@ -16,48 +18,25 @@ router = APIRouter(prefix="/api/admin/payments", tags=["admin-payments"])
 @router.post("/upload")
 async def upload_payments_file(
     file: UploadFile = File(...),
+    mode: Literal["latest", "history"] = Query("latest"),
+    wait: bool = Query(False),
+    force: bool = Query(False),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Upload payments Excel file"""
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="File must be Excel format")
+    """
+    Upload payments Excel, CSV or Parquet file.
+    mode=latest stores only the most recent date; mode=history ingests every
+    dated row (aggregated per date) in a single transaction. CSV / Parquet
+    exports are streamed in chunks. Processed in the background (202 + job id)
+    unless wait=true.
+    """
+    if not file.filename.lower().endswith(('.xlsx', '.xls') + tabular_stream.STREAM_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="File must be Excel, CSV or Parquet format")
     
-    file_path = save_uploaded_file(file, "payments")
-    file_size = get_file_size_mb(file_path)
+    upload = await receive_upload(db, file, FileType.PAYMENTS, current_user.email)
     
-    file_upload = FileUpload(
-        original_filename=file.filename,
-        stored_path=file_path,
-        file_type=FileType.PAYMENTS,
-        file_size=int(file_size * 1024 * 1024),
-        uploaded_by=current_user.email
-    )
-    db.add(file_upload)
-    
-    try:
-        parser = ExcelParser()
-        data = parser.parse_payments_file(f"uploads/{file_path}")
-        
-        # Check if payment data for this date already exists
-        existing = db.query(PaymentData).filter(PaymentData.date == data["date"]).first()
-        
-        if existing:
-            existing.amount_processed = data["amount_processed"]
-            existing.transaction_count = data["transaction_count"]
-        else:
-            payment = PaymentData(**data)
-            db.add(payment)
-        
-        file_upload.processed = 1
-        db.commit()
-        
-        return {"message": "File processed successfully", "file_id": file_upload.id}
-    
-    except Exception as e:
-        file_upload.error_message = str(e)
-        db.commit()
-        raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+    return await queue_ingest(db, upload, {"mode": mode}, wait=wait, force=force)
 
 
 @router.post("", response_model=PaymentDataResponse)
@@ -1,14 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Body
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Body, Query
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
 from app.database import get_db
-from app.models.revenue import Revenue, RevenueTrend, RevenueProportion, SharePrice
-from app.models.file_upload import FileUpload, FileType
+from app.models.revenue import Revenue, RevenueProportion, SharePrice
+from app.models.file_upload import FileType
 from app.schemas.revenue import RevenueResponse, RevenueTrendResponse, RevenueProportionResponse, SharePriceResponse
 from app.utils.auth import get_current_admin_user
-from app.utils.file_handler import save_uploaded_file, get_file_size_mb
-from app.services.excel_parser import ExcelParser
+from app.services.uploads import receive_upload
+from app.api.jobs import queue_ingest
 from app.models.user import User
 from pydantic import BaseModel
 
@@ -18,92 +18,18 @@ router = APIRouter(prefix="/api/admin/revenue", tags=["admin-revenue"])
 @router.post("/upload")
 async def upload_revenue_file(
     file: UploadFile = File(...),
+    wait: bool = Query(False),
+    force: bool = Query(False),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Upload revenue Excel file (authenticated)"""
+    """Upload revenue Excel file (authenticated; processed in the background unless wait=true)"""
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="File must be Excel format (.xlsx or .xls)")
     
-    # Save file
-    file_path = save_uploaded_file(file, "revenue")
-    file_size = get_file_size_mb(file_path)
+    upload = await receive_upload(db, file, FileType.REVENUE, current_user.email)
     
-    # Record upload
-    file_upload = FileUpload(
-        original_filename=file.filename,
-        stored_path=file_path,
-        file_type=FileType.REVENUE,
-        file_size=int(file_size * 1024 * 1024),
-        uploaded_by=current_user.email
-    )
-    db.add(file_upload)
-    
-    try:
-        # Parse Excel file
-        parser = ExcelParser()
-        data = parser.parse_revenue_file(f"uploads/{file_path}")
-        
-        # Update revenue
-        if data.get("total_revenue"):
-            # Ensure we never write NULL into a non-nullable percentage_change column
-            pct_change = data.get("percentage_change")
-            if pct_change is None:
-                pct_change = 0.0
-
-            revenue = db.query(Revenue).order_by(Revenue.last_updated.desc()).first()
-            if revenue:
-                revenue.total_amount = data["total_revenue"]
-                revenue.percentage_change = pct_change
-            else:
-                revenue = Revenue(
-                    total_amount=data["total_revenue"],
-                    percentage_change=pct_change
-                )
-                db.add(revenue)
-        
-        # Update revenue trends
-        if data.get("revenue_trends"):
-            current_year = datetime.now().year
-            # Clear existing trends for current year
-            db.query(RevenueTrend).filter(RevenueTrend.year == current_year).delete()
-            
-            for trend in data["revenue_trends"]:
-                revenue_trend = RevenueTrend(
-                    month=trend["month"],
-                    value=trend["value"],
-                    highlight=trend.get("highlight", False),
-                    year=current_year
-                )
-                db.add(revenue_trend)
-        
-        # Update revenue proportions
-        if data.get("revenue_proportions"):
-            for prop in data["revenue_proportions"]:
-                proportion = db.query(RevenueProportion).filter(
-                    RevenueProportion.category == prop["category"]
-                ).first()
-                
-                if proportion:
-                    proportion.percentage = prop["percentage"]
-                    proportion.color = prop.get("color", "#981239")
-                else:
-                    proportion = RevenueProportion(
-                        category=prop["category"],
-                        percentage=prop["percentage"],
-                        color=prop.get("color", "#981239")
-                    )
-                    db.add(proportion)
-        
-        file_upload.processed = 1
-        db.commit()
-        
-        return {"message": "File processed successfully", "file_id": file_upload.id}
-    
-    except Exception as e:
-        file_upload.error_message = str(e)
-        db.commit()
-        raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+    return await queue_ingest(db, upload, wait=wait, force=force)
 
 
 @router.post("/upload-dev")
@@ -129,85 +55,18 @@ async def upload_revenue_file_dev(
         if not file.filename.endswith(('.xlsx', '.xls')):
             raise HTTPException(status_code=400, detail="File must be Excel format (.xlsx or .xls)")
         
-        # Save file
-        file_path = save_uploaded_file(file, "revenue")
-        file_size = get_file_size_mb(file_path)
-
-        # Record upload
-        file_upload = FileUpload(
-            original_filename=file.filename,
-            stored_path=file_path,
-            file_type=FileType.REVENUE,
-            file_size=int(file_size * 1024 * 1024),
-            uploaded_by="dev_user"
-        )
-        db.add(file_upload)
-
-        # Parse Excel file
-        parser = ExcelParser()
-        data = parser.parse_revenue_file(f"uploads/{file_path}")
-
-        # Update revenue
-        if data.get("total_revenue"):
-            # Ensure we never write NULL into a non-nullable percentage_change column
-            pct_change = data.get("percentage_change")
-            if pct_change is None:
-                pct_change = 0.0
-
-            revenue = db.query(Revenue).order_by(Revenue.last_updated.desc()).first()
-            if revenue:
-                revenue.total_amount = data["total_revenue"]
-                revenue.percentage_change = pct_change
-            else:
-                revenue = Revenue(
-                    total_amount=data["total_revenue"],
-                    percentage_change=pct_change
-                )
-                db.add(revenue)
-
-        # Update revenue trends
-        if data.get("revenue_trends"):
-            current_year = datetime.now().year
-            # Clear existing trends for current year
-            db.query(RevenueTrend).filter(RevenueTrend.year == current_year).delete()
-
-            for trend in data["revenue_trends"]:
-                revenue_trend = RevenueTrend(
-                    month=trend["month"],
-                    value=trend["value"],
-                    highlight=trend.get("highlight", False),
-                    year=current_year
-                )
-                db.add(revenue_trend)
-
-        # Update revenue proportions
-        if data.get("revenue_proportions"):
-            for prop in data["revenue_proportions"]:
-                proportion = db.query(RevenueProportion).filter(
-                    RevenueProportion.category == prop["category"]
-                ).first()
-
-                if proportion:
-                    proportion.percentage = prop["percentage"]
-                    proportion.color = prop.get("color", "#981239")
-                else:
-                    proportion = RevenueProportion(
-                        category=prop["category"],
-                        percentage=prop["percentage"],
-                        color=prop.get("color", "#981239")
-                    )
-                    db.add(proportion)
+        upload = await receive_upload(db, file, FileType.REVENUE, "dev_user")
 
-        file_upload.processed = 1
-        db.commit()
+        # Same ingest path as the authenticated endpoint, awaited so the UI sees the result
+        result = await queue_ingest(db, upload, wait=True)
 
         try:
             with open("/Users/madhujitharumugam/Desktop/latest_corpgit/corpay/.cursor/debug.log", "a") as f:
-                f.write('{"sessionId":"debug-session","runId":"pre-fix","hypothesisId":"H5","location":"revenue.py:upload_revenue_file_dev:success","message":"upload-dev processed successfully","data":{"fileId":%d},"timestamp":%d}\\n' % (file_upload.id, int(datetime.now().timestamp() * 1000)))
+                f.write('{"sessionId":"debug-session","runId":"pre-fix","hypothesisId":"H5","location":"revenue.py:upload_revenue_file_dev:success","message":"upload-dev processed successfully","data":{"fileId":%d},"timestamp":%d}\\n' % (upload.file_upload.id, int(datetime.now().timestamp() * 1000)))
         except Exception:
             pass
 
-        return {"message": "File processed successfully", "file_id": file_upload.id}
+        return result
 
     except HTTPException:
         # Re-raise HTTPExceptions so FastAPI can handle status code properly
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Query
+import asyncio
+from app.api import slideshow
+from app.services import upload_gc
+from app.utils.auth import get_current_admin_user
+from app.models.user import User
+
+router = APIRouter(prefix="/api/admin/storage", tags=["admin-storage"])
+
+
+@router.post("/gc")
+async def collect_upload_garbage(
+    dry_run: bool = Query(False),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Delete unreferenced uploads past the grace period and evict rendered slides
+    over the quota now (also runs every GC_INTERVAL_MINUTES). dry_run=true only
+    reports what would be deleted. Returns the files deleted and bytes reclaimed.
+    """
+    return await asyncio.to_thread(upload_gc.collect_garbage, [slideshow.current_file_path()], dry_run)
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.system_performance import SystemPerformance
-from app.models.file_upload import FileUpload, FileType
+from app.models.file_upload import FileType
 from app.schemas.system_performance import SystemPerformanceCreate, SystemPerformanceResponse
 from app.utils.auth import get_current_admin_user
-from app.utils.file_handler import save_uploaded_file, get_file_size_mb
-from app.services.excel_parser import ExcelParser
+from app.services.uploads import receive_upload
+from app.services import tabular_stream
+from app.api.jobs import queue_ingest
 from app.models.user import User
 
 router = APIRouter(prefix="/api/admin/system", tags=["admin-system"])
@@ -15,41 +16,21 @@ router = APIRouter(prefix="/api/admin/system", tags=["admin-system"])
 @router.post("/upload")
 async def upload_system_performance_file(
     file: UploadFile = File(...),
+    wait: bool = Query(False),
+    force: bool = Query(False),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Upload system performance Excel file"""
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="File must be Excel format")
+    """
+    Upload system performance Excel, CSV or Parquet file (CSV / Parquet are streamed).
+    Processed in the background (202 + job id) unless wait=true.
+    """
+    if not file.filename.lower().endswith(('.xlsx', '.xls') + tabular_stream.STREAM_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="File must be Excel, CSV or Parquet format")
     
-    file_path = save_uploaded_file(file, "system")
-    file_size = get_file_size_mb(file_path)
+    upload = await receive_upload(db, file, FileType.SYSTEM_PERFORMANCE, current_user.email)
     
-    file_upload = FileUpload(
-        original_filename=file.filename,
-        stored_path=file_path,
-        file_type=FileType.SYSTEM_PERFORMANCE,
-        file_size=int(file_size * 1024 * 1024),
-        uploaded_by=current_user.email
-    )
-    db.add(file_upload)
-    
-    try:
-        parser = ExcelParser()
-        data = parser.parse_system_performance_file(f"uploads/{file_path}")
-        
-        performance = SystemPerformance(**data)
-        db.add(performance)
-        
-        file_upload.processed = 1
-        db.commit()
-        
-        return {"message": "File processed successfully", "file_id": file_upload.id}
-    
-    except Exception as e:
-        file_upload.error_message = str(e)
-        db.commit()
-        raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+    return await queue_ingest(db, upload, wait=wait, force=force)
 
 
 @router.post("", response_model=SystemPerformanceResponse)
@@ -10,6 +10,10 @@ class Settings(BaseSettings):
     # Get your connection string from: https://app.supabase.com/project/YOUR_PROJECT/settings/databa
 
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./dashboard.db").replace("DATABASE_URL=", "")
+    # Optional read replica used by the public /api/dashboard routes (empty = use database_url)
+    database_read_url: str = os.getenv("DATABASE_READ_URL", "")
+    # After a write, keep reads on the primary for this many seconds to hide replica lag
+    read_replica_lag_seconds: float = 5.0
 
     
     # Supabase Configuration
@@ -35,6 +39,31 @@ class Settings(BaseSettings):
     # File Storage
     upload_dir: str = "./uploads"
     max_file_size_mb: int = 50
+    max_stream_file_size_mb: int = 1024  # CSV / Parquet exports (ingested in constant memory)
+    # nginx internal location aliased to upload_dir; when set, /uploads responds with X-Accel-Redirect (see app/utils/upload_files.py)
+    uploads_accel_redirect: str = ""
+    # Rows per chunk when streaming CSV / Parquet uploads (bounds ingest memory)
+    ingest_chunk_rows: int = 50_000
+    # Background ingest (see app/services/ingest.py)
+    ingest_workers: int = 2  # Process pool size for parsing uploads
+    ingest_job_stale_seconds: int = 900  # Running jobs without a heartbeat for this long are re-queued on startup
+    ingest_heartbeat_seconds: int = 30  # How often a running job's worker refreshes its heartbeat
+    # Batch (zip) uploads: limits enforced while extracting, against zip bombs
+    batch_max_files: int = 100
+    batch_max_total_mb: int = 2048  # Uncompressed size of all files in the archive
+    # Upload directory garbage collection (see app/services/upload_gc.py)
+    gc_interval_minutes: int = 60  # 0 disables the periodic run
+    gc_grace_hours: int = 24  # Unreferenced files younger than this are kept
+    upload_retention_days: int = 30  # Superseded sheet uploads are kept this long
+    upload_quota_mb: int = 0  # Evict rendered slides above this; 0 = no quota
+    # Employee photo avatar variants (see app/services/avatars.py)
+    image_workers: int = 2  # Process pool size for resizing photos
+    # Slideshow rendering (see app/services/slide_renderer.py)
+    pdf_render_workers: int = 4  # Process pool size for rasterizing PDF pages; 1 renders in a thread
+    # LibreOffice conversion of PPT/PPTX decks (see app/services/libreoffice.py)
+    libreoffice_path: str = ""  # soffice executable; looked up in the usual places when empty
+    libreoffice_workers: int = 1  # Long-lived headless LibreOffice processes (needs the uno module); 0 = one process per deck
+    libreoffice_timeout_seconds: int = 180  # Per conversion; a worker that overruns is killed and restarted
     
     # External APIs
     share_price_api_url: str = ""
@@ -51,6 +80,10 @@ class Settings(BaseSettings):
     powerbi_tenant_id: str = ""
     powerbi_workspace_id: str = ""
     
+    # SQL instrumentation (see app/utils/sql_metrics.py)
+    sql_slow_query_ms: float = 200.0  # Log statements slower than this (parameters redacted)
+    sql_n_plus_one_threshold: int = 10  # Same statement shape this many times in one request = N+1
+    
     # Environment
     environment: str = "development"
     
@@ -1,32 +1,95 @@
-from sqlalchemy import create_engine
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, Optional, Tuple
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
 from app.config import settings
 
 # Use database URL from settings (defaults to SQLite for local development)
 DATABASE_URL = settings.database_url
+# Optional read replica for public dashboard reads; empty means "use the primary"
+DATABASE_READ_URL = settings.database_read_url
 
-# For SQLite, use different engine settings
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        echo=False
-    )
-else:
+
+def _create_engine(url: str):
+    # For SQLite, use different engine settings
+    if url.startswith("sqlite"):
+        return create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            echo=False
+        )
     # For PostgreSQL (Supabase), use connection pooling
-    engine = create_engine(
-        DATABASE_URL,
+    return create_engine(
+        url,
         pool_pre_ping=True,
         pool_size=10,
         max_overflow=20,
         echo=False
     )
 
+
+engine = _create_engine(DATABASE_URL)
+read_engine = _create_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
+# Reads stay on the primary for settings.read_replica_lag_seconds after a write
+# so an admin who just uploaded a file sees it on the dashboard straight away.
+# Two records are kept: the monotonic time of the last INSERT/UPDATE/DELETE in
+# this process, and, because other app processes (uvicorn workers) cannot see
+# that, the wall-clock time of the client's own last write, which a request
+# that wrote hands back in the WRITE_COOKIE cookie (see track_writes).
+_last_write_at = 0.0
+WRITE_COOKIE = "db_last_write"
+# Per request: {"wrote_at": wall-clock time} once the request has written
+_request_writes: ContextVar[Optional[Dict[str, float]]] = ContextVar("db_request_writes", default=None)
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _record_primary_write(conn, cursor, statement, parameters, context, executemany):
+    global _last_write_at
+    if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+        _last_write_at = time.monotonic()
+        writes = _request_writes.get()
+        if writes is not None:
+            writes["wrote_at"] = time.time()
+
+
+def track_writes() -> Tuple[Dict[str, float], Token]:
+    """
+    Start recording whether the current request writes to the primary (held
+    in a ContextVar so threadpool dependencies see it too). Returns the record
+    and the token to pass to ``untrack_writes``.
+    """
+    writes: Dict[str, float] = {}
+    return writes, _request_writes.set(writes)
+
+
+def untrack_writes(token: Token) -> None:
+    _request_writes.reset(token)
+
+
+def replica_is_fresh(request: Optional[Request] = None) -> bool:
+    """
+    True when reads may be routed to the replica: no recent write in this
+    process, nor by the client making ``request`` (per its WRITE_COOKIE).
+    """
+    if time.monotonic() - _last_write_at < settings.read_replica_lag_seconds:
+        return False
+    if request is None:
+        return True
+    try:
+        client_wrote_at = float(request.cookies.get(WRITE_COOKIE, 0))
+    except ValueError:
+        return True
+    return time.time() - client_wrote_at >= settings.read_replica_lag_seconds
+
 
 def get_db():
     db = SessionLocal()
@@ -34,3 +97,15 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request):
+    """Session for read-only routes: the replica when configured and not lagging, else the primary."""
+    if read_engine is engine or not replica_is_fresh(request):
+        db = SessionLocal()
+    else:
+        db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,19 +1,34 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from contextlib import asynccontextmanager
 import asyncio
+import math
+from app import database
 from app.config import settings
-from app.database import engine, Base, SessionLocal
-from app.api import dashboard, auth, revenue, posts, employees, payments, system, config, slideshow
+from app.database import engine, read_engine, Base, SessionLocal
+from app.api import dashboard, auth, revenue, posts, employees, payments, system, config, slideshow, metrics, jobs, batch, storage, chunked_uploads
 from app.api import linkedin_auth, linkedin_auth
 from app.services.linkedin_sync import run_periodic_sync
+from app.services import avatars, ingest, libreoffice, slide_renderer, upload_gc
 from app.models.user import User
+from app.utils import sql_metrics
+from app.utils.upload_files import UploadFiles
 import bcrypt
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+if read_engine is not engine:
+    # Lets a second local SQLite file stand in for the replica; a no-op on a real one
+    try:
+        Base.metadata.create_all(bind=read_engine)
+    except Exception as e:
+        print(f"Warning: Could not create tables on read database: {e}")
+
+# Per-request SQL counts/timings (exposed at /api/admin/metrics/sql and in Server-Timing)
+sql_metrics.install(engine)
+if read_engine is not engine:
+    sql_metrics.install(read_engine)
 
 def init_default_admin():
     """Initialize default admin user - always ensure it exists with correct password."""
@@ -77,10 +92,33 @@ async def lifespan(app: FastAPI):
 
     # Start background task for LinkedIn sync
     sync_task = asyncio.create_task(run_periodic_sync(interval_minutes=30))
+
+    # Pick up upload ingest jobs left queued/interrupted by the previous run
+    try:
+        ingest.resume_pending_jobs()
+    except Exception as e:
+        print(f"Warning: Could not resume ingest jobs: {e}")
+    
+    # Remove orphaned uploads and stale slide renders
+    gc_task = None
+    if settings.gc_interval_minutes > 0:
+        gc_task = asyncio.create_task(upload_gc.run_periodic_gc(
+            lambda: [slideshow.current_file_path()], settings.gc_interval_minutes
+        ))
+    
+    # Find LibreOffice and start its conversion workers before the first deck arrives
+    libreoffice_task = asyncio.create_task(asyncio.to_thread(libreoffice.start))
     
     yield
     
     # Cleanup on shutdown
+    ingest.shutdown()
+    avatars.shutdown()
+    slide_renderer.shutdown()
+    libreoffice_task.cancel()
+    await asyncio.to_thread(libreoffice.shutdown)
+    if gc_task is not None:
+        gc_task.cancel()
     sync_task.cancel()
     try:
         await sync_task
@@ -95,11 +133,15 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Serve uploaded files statically
+# Serve uploaded files statically, cacheable for a year where names are content-addressed
 upload_dir = Path(settings.upload_dir)
 upload_dir.mkdir(parents=True, exist_ok=True)
 try:
-    app.mount("/uploads", StaticFiles(directory=str(upload_dir)), name="uploads")
+    app.mount(
+        "/uploads",
+        UploadFiles(directory=str(upload_dir), accel_redirect=settings.uploads_accel_redirect),
+        name="uploads",
+    )
 except Exception as e:
     print(f"Warning: Could not mount static files: {e}")
 
@@ -164,6 +206,41 @@ async def debug_revenue_upload_middleware(request, call_next):
 
     return await call_next(request)
 
+@app.middleware("http")
+async def read_your_writes_middleware(request, call_next):
+    """Tell a client that wrote to the primary when, so its reads skip the replica on any app process."""
+    if read_engine is engine:
+        return await call_next(request)
+    writes, token = database.track_writes()
+    try:
+        response = await call_next(request)
+    finally:
+        database.untrack_writes(token)
+    if "wrote_at" in writes:
+        response.set_cookie(
+            database.WRITE_COOKIE,
+            f"{writes['wrote_at']:.3f}",
+            max_age=max(1, math.ceil(settings.read_replica_lag_seconds)),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+
+@app.middleware("http")
+async def sql_metrics_middleware(request, call_next):
+    stats, token = sql_metrics.start_request()
+    try:
+        response = await call_next(request)
+    finally:
+        sql_metrics.end_request(token)
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", None) or "<unmatched>"
+    sql_metrics.finish_request(f"{request.method} {route_path}", stats)
+    response.headers["Server-Timing"] = stats.server_timing()
+    return response
+
+
 # Include routers
 app.include_router(dashboard.router)
 app.include_router(auth.router)
@@ -175,6 +252,11 @@ app.include_router(system.router)
 app.include_router(config.router)
 app.include_router(linkedin_auth.router)
 app.include_router(slideshow.router)
+app.include_router(metrics.router)
+app.include_router(jobs.router)
+app.include_router(batch.router)
+app.include_router(storage.router)
+app.include_router(chunked_uploads.router)
 
 
 @app.get("/")
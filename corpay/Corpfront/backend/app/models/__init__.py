@@ -6,6 +6,10 @@ from app.models.system_performance import SystemPerformance
 from app.models.file_upload import FileUpload
 from app.models.user import User
 from app.models.api_config import ApiConfig
+from app.models.ingest_job import IngestJob
+from app.models.column_mapping import ColumnMapping
+from app.models.stored_file import StoredFile
+from app.models.upload_session import UploadSession, UploadChunk
 
 __all__ = [
     "Revenue",
@@ -19,5 +23,10 @@ __all__ = [
     "FileUpload",
     "User",
     "ApiConfig",
+    "IngestJob",
+    "ColumnMapping",
+    "StoredFile",
+    "UploadSession",
+    "UploadChunk",
 ]
 
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ColumnMapping(Base):
+    """Resolved column mapping for an uploaded sheet layout, keyed by a fingerprint of its header row."""
+    __tablename__ = "column_mappings"
+    
+    fingerprint = Column(String(64), primary_key=True)  # SHA-256 of kind + header row
+    kind = Column(String(50), nullable=False)  # 'payments', 'system_performance', 'employees'
+    header = Column(Text, nullable=False)  # JSON list of the header labels, for inspection
+    mapping = Column(Text, nullable=False)  # JSON {role: column position or null}
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
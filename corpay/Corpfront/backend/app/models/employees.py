@@ -1,15 +1,20 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
 
 class EmployeeMilestone(Base):
     __tablename__ = "employee_milestones"
+    __table_args__ = (
+        # Natural key used to dedupe Excel uploads (re-uploads upsert instead of duplicating)
+        Index("uq_employee_milestones_natural_key", "name", "milestone_type", "milestone_date", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
     description = Column(String(200), nullable=False)
     avatar_path = Column(String(500))  # Path to uploaded image
+    avatar_variants = Column(Text)  # JSON {format: {size: path}} of resized avatars (see app/services/avatars.py)
     border_color = Column(String(7), nullable=False)  # Hex color
     background_color = Column(String(7), nullable=False)  # Hex color
     milestone_type = Column(String(50), nullable=False, index=True)  # 'anniversary', 'birthday', 'promotion', 'new_hire'
@@ -18,4 +23,8 @@ class EmployeeMilestone(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     is_active = Column(Integer, default=1)  # 1 for active, 0 for inactive
+    # Set by sheet uploads (see app/services/ingest.py): SHA-256 of the natural key,
+    # and of every sheet-derived field, so delta uploads can diff without comparing columns
+    row_key = Column(String(64), index=True)
+    row_fingerprint = Column(String(64))
 
@@ -10,6 +10,7 @@ class FileType(str, enum.Enum):
     SYSTEM_PERFORMANCE = "system_performance"
     EMPLOYEE_DATA = "employee_data"
     EMPLOYEE_PHOTO = "employee_photo"
+    SLIDESHOW = "slideshow"
 
 
 class FileUpload(Base):
@@ -20,6 +21,7 @@ class FileUpload(Base):
     stored_path = Column(String(500), nullable=False)
     file_type = Column(Enum(FileType), nullable=False, index=True)
     file_size = Column(Integer)  # Size in bytes
+    content_hash = Column(String(64), index=True)  # SHA-256 of the file; identical uploads share one stored file
     processed = Column(Integer, default=0)  # 0 = not processed, 1 = processed
     error_message = Column(String(500))
     uploaded_by = Column(String(100))  # User email or ID
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    PENDING = (QUEUED, RUNNING)
+
+
+class IngestJob(Base):
+    """An uploaded file waiting for, or finished with, background parsing and DB writes."""
+    __tablename__ = "ingest_jobs"
+    
+    id = Column(String(36), primary_key=True)  # uuid4, returned to the uploader
+    file_upload_id = Column(Integer, ForeignKey("file_uploads.id"), nullable=False, index=True)
+    file_type = Column(String(50), nullable=False)  # FileType value
+    options = Column(Text)  # JSON, e.g. {"mode": "history"} for payments
+    status = Column(String(20), nullable=False, default=JobStatus.QUEUED, index=True)
+    stage = Column(String(50))  # 'parsing', 'writing', ...
+    rows_parsed = Column(Integer)
+    rows_written = Column(Integer)
+    result = Column(Text)  # JSON summary returned by the ingest function
+    error_message = Column(Text)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))  # Refreshed by the worker while the job runs
+    finished_at = Column(DateTime(timezone=True))
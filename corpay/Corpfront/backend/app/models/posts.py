@@ -16,6 +16,7 @@ class SocialPost(Base):
     post_type = Column(String(50), nullable=False, index=True)  # 'corpay' or 'cross_border'
     time_ago = Column(String(50))  # Human readable time
     source = Column(String(50), default='api')  # 'api' or 'manual' - to distinguish source
+    content_hash = Column(String(64), unique=True, index=True)  # sha256 of post_type + content, set for synced posts
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     is_active = Column(Integer, default=1)  # 1 for active, 0 for deleted
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class StoredFile(Base):
+    """A file in the upload directory and how many rows refer to it (see app/services/uploads.py)."""
+    __tablename__ = "stored_files"
+    
+    path = Column(String(500), primary_key=True)  # Relative to settings.upload_dir, e.g. ab/cd/<sha256>.xlsx
+    content_hash = Column(String(64), index=True)  # SHA-256; NULL for files stored before content addressing
+    size = Column(Integer)  # Bytes
+    ref_count = Column(Integer, nullable=False, default=0)  # FileUpload rows + avatars pointing here
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_referenced_at = Column(DateTime(timezone=True), server_default=func.now())
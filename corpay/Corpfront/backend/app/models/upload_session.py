@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class UploadStatus:
+    OPEN = "open"  # Accepting chunks
+    COMPLETING = "completing"  # Being assembled and verified
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class UploadSession(Base):
+    """A resumable upload sent in chunks (see app/api/chunked_uploads.py)."""
+    __tablename__ = "upload_sessions"
+    
+    id = Column(String(36), primary_key=True)  # uuid4, returned to the uploader
+    filename = Column(String(255), nullable=False)
+    file_type = Column(String(50), nullable=False)  # FileType value the file is for
+    size = Column(Integer, nullable=False)  # Total bytes
+    chunk_size = Column(Integer, nullable=False)  # Bytes per chunk (the last may be shorter)
+    content_hash = Column(String(64))  # SHA-256 of the whole file declared by the client, if any
+    status = Column(String(20), nullable=False, default=UploadStatus.OPEN, index=True)
+    error_message = Column(String(500))
+    file_upload_id = Column(Integer, ForeignKey("file_uploads.id"))  # Set once completed
+    uploaded_by = Column(String(100))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True))
+
+
+class UploadChunk(Base):
+    """A chunk of an ``UploadSession`` received and verified."""
+    __tablename__ = "upload_chunks"
+    
+    upload_id = Column(String(36), ForeignKey("upload_sessions.id", ondelete="CASCADE"), primary_key=True)
+    index = Column(Integer, primary_key=True)  # offset // chunk_size
+    size = Column(Integer, nullable=False)
+    sha256 = Column(String(64), nullable=False)
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
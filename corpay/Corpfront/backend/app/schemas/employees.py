@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+import json
+from pydantic import BaseModel, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 
 class EmployeeMilestoneCreate(BaseModel):
@@ -30,6 +31,8 @@ class EmployeeMilestoneResponse(BaseModel):
     name: str
     description: str
     avatar_path: Optional[str]
+    # {"webp": {"64": path, ...}, "jpeg": {...}}; paths are relative to /uploads like avatar_path
+    avatar_variants: Optional[Dict[str, Dict[str, str]]] = None
     border_color: str
     background_color: str
     milestone_type: str
@@ -37,6 +40,11 @@ class EmployeeMilestoneResponse(BaseModel):
     milestone_date: datetime
     created_at: datetime
     
+    @field_validator("avatar_variants", mode="before")
+    @classmethod
+    def _parse_variants(cls, value):
+        return json.loads(value) if isinstance(value, str) else value
+    
     class Config:
         from_attributes = True
 
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class IngestJobResponse(BaseModel):
+    id: str
+    file_upload_id: int
+    file_type: str
+    status: str
+    stage: Optional[str] = None
+    rows_parsed: Optional[int] = None
+    rows_written: Optional[int] = None
+    result: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    file_type: str  # FileType value: slideshow, revenue, payments, system_performance, employee_data
+    size: int  # Total bytes
+    sha256: Optional[str] = None  # Whole-file hash, verified on completion
+    chunk_size: Optional[int] = None  # Defaults to 5 MB
+
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    filename: str
+    file_type: str
+    size: int
+    chunk_size: int
+    chunk_count: int
+    status: str
+    received: List[int]  # Chunk indexes stored so far
+    missing: List[int]  # Chunk indexes still to send
+    file_upload_id: Optional[int] = None
+    error_message: Optional[str] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
@@ -0,0 +1,124 @@
+"""
+Avatar variants for employee photos.
+
+HR uploads phone photos of several MB, but milestone cards show a small
+circle. Each uploaded photo is turned into square avatars at ``AVATAR_SIZES``
+in WebP and JPEG: rotated upright from its EXIF orientation, center-cropped
+and resized. Variants are stored next to the original in the
+content-addressed store as ``ab/cd/<sha256>-<size>.<format>``, so they are
+derived deterministically from the photo's content, are rendered once per
+photo, and have stable URLs.
+
+Decoding and resizing are CPU-bound, so they run on a small process pool
+(``IMAGE_WORKERS``) of their own rather than on the event loop or the ingest
+pool. A photo Pillow cannot read keeps its original and gets no variants.
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Optional
+from PIL import Image, ImageOps
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+AVATAR_SIZES = (64, 128, 256)  # Square edge in pixels
+FORMATS = {
+    # format: (extension, save options)
+    "webp": ("webp", {"quality": 80, "method": 4}),
+    "jpeg": ("jpg", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+Variants = Dict[str, Dict[str, str]]  # {format: {size: path relative to the upload directory}}
+
+
+def variant_path(photo_path: str, size: int, fmt: str) -> str:
+    """Where the ``size`` px ``fmt`` variant of the photo stored at ``photo_path`` goes."""
+    photo = Path(photo_path)
+    return str(photo.with_name(f"{photo.stem}-{size}.{FORMATS[fmt][0]}").as_posix())
+
+
+def render_variants(photo_path: str) -> Variants:
+    """
+    Render every avatar variant of the photo at ``photo_path`` (relative to the
+    upload directory) that is not on disk yet. Blocking and CPU-bound; runs in
+    an image pool worker. Raises OSError if Pillow cannot read the photo,
+    ValueError if the path is not inside the upload directory.
+    """
+    upload_dir = Path(settings.upload_dir).resolve()
+    if not (upload_dir / photo_path).resolve().is_relative_to(upload_dir):
+        raise ValueError("Photo path is outside the upload directory")
+    variants: Variants = {fmt: {str(size): variant_path(photo_path, size, fmt) for size in AVATAR_SIZES}
+                          for fmt in FORMATS}
+    if all((upload_dir / path).exists() for sizes in variants.values() for path in sizes.values()):
+        return variants
+
+    with Image.open(upload_dir / photo_path) as image:
+        # JPEG can decode at 1/2, 1/4 or 1/8 scale: no need to decode a 12 MP photo for a 256 px avatar
+        image.draft("RGB", (max(AVATAR_SIZES) * 2, max(AVATAR_SIZES) * 2))
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            # Flatten transparency onto white; JPEG has no alpha and cards have light backgrounds
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            rgba = image.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            image = background
+        square = ImageOps.fit(image, (max(AVATAR_SIZES),) * 2, method=Image.Resampling.LANCZOS)
+
+    for size in AVATAR_SIZES:
+        resized = square if size == square.width else square.resize((size, size), Image.Resampling.LANCZOS)
+        for fmt, (_, options) in FORMATS.items():
+            target = upload_dir / variants[fmt][str(size)]
+            temp = target.with_name(f".{target.name}.tmp")
+            resized.save(temp, format=fmt.upper(), **options)
+            temp.replace(target)
+    return variants
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that runs an event loop and DB pools is not safe
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.image_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def create_variants(photo_path: Optional[str]) -> Optional[str]:
+    """
+    Render the avatar variants of a stored photo on the image pool. Returns
+    them as JSON for ``EmployeeMilestone.avatar_variants``, or None when there
+    is no photo or it could not be processed (the original is still served).
+    """
+    global _executor
+    if not photo_path:
+        return None
+    loop = asyncio.get_running_loop()
+    try:
+        variants = await loop.run_in_executor(_get_executor(), render_variants, photo_path)
+    except BrokenProcessPool:
+        # A worker died (e.g. a decompression bomb ran it out of memory); start a fresh pool
+        _executor = None
+        logger.error("Image worker crashed while processing %s", photo_path)
+        return None
+    except Exception as e:
+        print(f"Warning: Could not create avatar variants for {photo_path}: {e}")
+        return None
+    return json.dumps(variants)
+
+
+def shutdown() -> None:
+    """Stop the image worker pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
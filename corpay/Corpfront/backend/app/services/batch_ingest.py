@@ -0,0 +1,226 @@
+"""
+Batch uploads: a zip of dashboard workbooks / exports ingested in one go.
+
+Each file in the archive is identified by its sheet names and header row,
+and all of them are parsed at once on the ingest process pool, so a month-end
+load takes about as long as its slowest file (given ``INGEST_WORKERS`` at
+least the number of files). The parsed data is then written with one
+transaction per file type: every payments file of the batch commits
+together, and so on. Files are recorded as ordinary ``FileUpload`` +
+``IngestJob`` rows, so they show up in the job status API and are deduped
+like single uploads.
+
+Members are extracted straight into the content-addressed store while the
+archive is read, with the member count, each member's size and the total
+uncompressed size capped as the bytes arrive (zip headers are not trusted),
+so a zip bomb is rejected before it fills memory or disk. Workers are handed
+stored paths, never file contents. Members extracted from a rejected archive,
+or that fail to parse, are left unreferenced for the upload GC.
+"""
+import json
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional
+from app.config import settings
+from app.database import SessionLocal
+from app.models.file_upload import FileUpload, FileType
+from app.models.ingest_job import JobStatus
+from app.services import ingest, tabular_stream
+from app.services.column_mappings import ColumnMappings
+from app.services.excel_parser import ExcelWorkbook, _resolve_payments_columns
+from app.services.uploads import retain_file
+from app.utils.file_handler import SavedUpload, max_upload_mb, store_stream
+
+BATCH_EXTENSIONS = ('.xlsx', '.xls') + tabular_stream.STREAM_EXTENSIONS
+
+# Fallback when the header is not recognised: keywords in sheet names
+SHEET_NAME_HINTS = [
+    ("revenue", FileType.REVENUE),
+    ("payment", FileType.PAYMENTS),
+    ("uptime", FileType.SYSTEM_PERFORMANCE),
+    ("performance", FileType.SYSTEM_PERFORMANCE),
+    ("employee", FileType.EMPLOYEE_DATA),
+    ("milestone", FileType.EMPLOYEE_DATA),
+]
+
+
+class ArchiveMember(NamedTuple):
+    name: str  # Path inside the archive
+    saved: SavedUpload  # Where it was extracted to in the store
+
+
+def read_archive(source: BinaryIO, max_total_bytes: int, max_files: int) -> List[ArchiveMember]:
+    """
+    Extract the Excel / CSV / Parquet files in a zip archive to the store
+    (blocking; run in the threadpool). Raises ValueError for an invalid or
+    empty archive, more than ``max_files`` files, a file over the upload
+    size limit of its type or more than ``max_total_bytes`` in all, each
+    counted while extracting.
+    """
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile:
+        raise ValueError("File is not a valid zip archive")
+
+    members = []
+    total = 0
+    with archive:
+        for info in archive.infolist():
+            path = PurePosixPath(info.filename)
+            if info.is_dir() or "__MACOSX" in path.parts or path.name.startswith((".", "~$")):
+                continue
+            if path.suffix.lower() not in BATCH_EXTENSIONS:
+                continue
+            if len(members) >= max_files:
+                raise ValueError(f"The archive contains more than {max_files} files")
+            member_limit = max_upload_mb(path.name) * 1024 * 1024
+            limit = min(member_limit, max_total_bytes - total)
+            try:
+                with archive.open(info) as f:
+                    saved = store_stream(f, path.name, limit)
+            except ValueError:
+                if limit < member_limit:
+                    raise ValueError(f"The archive's files exceed {max_total_bytes // (1024 * 1024)} MB uncompressed")
+                raise ValueError(f"{info.filename} exceeds the upload size limit")
+            except zipfile.BadZipFile as e:
+                raise ValueError(f"{info.filename} could not be extracted: {e}")
+            total += saved.size
+            members.append(ArchiveMember(info.filename, saved))
+    if not members:
+        raise ValueError("The archive contains no Excel, CSV or Parquet files")
+    return members
+
+
+def detect_file_type(source) -> Optional[FileType]:
+    """Identify a dashboard file by its header row, then by its sheet names."""
+    if tabular_stream.is_streamable(source):
+        sheet_names, header = [], tabular_stream.read_header(source)
+    else:
+        with ExcelWorkbook(source) as workbook:
+            sheet_names = workbook.sheet_names
+            header = workbook.header() if sheet_names else []
+    labels = [str(label).lower() for label in header]
+    names = [str(name).lower() for name in sheet_names]
+
+    if any("trend" in name or "proportion" in name for name in names) or \
+            "total revenue" in labels or "total_revenue" in labels:
+        detected = FileType.REVENUE
+    elif any("milestone" in label for label in labels) or {"name", "description"} <= set(labels):
+        detected = FileType.EMPLOYEE_DATA
+    elif any("uptime" in label for label in labels):
+        detected = FileType.SYSTEM_PERFORMANCE
+    elif _resolve_payments_columns(header)["amount"] is not None and any("date" in label for label in labels):
+        detected = FileType.PAYMENTS
+    else:
+        detected = next((file_type for keyword, file_type in SHEET_NAME_HINTS
+                         if any(keyword in name for name in names)), None)
+
+    if detected is not None and tabular_stream.is_streamable(source) and \
+            detected not in (FileType.PAYMENTS, FileType.SYSTEM_PERFORMANCE):
+        return None  # Only payments and system performance accept CSV / Parquet
+    return detected
+
+
+def parse_member(stored_path: str, options: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Identify and parse one extracted archive member (``stored_path`` relative
+    to the upload directory); runs in an ingest pool worker. ``options`` are
+    the ingest options per file type. Returns {"file_type", "parsed"} or
+    {"file_type", "error"}; never raises.
+    """
+    source = str(Path(settings.upload_dir) / stored_path)
+    file_type = None
+    try:
+        detected = detect_file_type(source)
+        if detected is None:
+            return {"file_type": None, "error": "Could not identify the file from its sheets or columns"}
+        file_type = detected.value
+        db = SessionLocal()
+        try:
+            mappings = ColumnMappings(db)
+            parsed = ingest.parse_upload(file_type, source, options.get(file_type, {}), mappings)
+            mappings.save()
+            db.commit()
+        finally:
+            db.close()
+        return {"file_type": file_type, "parsed": parsed}
+    except Exception as e:
+        return {"file_type": file_type, "error": str(e)}
+
+
+def _record_upload(db, member: ArchiveMember, file_type: str, uploaded_by: str) -> FileUpload:
+    saved = member.saved
+    file_upload = FileUpload(
+        original_filename=PurePosixPath(member.name).name,
+        stored_path=saved.path,
+        file_type=FileType(file_type),
+        file_size=saved.size,
+        content_hash=saved.content_hash,
+        uploaded_by=uploaded_by,
+    )
+    db.add(file_upload)
+    retain_file(db, saved.path, saved.content_hash, saved.size)
+    return file_upload
+
+
+def write_file_type(
+    file_type: str,
+    members: List[ArchiveMember],
+    parsed: List[Any],
+    options: Dict[str, Any],
+    uploaded_by: str,
+    force: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Store and record every parsed member of one file type, then write all of
+    them in a single transaction together with their jobs' final status.
+    Blocking; run in the threadpool. Returns one result entry per member.
+    """
+    db = SessionLocal()
+    try:
+        # Recorded first (committed as running) so a crash mid-write leaves
+        # jobs that resume_pending_jobs re-runs from the stored files
+        entries = []
+        for member in members:
+            file_upload = _record_upload(db, member, file_type, uploaded_by)
+            job = ingest.create_job(db, file_upload, options, force=force)
+            if job.status != JobStatus.SUCCEEDED:
+                job.status = JobStatus.RUNNING
+                job.stage = "writing"
+                job.started_at = datetime.now(timezone.utc)
+                job.attempts = 1
+            entries.append((member, file_upload, job))
+        db.commit()
+
+        results = []
+        try:
+            for (member, file_upload, job), data in zip(entries, parsed):
+                if job.status == JobStatus.SUCCEEDED:
+                    result = json.loads(job.result)  # Identical to the last processed upload
+                else:
+                    result = ingest.WRITERS[file_type](db, data, options)
+                    file_upload.processed = 1
+                    job.status = JobStatus.SUCCEEDED
+                    job.stage = "done"
+                    job.rows_written = result.get("rows_written")
+                    job.result = json.dumps(result, default=str)
+                    job.finished_at = datetime.now(timezone.utc)
+                results.append({"filename": member.name, "file_type": file_type, "status": JobStatus.SUCCEEDED,
+                                "file_id": file_upload.id, "job_id": job.id, "result": result})
+            db.commit()
+            return results
+        except Exception as e:
+            db.rollback()
+            for _, file_upload, job in entries:
+                if job.status != JobStatus.SUCCEEDED:
+                    job.status = JobStatus.FAILED
+                    job.error_message = str(e)
+                    job.finished_at = datetime.now(timezone.utc)
+                    file_upload.error_message = str(e)[:500]
+            db.commit()
+            return [{"filename": member.name, "file_type": file_type, "status": job.status,
+                     "file_id": file_upload.id, "job_id": job.id, "error": job.error_message}
+                    for member, file_upload, job in entries]
+    finally:
+        db.close()
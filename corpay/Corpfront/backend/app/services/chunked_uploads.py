@@ -0,0 +1,179 @@
+"""
+Resumable uploads sent in chunks.
+
+A client opens an ``UploadSession`` with the file's name, type, size and
+(optionally) SHA-256, then PUTs fixed-size chunks at their byte offsets, in
+any order and in parallel, and finally completes the session. Each chunk is
+hashed on arrival (and checked against the client's hash when given), written
+straight into its place in a preallocated file in the upload directory's
+``.incoming`` area, and recorded as an ``UploadChunk`` row. After a dropped
+connection the client asks which chunks are missing and sends only those.
+On completion the file is hashed as a whole, checked against the declared
+hash, and moved into the content-addressed store.
+
+Each chunk write first drops a marker file next to the part file and only
+then opens the part file. Completion renames the part file out of the way
+and waits for the markers present at that point before hashing, so a chunk
+still being written when the upload is completed either lands before the
+hash is taken or finds no part file and is refused; it can never change a
+verified file. (Plain files and renames only, so it works the same on
+Windows, where an open file cannot be renamed and the rename is retried.)
+
+Nothing is spooled: each request holds one chunk in memory. Sessions idle
+for longer than ``GC_GRACE_HOURS`` lose their partial file to the upload
+garbage collector and must start over.
+"""
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.models.file_upload import FileType
+from app.models.upload_session import UploadChunk, UploadSession
+from app.services import tabular_stream
+from app.utils.bulk import bulk_upsert
+from app.utils.file_handler import SavedUpload, incoming_dir, store_incoming
+
+DEFAULT_CHUNK_SIZE = 5 * 1024 * 1024
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+
+# How long completion waits for chunk writes already in progress; a marker
+# older than this is from a writer that died and is ignored
+WRITE_WAIT_SECONDS = 30
+
+SHEET_EXTENSIONS = ('.xlsx', '.xls')
+
+# File types that can be uploaded in chunks, and the extensions each accepts
+ACCEPTED_EXTENSIONS = {
+    FileType.SLIDESHOW.value: ('.pptx', '.ppt', '.pdf'),
+    FileType.REVENUE.value: SHEET_EXTENSIONS,
+    FileType.PAYMENTS.value: SHEET_EXTENSIONS + tabular_stream.STREAM_EXTENSIONS,
+    FileType.SYSTEM_PERFORMANCE.value: SHEET_EXTENSIONS + tabular_stream.STREAM_EXTENSIONS,
+    FileType.EMPLOYEE_DATA.value: SHEET_EXTENSIONS,
+}
+
+# Ingest modes per file type (the `mode` of the single-request upload endpoints)
+MODES = {
+    FileType.PAYMENTS.value: ("latest", "history"),
+    FileType.EMPLOYEE_DATA.value: ("upsert", "delta"),
+}
+
+
+def chunk_count(session: UploadSession) -> int:
+    return -(-session.size // session.chunk_size)
+
+
+def chunk_length(session: UploadSession, index: int) -> int:
+    """Expected length of chunk ``index`` (only the last one may be short)."""
+    return min(session.chunk_size, session.size - index * session.chunk_size)
+
+
+def received_chunks(db: Session, upload_id: str) -> List[int]:
+    return [index for (index,) in db.query(UploadChunk.index).filter(
+        UploadChunk.upload_id == upload_id
+    ).order_by(UploadChunk.index)]
+
+
+def part_path(upload_id: str) -> Path:
+    return incoming_dir() / f"{upload_id}.part"
+
+
+def _assembling_path(upload_id: str) -> Path:
+    return incoming_dir() / f"{upload_id}.assembling"
+
+
+def _writes_in_progress(upload_id: str) -> bool:
+    """Whether a chunk write of this upload is running (markers of writers that died expire)."""
+    for marker in incoming_dir().glob(f"{upload_id}.writing-*"):
+        try:
+            if time.time() - marker.stat().st_mtime < WRITE_WAIT_SECONDS:
+                return True
+        except FileNotFoundError:
+            continue  # Finished meanwhile
+    return False
+
+
+def create_part_file(upload_id: str, size: int) -> None:
+    """Preallocate (sparsely) the file chunks are written into (blocking)."""
+    with open(part_path(upload_id), "wb") as f:
+        f.truncate(size)
+
+
+def write_chunk(upload_id: str, offset: int, data: bytes) -> None:
+    """
+    Write one chunk at its offset (blocking; run in the threadpool). Parallel
+    chunks use separate file objects and write disjoint ranges, so they never
+    interfere. Raises FileNotFoundError once the session has expired or been
+    claimed by ``assemble``.
+    """
+    # The marker must exist before the part file is opened (see module docstring)
+    marker = incoming_dir() / f"{upload_id}.writing-{uuid.uuid4().hex}"
+    marker.touch()
+    try:
+        with open(part_path(upload_id), "r+b") as f:
+            f.seek(offset)
+            f.write(data)
+    finally:
+        marker.unlink(missing_ok=True)
+
+
+def record_chunk(db: Session, upload_id: str, index: int, size: int, sha256: str) -> None:
+    """Mark a chunk received (does not commit); re-sent chunks overwrite their row."""
+    bulk_upsert(
+        db,
+        UploadChunk,
+        [{"upload_id": upload_id, "index": index, "size": size, "sha256": sha256}],
+        conflict_columns=["upload_id", "index"],
+        update_columns=["size", "sha256"],
+    )
+
+
+def assemble(session: UploadSession) -> SavedUpload:
+    """
+    Verify the fully received file against the declared hash and move it into
+    the content-addressed store (blocking). The part file is first renamed
+    away, which refuses later chunk writes, and chunk writes in progress are
+    waited for. Raises ValueError on a hash mismatch (the file is discarded)
+    and FileNotFoundError once expired.
+    """
+    path = part_path(session.id)
+    claimed = _assembling_path(session.id)
+    deadline = time.monotonic() + WRITE_WAIT_SECONDS
+    while True:
+        try:
+            os.replace(path, claimed)
+            break
+        except PermissionError:
+            # Windows: a chunk writer still has the part file open
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+    # Writers that opened the part file before the rename still write into it
+    while _writes_in_progress(session.id) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    try:
+        return store_incoming(claimed, session.filename, session.content_hash)
+    except ValueError:
+        claimed.unlink(missing_ok=True)
+        raise
+    except BaseException:
+        if claimed.exists():
+            os.replace(claimed, path)  # Back to accepting chunks
+        raise
+
+
+def discard(upload_id: str) -> None:
+    part_path(upload_id).unlink(missing_ok=True)
+    _assembling_path(upload_id).unlink(missing_ok=True)
+
+
+def validate_hash(value: Optional[str]) -> Optional[str]:
+    """A lower-case SHA-256 hex digest, or None; raises ValueError for anything else."""
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if len(value) != 64 or any(c not in "0123456789abcdef" for c in value):
+        raise ValueError("sha256 must be a hex SHA-256 digest")
+    return value
@@ -0,0 +1,99 @@
+"""
+Cache of resolved column mappings for uploaded sheet layouts.
+
+Finance uploads a handful of fixed templates, so the header row of a sheet
+identifies its layout. ``ColumnMappings`` fingerprints the header (SHA-256 of
+the sheet kind and labels) and remembers which column plays which role, as
+resolved the first time that layout was parsed: by name, or by the numeric
+column fallback. Later uploads of the same template skip both and read only
+the mapped columns.
+
+Mappings are stored as column positions in the ``column_mappings`` table and
+memoized per process once the transaction writing them commits. Bump
+``MAPPING_VERSION`` whenever the resolution rules in ``excel_parser`` change
+so stale mappings are ignored.
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.column_mapping import ColumnMapping
+from app.utils.bulk import bulk_upsert
+
+MAPPING_VERSION = 1
+
+# Process-wide memo of fingerprint -> {role: column position}
+_known: Dict[str, Dict[str, Optional[int]]] = {}
+
+
+def header_fingerprint(kind: str, header: List[Any]) -> str:
+    labels = json.dumps([MAPPING_VERSION, kind, [str(label) for label in header]])
+    return hashlib.sha256(labels.encode("utf-8")).hexdigest()
+
+
+class ColumnMappings:
+    """
+    Mapping lookups and inserts through ``db``. Passed to the ``ExcelParser``
+    and ``tabular_stream`` parse functions; new mappings are written by
+    ``save`` in the caller's transaction and not committed here.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Written by ``save`` but not committed yet: memoized on commit, dropped on rollback
+        self._saved: Dict[str, Dict[str, Optional[int]]] = {}
+        event.listen(db, "after_commit", self._committed)
+        event.listen(db, "after_soft_rollback", self._rolled_back)
+
+    def _committed(self, session: Session) -> None:
+        _known.update(self._saved)
+        self._saved = {}
+
+    def _rolled_back(self, session: Session, previous_transaction) -> None:
+        self._saved = {}
+
+    def lookup(self, kind: str, header: List[Any]) -> Optional[Dict[str, Any]]:
+        """The cached {role: column label} for this header, or None for an unknown layout."""
+        fingerprint = header_fingerprint(kind, header)
+        positions = _known.get(fingerprint) or self._saved.get(fingerprint)
+        if positions is None and fingerprint in self._pending:
+            positions = json.loads(self._pending[fingerprint]["mapping"])
+        if positions is None:
+            row = self.db.query(ColumnMapping.mapping).filter(ColumnMapping.fingerprint == fingerprint).first()
+            if row is None:
+                return None
+            # Committed by whoever wrote it, so safe to memoize
+            positions = _known[fingerprint] = json.loads(row.mapping)
+        if any(position is not None and position >= len(header) for position in positions.values()):
+            return None
+        return {role: None if position is None else header[position] for role, position in positions.items()}
+
+    def store(self, kind: str, header: List[Any], columns: Dict[str, Any]) -> None:
+        """Remember the resolved {role: column label} for this header; written by ``save``."""
+        fingerprint = header_fingerprint(kind, header)
+        positions = {role: None if label is None else header.index(label) for role, label in columns.items()}
+        self._pending[fingerprint] = {
+            "fingerprint": fingerprint,
+            "kind": kind,
+            "header": json.dumps([str(label) for label in header]),
+            "mapping": json.dumps(positions),
+        }
+
+    def save(self) -> None:
+        """
+        Upsert mappings stored since the last save (does not commit). Kept
+        separate from ``store`` so callers can write them after any progress
+        updates made from other sessions (SQLite allows one writer).
+        """
+        if self._pending:
+            bulk_upsert(
+                self.db,
+                ColumnMapping,
+                self._pending.values(),
+                conflict_columns=["fingerprint"],
+                update_columns=["mapping"],
+            )
+            self._saved.update({fingerprint: json.loads(row["mapping"]) for fingerprint, row in self._pending.items()})
+            self._pending = {}
@@ -1,11 +1,257 @@
 import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
 from datetime import datetime
 from pathlib import Path
 
+# Columns the revenue sheets are read with; anything else in the sheet is never materialized
+TREND_COLUMNS = {"Month", "month", "Value", "value", "Highlight", "highlight"}
+PROPORTION_COLUMNS = {"Category", "category", "Percentage", "percentage"}
+EMPLOYEE_COLUMNS = {
+    "Name", "name", "Description", "description",
+    "Milestone Type", "milestone_type", "Department", "department",
+}
+
+
+try:
+    import python_calamine
+except ImportError:  # optional: falls back to openpyxl read-only streaming
+    python_calamine = None
+
+
+class ExcelWorkbook:
+    """
+    A workbook opened once and read sheet by sheet as a stream of rows.
+
+    Uses the Rust calamine reader when python-calamine is installed, otherwise
+    openpyxl in read-only (streaming) mode; legacy .xls without calamine falls
+    back to pandas. ``read`` keeps only the requested columns while streaming,
+    so cells in columns the dashboard never uses are not materialized.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._calamine = None
+        self._openpyxl = None
+        self._pandas = None
+        if python_calamine is not None:
+            if hasattr(source, "read"):
+                self._calamine = python_calamine.CalamineWorkbook.from_filelike(source)
+            else:
+                self._calamine = python_calamine.CalamineWorkbook.from_path(str(source))
+        elif str(getattr(source, "name", source)).lower().endswith(".xls"):
+            self._pandas = pd.ExcelFile(source)
+        else:
+            import openpyxl
+            self._openpyxl = openpyxl.load_workbook(source, read_only=True, data_only=True)
+
+    @property
+    def sheet_names(self) -> List[str]:
+        if self._calamine is not None:
+            return list(self._calamine.sheet_names)
+        if self._openpyxl is not None:
+            return list(self._openpyxl.sheetnames)
+        return list(self._pandas.sheet_names)
+
+    def _iter_rows(self, sheet) -> Iterator[List[Any]]:
+        name = self.sheet_names[sheet] if isinstance(sheet, int) else sheet
+        if self._calamine is not None:
+            for row in self._calamine.get_sheet_by_name(name).iter_rows():
+                yield [None if value == "" else value for value in row]
+        else:
+            worksheet = self._openpyxl[name]
+            worksheet.reset_dimensions()  # some writers record a bogus A1 dimension
+            for row in worksheet.iter_rows(values_only=True):
+                yield list(row)
+
+    @staticmethod
+    def _header_names(row: List[Any]) -> List[Any]:
+        """Column labels as pandas would produce them (Unnamed: N, duplicate .1 suffixes)."""
+        names = []
+        seen: Dict[Any, int] = {}
+        for i, value in enumerate(row):
+            name = f"Unnamed: {i}" if value is None else value
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            names.append(name)
+        return names
+
+    def header(self, sheet=0) -> List[Any]:
+        """Column names of a sheet without loading its rows."""
+        if self._pandas is not None:
+            return list(self._pandas.parse(sheet, nrows=0).columns)
+        for row in self._iter_rows(sheet):
+            if any(value is not None for value in row):
+                return self._header_names(row)
+        return []
+
+    def read(self, sheet=0, columns: Optional[Iterable[Any]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read a sheet into a DataFrame holding only ``columns`` (all when None).
+        Blank rows are skipped, matching ``pd.read_excel``.
+        """
+        wanted = None if columns is None else set(columns)
+        if self._pandas is not None:
+            usecols = None if wanted is None else (lambda col: col in wanted)
+            return self._pandas.parse(sheet, usecols=usecols, nrows=nrows)
+
+        rows = self._iter_rows(sheet)
+        names: List[Any] = []
+        for row in rows:
+            if any(value is not None for value in row):
+                names = self._header_names(row)
+                break
+        keep = [i for i, name in enumerate(names) if wanted is None or name in wanted]
+        data: List[List[Any]] = [[] for _ in keep]
+        width = len(names)
+        count = 0
+        for row in rows:
+            if nrows is not None and count >= nrows:
+                break
+            if len(row) < width:
+                row = row + [None] * (width - len(row))
+            values = [row[i] for i in keep]
+            if all(value is None for value in values):
+                continue
+            for column, value in zip(data, values):
+                column.append(value)
+            count += 1
+        return pd.DataFrame({names[i]: column for i, column in zip(keep, data)})
+
+    def close(self) -> None:
+        for book in (self._calamine, self._openpyxl, self._pandas):
+            if book is not None and hasattr(book, "close"):
+                book.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _resolve_payments_columns(columns: List[Any]) -> Dict[str, Optional[str]]:
+    """Map a payments header row to its date / amount / transaction-count columns."""
+    date_col = None
+    for col in columns:
+        if 'date' in str(col).lower():
+            date_col = col
+            break
+    amount_col = None
+    trans_col = None
+    for col in columns:
+        col_lower = str(col).lower()
+        if 'amount' in col_lower or 'processed' in col_lower:
+            amount_col = col
+        if 'transaction' in col_lower or 'count' in col_lower:
+            trans_col = col
+    return {"date": date_col, "amount": amount_col, "transactions": trans_col}
+
+
+def _resolve_system_performance_columns(columns: List[Any]) -> Dict[str, Optional[str]]:
+    """Map a system performance header row to its uptime / success-rate columns."""
+    uptime_col = None
+    success_col = None
+    for col in columns:
+        col_lower = str(col).lower()
+        if 'uptime' in col_lower:
+            uptime_col = col
+        if 'success' in col_lower or 'rate' in col_lower:
+            success_col = col
+    return {"uptime": uptime_col, "success": success_col}
+
+
+def _resolve_employee_date_column(columns: List[Any]) -> Optional[str]:
+    for col in columns:
+        if 'date' in str(col).lower():
+            return col
+    return None
+
+
+def _resolve_employee_columns(columns: List[Any]) -> Dict[str, Optional[str]]:
+    return {"date": _resolve_employee_date_column(columns)}
+
+
+def _numeric_columns(df: pd.DataFrame, exclude: Optional[str] = None) -> List[Any]:
+    return [col for col in df.columns if col != exclude and pd.api.types.is_numeric_dtype(df[col])]
+
+
+def _mapped_columns(mappings, kind: str, header: List[Any], resolve) -> Tuple[Dict[str, Optional[str]], bool]:
+    """
+    Columns for ``header`` from the layout cache (``ColumnMappings``) when it
+    knows this header, else from ``resolve``. Returns (columns, cached).
+    """
+    if mappings is not None:
+        cols = mappings.lookup(kind, header)
+        if cols is not None:
+            return cols, True
+    return resolve(header), False
+
+
+# Default colors by revenue category / milestone type
+PROPORTION_COLORS = {
+    "Fleet": "#981239",
+    "Corporate": "#3D1628",
+    "Lodging": "#E6E8E7"
+}
+DEFAULT_PROPORTION_COLOR = "#981239"
+MILESTONE_BORDER_COLORS = {
+    "anniversary": "#981239",
+    "birthday": "#BE1549",
+    "promotion": "#981239",
+    "new_hire": "#0085C2",
+}
+MILESTONE_BACKGROUND_COLORS = {
+    "anniversary": "#fef5f8",
+    "birthday": "#fff5f9",
+    "promotion": "#fef5f8",
+    "new_hire": "#f0f9fd",
+}
+DEFAULT_MILESTONE_COLORS = {"border": "#981239", "background": "#fef5f8"}
+
+
+def _column(df: pd.DataFrame, names: Iterable[str], default: Any = None) -> pd.Series:
+    """The first of ``names`` present in ``df`` (resolved once per sheet), else a constant column."""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def _text(series: pd.Series, default: str = "") -> pd.Series:
+    """Vectorized str() with blank cells mapped to ``default`` instead of 'nan'."""
+    return series.astype(object).where(series.notna(), default).astype(str).str.strip()
+
+
+def _to_datetime(series: pd.Series) -> pd.Series:
+    """
+    Parse a whole date column; fall back to per-element parsing for mixed
+    formats, where cells that are not dates become NaT.
+    """
+    try:
+        return pd.to_datetime(series)
+    except (ValueError, TypeError):
+        return pd.to_datetime(series, format="mixed", errors="coerce")
+
+
+def _records(columns: Dict[str, pd.Series]) -> List[Dict[str, Any]]:
+    """Zip aligned columns into row dicts (much cheaper than ``DataFrame.to_dict('records')``)."""
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*(col.tolist() for col in columns.values()))]
+
 
 class ExcelParser:
-    """Service for parsing Excel files and extracting dashboard data"""
+    """
+    Service for parsing Excel files and extracting dashboard data.
+
+    Each workbook is opened once (``ExcelWorkbook``) and every sheet is streamed
+    through that handle, keeping only the columns the dashboard actually uses.
+    Header rows are read first to resolve which columns to keep; pass a
+    ``ColumnMappings`` as ``mappings`` to reuse the columns resolved for an
+    earlier upload with the same header (see ``app.services.column_mappings``).
+    """
     
     @staticmethod
     def parse_revenue_file(file_path: str) -> Dict[str, Any]:
@@ -17,253 +263,321 @@ class ExcelParser:
         - Sheet 3: Revenue proportions (Fleet, Corporate, Lodging)
         """
         try:
-            excel_file = pd.ExcelFile(file_path)
-            result = {
-                "total_revenue": None,
-                "percentage_change": None,
-                "revenue_trends": [],
-                "revenue_proportions": []
-            }
-            
-            # Parse total revenue (first sheet or specific sheet)
-            if len(excel_file.sheet_names) > 0:
-                df_total = pd.read_excel(file_path, sheet_name=0)
-                # Look for total revenue and percentage change
-                # Flexible parsing - look for common column names
-                if 'Total Revenue' in df_total.columns or 'total_revenue' in df_total.columns:
-                    col = 'Total Revenue' if 'Total Revenue' in df_total.columns else 'total_revenue'
-                    result["total_revenue"] = float(df_total[col].iloc[0])
-                elif len(df_total) > 0:
-                    # Try to find numeric value in first row
-                    for col in df_total.columns:
-                        if pd.api.types.is_numeric_dtype(df_total[col]):
-                            result["total_revenue"] = float(df_total[col].iloc[0])
-                            break
-                
-                # Look for percentage change
-                if 'Percentage Change' in df_total.columns or 'percentage_change' in df_total.columns:
-                    col = 'Percentage Change' if 'Percentage Change' in df_total.columns else 'percentage_change'
-                    result["percentage_change"] = float(df_total[col].iloc[0])
-            
-            # Parse revenue trends (second sheet or 'Trends' sheet)
-            trends_sheet = None
-            for sheet in excel_file.sheet_names:
-                if 'trend' in sheet.lower() or 'trends' in sheet.lower():
-                    trends_sheet = sheet
-                    break
-            
-            if trends_sheet:
-                df_trends = pd.read_excel(file_path, sheet_name=trends_sheet)
-
-                # Normalize and collect trends; we'll later sort them
-                # in calendar order (Jan–Dec) when serving from the API.
-                for _, row in df_trends.iterrows():
-                    raw_month = str(row.get('Month', row.get('month', ''))).strip()
-                    if not raw_month:
-                        continue
-
-                    # Normalize Excel month values to 3‑letter title‑case
-                    # so "January", "jan", "JAN" -> "Jan", etc.
-                    normalized_month = raw_month[:3].title()
-
-                    value = float(row.get('Value', row.get('value', 0)))
-                    highlight = bool(row.get('Highlight', row.get('highlight', False)))
-                    result["revenue_trends"].append({
-                        "month": normalized_month,
-                        "value": value,
-                        "highlight": highlight
-                    })
-            
-            # Parse revenue proportions (third sheet or 'Proportions' sheet)
-            proportions_sheet = None
-            for sheet in excel_file.sheet_names:
-                if 'proportion' in sheet.lower() or 'category' in sheet.lower():
-                    proportions_sheet = sheet
-                    break
-            
-            if proportions_sheet:
-                df_props = pd.read_excel(file_path, sheet_name=proportions_sheet)
-                # Default colors
-                colors = {
-                    "Fleet": "#981239",
-                    "Corporate": "#3D1628",
-                    "Lodging": "#E6E8E7"
-                }
-                
-                for _, row in df_props.iterrows():
-                    category = str(row.get('Category', row.get('category', '')))
-                    percentage = float(row.get('Percentage', row.get('percentage', 0)))
-                    color = colors.get(category, "#981239")
-                    result["revenue_proportions"].append({
-                        "category": category,
-                        "percentage": percentage,
-                        "color": color
-                    })
-            
-            return result
+            with ExcelWorkbook(file_path) as workbook:
+                return ExcelParser._parse_revenue_workbook(workbook)
         except Exception as e:
             raise ValueError(f"Error parsing revenue file: {str(e)}")
     
     @staticmethod
-    def parse_payments_file(file_path: str) -> Dict[str, Any]:
+    def _parse_revenue_workbook(workbook: ExcelWorkbook) -> Dict[str, Any]:
+        result = {
+            "total_revenue": None,
+            "percentage_change": None,
+            "revenue_trends": [],
+            "revenue_proportions": []
+        }
+        
+        # Parse total revenue (first sheet or specific sheet); only its first row is used
+        if len(workbook.sheet_names) > 0:
+            df_total = workbook.read(0, nrows=1)
+            # Look for total revenue and percentage change
+            # Flexible parsing - look for common column names
+            if 'Total Revenue' in df_total.columns or 'total_revenue' in df_total.columns:
+                col = 'Total Revenue' if 'Total Revenue' in df_total.columns else 'total_revenue'
+                result["total_revenue"] = float(df_total[col].iloc[0])
+            elif len(df_total) > 0:
+                # Try to find numeric value in first row
+                for col in df_total.columns:
+                    if pd.api.types.is_numeric_dtype(df_total[col]):
+                        result["total_revenue"] = float(df_total[col].iloc[0])
+                        break
+            
+            # Look for percentage change
+            if 'Percentage Change' in df_total.columns or 'percentage_change' in df_total.columns:
+                col = 'Percentage Change' if 'Percentage Change' in df_total.columns else 'percentage_change'
+                result["percentage_change"] = float(df_total[col].iloc[0])
+        
+        # Parse revenue trends (second sheet or 'Trends' sheet)
+        trends_sheet = None
+        for sheet in workbook.sheet_names:
+            if 'trend' in sheet.lower() or 'trends' in sheet.lower():
+                trends_sheet = sheet
+                break
+        
+        if trends_sheet:
+            df_trends = workbook.read(trends_sheet, columns=TREND_COLUMNS)
+
+            # Normalize and collect trends; we'll later sort them
+            # in calendar order (Jan–Dec) when serving from the API.
+            month = _text(_column(df_trends, ('Month', 'month'), ''))
+            has_month = month != ""
+            df_trends, month = df_trends[has_month], month[has_month]
+            highlight = _column(df_trends, ('Highlight', 'highlight'), False)
+            result["revenue_trends"] = _records({
+                # Normalize Excel month values to 3‑letter title‑case
+                # so "January", "jan", "JAN" -> "Jan", etc.
+                "month": month.str[:3].str.title(),
+                "value": _column(df_trends, ('Value', 'value'), 0).astype(float),
+                "highlight": highlight.astype(object).where(highlight.notna(), False).astype(bool),
+            })
+        
+        # Parse revenue proportions (third sheet or 'Proportions' sheet)
+        proportions_sheet = None
+        for sheet in workbook.sheet_names:
+            if 'proportion' in sheet.lower() or 'category' in sheet.lower():
+                proportions_sheet = sheet
+                break
+        
+        if proportions_sheet:
+            df_props = workbook.read(proportions_sheet, columns=PROPORTION_COLUMNS)
+            category = _text(_column(df_props, ('Category', 'category'), ''))
+            has_category = category != ""
+            df_props, category = df_props[has_category], category[has_category]
+            result["revenue_proportions"] = _records({
+                "category": category,
+                "percentage": _column(df_props, ('Percentage', 'percentage'), 0).astype(float),
+                "color": category.map(PROPORTION_COLORS).fillna(DEFAULT_PROPORTION_COLOR),
+            })
+        
+        return result
+    
+    @staticmethod
+    def parse_payments_file(file_path: str, mappings=None) -> Dict[str, Any]:
         """
         Parse payments Excel file
         Expected columns: Date, Amount Processed, Transaction Count
         """
         try:
-            df = pd.read_excel(file_path)
-            
-            # Find today's data or latest data
-            result = {
-                "amount_processed": 0.0,
-                "transaction_count": 0,
-                "date": datetime.now().date()
-            }
-            
-            # Look for date column
-            date_col = None
+            with ExcelWorkbook(file_path) as workbook:
+                df, cols = ExcelParser._read_payments_sheet(workbook, mappings)
+            return ExcelParser.latest_payment(df, cols)
+        except Exception as e:
+            raise ValueError(f"Error parsing payments file: {str(e)}")
+    
+    @staticmethod
+    def _read_payments_sheet(workbook: ExcelWorkbook, mappings=None) -> Tuple[pd.DataFrame, Dict[str, Optional[str]]]:
+        header = workbook.header()
+        cols, cached = _mapped_columns(mappings, "payments", header, _resolve_payments_columns)
+        if cols["amount"] and cols["transactions"]:
+            # Known layout: only materialize the columns we need
+            df = workbook.read(0, columns=[c for c in cols.values() if c is not None])
+        else:
+            # Fallback picks numeric columns by position, so read the whole sheet
+            df = workbook.read(0)
+            cols = ExcelParser.infer_payment_columns(df, cols)
+        if mappings is not None and not cached:
+            mappings.store("payments", header, cols)
+        return df, cols
+    
+    @staticmethod
+    def infer_payment_columns(df: pd.DataFrame, cols: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+        """Fill unresolved amount / transaction-count columns with the first / second numeric column."""
+        numeric_cols = _numeric_columns(df, exclude=cols["date"])
+        return {
+            "date": cols["date"],
+            "amount": cols["amount"] or (numeric_cols[0] if numeric_cols else None),
+            "transactions": cols["transactions"] or (numeric_cols[1] if len(numeric_cols) > 1 else None),
+        }
+    
+    @staticmethod
+    def latest_payment(df: pd.DataFrame, cols: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """Pick the row with the latest date (or the last row) from a payments sheet."""
+        date_col, amount_col, trans_col = cols["date"], cols["amount"], cols["transactions"]
+        
+        # Find today's data or latest data
+        result = {
+            "amount_processed": 0.0,
+            "transaction_count": 0,
+            "date": datetime.now().date()
+        }
+        
+        if date_col:
+            # Get latest row
+            df[date_col] = pd.to_datetime(df[date_col])
+            latest_row = df.loc[df[date_col].idxmax()]
+            result["date"] = latest_row[date_col].date()
+        else:
+            # Use last row
+            latest_row = df.iloc[-1]
+        
+        if amount_col:
+            result["amount_processed"] = float(latest_row[amount_col])
+        elif len(df.columns) > 0:
+            # Try first numeric column
             for col in df.columns:
-                if 'date' in col.lower() or 'Date' in col:
-                    date_col = col
+                if pd.api.types.is_numeric_dtype(df[col]):
+                    result["amount_processed"] = float(latest_row[col])
                     break
-            
-            # Look for amount and transaction columns
-            amount_col = None
-            trans_col = None
-            for col in df.columns:
-                col_lower = col.lower()
-                if 'amount' in col_lower or 'processed' in col_lower:
-                    amount_col = col
-                if 'transaction' in col_lower or 'count' in col_lower:
-                    trans_col = col
-            
-            if date_col:
-                # Get latest row
-                df[date_col] = pd.to_datetime(df[date_col])
-                latest_row = df.loc[df[date_col].idxmax()]
-                result["date"] = latest_row[date_col].date()
-            else:
-                # Use last row
-                latest_row = df.iloc[-1]
-            
-            if amount_col:
-                result["amount_processed"] = float(latest_row[amount_col])
-            elif len(df.columns) > 0:
-                # Try first numeric column
-                for col in df.columns:
-                    if pd.api.types.is_numeric_dtype(df[col]):
-                        result["amount_processed"] = float(latest_row[col])
-                        break
-            
-            if trans_col:
-                result["transaction_count"] = int(latest_row[trans_col])
-            elif len(df.columns) > 1:
-                # Try second numeric column
-                numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
-                if len(numeric_cols) > 1:
-                    result["transaction_count"] = int(latest_row[numeric_cols[1]])
-            
-            return result
+        
+        if trans_col:
+            result["transaction_count"] = int(latest_row[trans_col])
+        elif len(df.columns) > 1:
+            # Try second numeric column
+            numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+            if len(numeric_cols) > 1:
+                result["transaction_count"] = int(latest_row[numeric_cols[1]])
+        
+        return result
+    
+    @staticmethod
+    def parse_payments_history(file_path: str, mappings=None) -> Dict[str, Any]:
+        """
+        Parse every dated row of a payments Excel file (history/backfill mode).
+        Returns {"rows": [one aggregated record per date], "skipped": n}.
+        """
+        try:
+            with ExcelWorkbook(file_path) as workbook:
+                df, cols = ExcelParser._read_payments_sheet(workbook, mappings)
+            return ExcelParser.normalize_payments_history(df, cols)
         except Exception as e:
             raise ValueError(f"Error parsing payments file: {str(e)}")
     
     @staticmethod
-    def parse_system_performance_file(file_path: str) -> Dict[str, Any]:
+    def normalize_payments_history(df: pd.DataFrame, cols: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """
+        Aggregate a payments sheet to one row per date: amounts and transaction
+        counts of rows sharing a date are summed. Rows without a parseable date
+        or amount are counted as skipped.
+        """
+        date_col, amount_col, trans_col = cols["date"], cols["amount"], cols["transactions"]
+        if not date_col:
+            raise ValueError("History mode needs a Date column")
+        
+        # Same positional fallback as parse_payments_file: first/second numeric column
+        cols = ExcelParser.infer_payment_columns(df, cols)
+        amount_col, trans_col = cols["amount"], cols["transactions"]
+        if not amount_col:
+            raise ValueError("Could not find an amount column")
+        
+        dates = pd.to_datetime(df[date_col], errors="coerce", format="mixed")
+        amounts = pd.to_numeric(df[amount_col], errors="coerce")
+        counts = pd.to_numeric(df[trans_col], errors="coerce").fillna(0) if trans_col else pd.Series(0, index=df.index)
+        valid = dates.notna() & amounts.notna()
+        
+        daily = pd.DataFrame({
+            "date": dates[valid].dt.date,
+            "amount_processed": amounts[valid].astype(float),
+            "transaction_count": counts[valid].astype("int64"),
+        }).groupby("date", sort=True, as_index=False).sum()
+        
+        return {
+            "rows": _records({
+                "date": daily["date"],
+                "amount_processed": daily["amount_processed"],
+                "transaction_count": daily["transaction_count"],
+            }),
+            "skipped": int((~valid).sum()),
+        }
+    
+    @staticmethod
+    def parse_system_performance_file(file_path: str, mappings=None) -> Dict[str, Any]:
         """
         Parse system performance Excel file
         Expected columns: Uptime Percentage, Success Rate
         """
         try:
-            df = pd.read_excel(file_path)
-            
-            result = {
-                "uptime_percentage": 0.0,
-                "success_rate": 0.0
-            }
-            
-            # Look for uptime and success rate columns
-            uptime_col = None
-            success_col = None
-            
-            for col in df.columns:
-                col_lower = col.lower()
-                if 'uptime' in col_lower:
-                    uptime_col = col
-                if 'success' in col_lower or 'rate' in col_lower:
-                    success_col = col
-            
-            # Get latest row
-            latest_row = df.iloc[-1]
-            
-            if uptime_col:
-                result["uptime_percentage"] = float(latest_row[uptime_col])
-            elif len(df.columns) > 0:
-                # First numeric column
-                for col in df.columns:
-                    if pd.api.types.is_numeric_dtype(df[col]):
-                        result["uptime_percentage"] = float(latest_row[col])
-                        break
-            
-            if success_col:
-                result["success_rate"] = float(latest_row[success_col])
-            elif len(df.columns) > 1:
-                # Second numeric column
-                numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
-                if len(numeric_cols) > 1:
-                    result["success_rate"] = float(latest_row[numeric_cols[1]])
-            
-            return result
+            with ExcelWorkbook(file_path) as workbook:
+                header = workbook.header()
+                cols, cached = _mapped_columns(mappings, "system_performance", header, _resolve_system_performance_columns)
+                if cols["uptime"] and cols["success"]:
+                    df = workbook.read(0, columns=[cols["uptime"], cols["success"]])
+                else:
+                    # Fallback picks numeric columns by position, so read the whole sheet
+                    df = workbook.read(0)
+                    cols = ExcelParser.infer_system_performance_columns(df, cols)
+                if mappings is not None and not cached:
+                    mappings.store("system_performance", header, cols)
+            return ExcelParser.latest_system_performance(df, cols)
         except Exception as e:
             raise ValueError(f"Error parsing system performance file: {str(e)}")
     
     @staticmethod
-    def parse_employee_file(file_path: str) -> List[Dict[str, Any]]:
+    def infer_system_performance_columns(df: pd.DataFrame, cols: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+        """Fill unresolved uptime / success-rate columns with the first / second numeric column."""
+        numeric_cols = _numeric_columns(df)
+        return {
+            "uptime": cols["uptime"] or (numeric_cols[0] if numeric_cols else None),
+            "success": cols["success"] or (numeric_cols[1] if len(numeric_cols) > 1 else None),
+        }
+    
+    @staticmethod
+    def latest_system_performance(df: pd.DataFrame, cols: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """Read uptime / success rate from the last row of a system performance sheet."""
+        uptime_col, success_col = cols["uptime"], cols["success"]
+        
+        result = {
+            "uptime_percentage": 0.0,
+            "success_rate": 0.0
+        }
+        
+        # Get latest row
+        latest_row = df.iloc[-1]
+        
+        if uptime_col:
+            result["uptime_percentage"] = float(latest_row[uptime_col])
+        elif len(df.columns) > 0:
+            # First numeric column
+            for col in df.columns:
+                if pd.api.types.is_numeric_dtype(df[col]):
+                    result["uptime_percentage"] = float(latest_row[col])
+                    break
+        
+        if success_col:
+            result["success_rate"] = float(latest_row[success_col])
+        elif len(df.columns) > 1:
+            # Second numeric column
+            numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+            if len(numeric_cols) > 1:
+                result["success_rate"] = float(latest_row[numeric_cols[1]])
+        
+        return result
+    
+    @staticmethod
+    def parse_employee_file(file_path: str, mappings=None) -> Dict[str, Any]:
         """
         Parse employee data Excel file
         Expected columns: Name, Description, Department, Milestone Type, Date
+        Returns {"rows": [milestone records], "skipped": rows without a date}.
         """
         try:
-            df = pd.read_excel(file_path)
-            employees = []
-            
-            # Default colors by milestone type
-            color_map = {
-                "anniversary": {"border": "#981239", "background": "#fef5f8"},
-                "birthday": {"border": "#BE1549", "background": "#fff5f9"},
-                "promotion": {"border": "#981239", "background": "#fef5f8"},
-                "new_hire": {"border": "#0085C2", "background": "#f0f9fd"},
-            }
-            
-            for _, row in df.iterrows():
-                name = str(row.get('Name', row.get('name', '')))
-                description = str(row.get('Description', row.get('description', '')))
-                milestone_type = str(row.get('Milestone Type', row.get('milestone_type', 'anniversary'))).lower()
-                department = str(row.get('Department', row.get('department', '')))
-                
-                # Parse date
-                date_col = None
-                for col in df.columns:
-                    if 'date' in col.lower():
-                        date_col = col
-                        break
-                
-                milestone_date = datetime.now()
-                if date_col:
-                    milestone_date = pd.to_datetime(row[date_col])
-                
-                colors = color_map.get(milestone_type, {"border": "#981239", "background": "#fef5f8"})
-                
-                employees.append({
-                    "name": name,
-                    "description": description,
-                    "milestone_type": milestone_type,
-                    "department": department if department else None,
-                    "milestone_date": milestone_date,
-                    "border_color": colors["border"],
-                    "background_color": colors["background"]
-                })
-            
-            return employees
+            with ExcelWorkbook(file_path) as workbook:
+                header = workbook.header()
+                cols, cached = _mapped_columns(mappings, "employees", header, _resolve_employee_columns)
+                if mappings is not None and not cached:
+                    mappings.store("employees", header, cols)
+                date_col = cols["date"]
+                keep = EMPLOYEE_COLUMNS | ({date_col} if date_col is not None else set())
+                df = workbook.read(0, columns=keep)
+            return ExcelParser.normalize_employees(df, date_col)
         except Exception as e:
             raise ValueError(f"Error parsing employee file: {str(e)}")
-
+    
+    @staticmethod
+    def normalize_employees(df: pd.DataFrame, date_col: Optional[str]) -> Dict[str, Any]:
+        """
+        Turn an employee sheet into milestone records. Columns are resolved once
+        per sheet and normalized as whole Series rather than row by row. The
+        date is part of a milestone's natural key, so rows without a parseable
+        date are counted as skipped rather than dated at parse time (which
+        would give every re-upload new keys).
+        """
+        if not date_col:
+            raise ValueError("Employee sheets need a Date column")
+        milestone_date = _to_datetime(df[date_col])
+        valid = milestone_date.notna()
+        skipped = int((~valid).sum())
+        df, milestone_date = df[valid], milestone_date[valid]
+        
+        milestone_type = _text(_column(df, ('Milestone Type', 'milestone_type'), 'anniversary'), 'anniversary').str.lower()
+        department = _text(_column(df, ('Department', 'department'), ''))
+        
+        rows = _records({
+            "name": _text(_column(df, ('Name', 'name'), '')),
+            "description": _text(_column(df, ('Description', 'description'), '')),
+            "milestone_type": milestone_type,
+            "department": department.astype(object).where(department != "", None),
+            "milestone_date": milestone_date,
+            "border_color": milestone_type.map(MILESTONE_BORDER_COLORS).fillna(DEFAULT_MILESTONE_COLORS["border"]),
+            "background_color": milestone_type.map(MILESTONE_BACKGROUND_COLORS).fillna(DEFAULT_MILESTONE_COLORS["background"]),
+        })
+        return {"rows": rows, "skipped": skipped}
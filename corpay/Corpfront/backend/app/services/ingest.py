@@ -0,0 +1,660 @@
+"""
+Background ingest of uploaded dashboard files (revenue, payments, system
+performance, employee data).
+
+Upload handlers store the file, record a ``FileUpload`` plus an ``IngestJob``
+and return straight away; the parse and DB writes run in a bounded process
+pool so a large workbook never blocks the event loop serving the kiosks. Job
+state lives in the database, so queued or interrupted jobs are picked up
+again by ``resume_pending_jobs`` after a restart. A running job's worker
+refreshes its ``heartbeat_at`` every ``ingest_heartbeat_seconds``; only jobs
+whose heartbeat has gone stale are taken over.
+
+Handlers pass a small spreadsheet's bytes along with the job, so the worker
+parses from memory while the original is still being written to disk. Larger
+uploads, CSV / Parquet exports and resumed jobs are read from the stored copy,
+so only the path crosses to the worker.
+
+Each ``ingest_*`` function parses and writes inside the caller's transaction
+and never commits; ``run_job`` commits the data together with the job's final
+status, so a job is either fully applied or not at all.
+"""
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Union
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.employees import EmployeeMilestone
+from app.models.file_upload import FileUpload, FileType
+from app.models.ingest_job import IngestJob, JobStatus
+from app.models.payments import PaymentData
+from app.models.revenue import Revenue, RevenueTrend, RevenueProportion
+from app.models.system_performance import SystemPerformance
+from app.services.column_mappings import ColumnMappings
+from app.services.excel_parser import ExcelParser
+from app.services import tabular_stream
+from app.utils.bulk import bulk_upsert, iter_batches
+
+logger = logging.getLogger(__name__)
+
+Progress = Callable[..., None]
+# A stored file path, or an in-memory upload whose ``name`` carries the extension
+Source = Union[str, BinaryIO]
+
+# Columns of the uq_employee_milestones_natural_key unique index
+EMPLOYEE_NATURAL_KEY = ["name", "milestone_type", "milestone_date"]
+EMPLOYEE_BATCH_SIZE = 1000
+# Sheet-derived columns besides the natural key (avatar_path is set by photo uploads)
+EMPLOYEE_SHEET_COLUMNS = ["description", "department", "border_color", "background_color"]
+PAYMENT_HISTORY_BATCH_SIZE = 1000
+# A job interrupted this many times (e.g. it keeps crashing its worker) is failed instead of retried
+MAX_ATTEMPTS = 3
+
+
+def _no_progress(stage: str, **counts) -> None:
+    pass
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Per-type ingest: parse the upload and write it (no commit). ``parse_upload``
+# and the ``write_*`` functions are the two halves on their own, used by
+# batch uploads to parse files in parallel and write each type together.
+# ---------------------------------------------------------------------------
+
+def parse_upload(file_type: str, source: Source, options: Dict[str, Any], mappings: Optional[ColumnMappings] = None) -> Any:
+    """
+    Parse step of the ingest for ``file_type`` (a FileType value). The result
+    is fully materialized, so it can be returned from a pool worker, and is
+    what the matching ``WRITERS`` entry takes.
+    """
+    if file_type == FileType.REVENUE.value:
+        return ExcelParser.parse_revenue_file(source)
+    if file_type == FileType.PAYMENTS.value:
+        streamed = tabular_stream.is_streamable(source)
+        if options.get("mode") == "history":
+            if streamed:
+                return list(tabular_stream.stream_payments_history(source, mappings))
+            return [ExcelParser.parse_payments_history(source, mappings)]
+        if streamed:
+            return tabular_stream.stream_latest_payment(source, mappings)
+        return ExcelParser.parse_payments_file(source, mappings)
+    if file_type == FileType.SYSTEM_PERFORMANCE.value:
+        if tabular_stream.is_streamable(source):
+            return tabular_stream.stream_latest_system_performance(source, mappings)
+        return ExcelParser.parse_system_performance_file(source, mappings)
+    if file_type == FileType.EMPLOYEE_DATA.value:
+        return ExcelParser.parse_employee_file(source, mappings)
+    raise ValueError(f"No ingest for file type {file_type}")
+
+
+def ingest_revenue(db: Session, source: Source, options: Dict[str, Any], progress: Progress = _no_progress) -> Dict[str, Any]:
+    progress("parsing")
+    data = parse_upload(FileType.REVENUE.value, source, options)
+    progress("writing", rows_parsed=len(data.get("revenue_trends") or []) + len(data.get("revenue_proportions") or []))
+    return write_revenue(db, data, options)
+
+
+def write_revenue(db: Session, data: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    trends = data.get("revenue_trends") or []
+    proportions = data.get("revenue_proportions") or []
+
+    # Update revenue
+    if data.get("total_revenue"):
+        # Ensure we never write NULL into a non-nullable percentage_change column
+        pct_change = data.get("percentage_change")
+        if pct_change is None:
+            pct_change = 0.0
+
+        revenue = db.query(Revenue).order_by(Revenue.last_updated.desc()).first()
+        if revenue:
+            revenue.total_amount = data["total_revenue"]
+            revenue.percentage_change = pct_change
+        else:
+            revenue = Revenue(
+                total_amount=data["total_revenue"],
+                percentage_change=pct_change
+            )
+            db.add(revenue)
+
+    # Update revenue trends
+    if trends:
+        current_year = datetime.now().year
+        # Clear existing trends for current year
+        db.query(RevenueTrend).filter(RevenueTrend.year == current_year).delete()
+
+        for trend in trends:
+            db.add(RevenueTrend(
+                month=trend["month"],
+                value=trend["value"],
+                highlight=trend.get("highlight", False),
+                year=current_year
+            ))
+
+    # Update revenue proportions
+    for prop in proportions:
+        proportion = db.query(RevenueProportion).filter(
+            RevenueProportion.category == prop["category"]
+        ).first()
+
+        if proportion:
+            proportion.percentage = prop["percentage"]
+            proportion.color = prop.get("color", "#981239")
+        else:
+            db.add(RevenueProportion(
+                category=prop["category"],
+                percentage=prop["percentage"],
+                color=prop.get("color", "#981239")
+            ))
+
+    return {"message": "File processed successfully", "rows_written": len(trends) + len(proportions)}
+
+
+def upsert_payment_history(db: Session, chunks: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Bulk upsert per-date payment totals into payment_data (unique on ``date``).
+
+    ``chunks`` are {"rows", "skipped"} results from the history parsers. A date
+    can span chunks of a streamed export, so running totals are kept per date
+    (one entry per day, not per row) and each chunk upserts the current totals
+    of the dates it touched. Dates are checked against the table the first time
+    they are seen, only to report updated vs. inserted. Does not commit.
+    """
+    totals: Dict[date, Dict[str, Any]] = {}
+    counts = {"inserted": 0, "updated": 0, "skipped": 0}
+    for chunk in chunks:
+        counts["skipped"] += chunk["skipped"]
+        new_dates = [row["date"] for row in chunk["rows"] if row["date"] not in totals]
+        for batch in iter_batches(new_dates, PAYMENT_HISTORY_BATCH_SIZE):
+            existing = db.query(PaymentData.date).filter(PaymentData.date.in_(batch)).count()
+            counts["updated"] += existing
+            counts["inserted"] += len(batch) - existing
+
+        for row in chunk["rows"]:
+            total = totals.setdefault(row["date"], {"date": row["date"], "amount_processed": 0.0, "transaction_count": 0})
+            total["amount_processed"] += row["amount_processed"]
+            total["transaction_count"] += row["transaction_count"]
+
+        bulk_upsert(
+            db,
+            PaymentData,
+            [totals[row["date"]] for row in chunk["rows"]],
+            conflict_columns=["date"],
+            update_columns=["amount_processed", "transaction_count"],
+            batch_size=PAYMENT_HISTORY_BATCH_SIZE,
+        )
+    counts["days"] = len(totals)
+    return counts
+
+
+def ingest_payments(db: Session, source: Source, options: Dict[str, Any], progress: Progress = _no_progress) -> Dict[str, Any]:
+    mappings = ColumnMappings(db)
+
+    if options.get("mode") == "history" and tabular_stream.is_streamable(source):
+        # Parse and write interleave chunk by chunk
+        progress("writing")
+        result = write_payments(db, tabular_stream.stream_payments_history(source, mappings), options)
+        mappings.save()
+        return result
+
+    progress("parsing")
+    data = parse_upload(FileType.PAYMENTS.value, source, options, mappings)
+    if options.get("mode") == "history":
+        progress("writing", rows_parsed=sum(len(chunk["rows"]) + chunk["skipped"] for chunk in data))
+    else:
+        progress("writing", rows_parsed=1)
+    mappings.save()
+    return write_payments(db, data, options)
+
+
+def write_payments(db: Session, data: Any, options: Dict[str, Any]) -> Dict[str, Any]:
+    if options.get("mode") == "history":
+        counts = upsert_payment_history(db, data)
+        days = counts.pop("days")
+        return {
+            "message": f"Processed {days} days of payment data",
+            "rows_written": days,
+            **counts,
+        }
+
+    # Check if payment data for this date already exists
+    existing = db.query(PaymentData).filter(PaymentData.date == data["date"]).first()
+
+    if existing:
+        existing.amount_processed = data["amount_processed"]
+        existing.transaction_count = data["transaction_count"]
+    else:
+        db.add(PaymentData(**data))
+
+    return {"message": "File processed successfully", "rows_written": 1}
+
+
+def ingest_system_performance(db: Session, source: Source, options: Dict[str, Any], progress: Progress = _no_progress) -> Dict[str, Any]:
+    mappings = ColumnMappings(db)
+    progress("parsing")
+    data = parse_upload(FileType.SYSTEM_PERFORMANCE.value, source, options, mappings)
+    progress("writing", rows_parsed=1)
+    mappings.save()
+    return write_system_performance(db, data, options)
+
+
+def write_system_performance(db: Session, data: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    db.add(SystemPerformance(**data))
+    return {"message": "File processed successfully", "rows_written": 1}
+
+
+def _digest(values: List[Any]) -> str:
+    return hashlib.sha256(json.dumps(values, default=str).encode("utf-8")).hexdigest()
+
+
+def employee_sheet_rows(employees: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Parsed employee records keyed by ``row_key`` (hash of the natural key),
+    deduped within the sheet (last row wins). Each row carries its
+    ``row_key`` and ``row_fingerprint`` (hash of every sheet-derived field).
+    """
+    rows = {}
+    for emp_data in employees:
+        row = dict(emp_data, is_active=1)
+        if hasattr(row["milestone_date"], "to_pydatetime"):
+            row["milestone_date"] = row["milestone_date"].to_pydatetime()
+        key = [row[col] for col in EMPLOYEE_NATURAL_KEY]
+        row["row_key"] = _digest(key)
+        row["row_fingerprint"] = _digest(key + [row[col] for col in EMPLOYEE_SHEET_COLUMNS])
+        rows[row["row_key"]] = row
+    return rows
+
+
+def _upsert_employees(db: Session, rows: Iterable[Dict[str, Any]]) -> int:
+    return bulk_upsert(
+        db,
+        EmployeeMilestone,
+        rows,
+        conflict_columns=EMPLOYEE_NATURAL_KEY,
+        update_columns=EMPLOYEE_SHEET_COLUMNS + ["is_active", "row_key", "row_fingerprint"],
+        batch_size=EMPLOYEE_BATCH_SIZE,
+    )
+
+
+def apply_employee_delta(db: Session, rows: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Make the active sheet-sourced milestones match ``rows`` (from
+    ``employee_sheet_rows``), writing only what changed. Existing rows are read
+    in one query of their hashes; new keys are upserted (reviving a
+    deactivated row or adopting one uploaded before fingerprints existed),
+    changed rows are updated by id, and rows missing from the sheet are
+    soft-deleted (is_active=0). Milestones created by hand have no ``row_key``
+    and are left alone. Does not commit.
+    """
+    existing = {
+        row_key: (milestone_id, fingerprint)
+        for milestone_id, row_key, fingerprint in db.query(
+            EmployeeMilestone.id, EmployeeMilestone.row_key, EmployeeMilestone.row_fingerprint
+        ).filter(EmployeeMilestone.is_active == 1, EmployeeMilestone.row_key.isnot(None))
+    }
+
+    added = [row for key, row in rows.items() if key not in existing]
+    changed = [
+        dict(row, id=existing[key][0])
+        for key, row in rows.items()
+        if key in existing and existing[key][1] != row["row_fingerprint"]
+    ]
+    removed = [milestone_id for key, (milestone_id, _) in existing.items() if key not in rows]
+
+    _upsert_employees(db, added)
+    for batch in iter_batches(changed, EMPLOYEE_BATCH_SIZE):
+        db.execute(update(EmployeeMilestone), batch)
+    for batch in iter_batches(removed, EMPLOYEE_BATCH_SIZE):
+        db.query(EmployeeMilestone).filter(EmployeeMilestone.id.in_(batch)).update(
+            {"is_active": 0}, synchronize_session=False
+        )
+
+    return {
+        "inserted": len(added),
+        "updated": len(changed),
+        "deactivated": len(removed),
+        "unchanged": len(rows) - len(added) - len(changed),
+    }
+
+
+def ingest_employees(db: Session, source: Source, options: Dict[str, Any], progress: Progress = _no_progress) -> Dict[str, Any]:
+    mappings = ColumnMappings(db)
+    progress("parsing")
+    employees = parse_upload(FileType.EMPLOYEE_DATA.value, source, options, mappings)
+    progress("writing", rows_parsed=len(employees["rows"]) + employees["skipped"])
+    mappings.save()
+    return write_employees(db, employees, options)
+
+
+def write_employees(db: Session, employees: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    """``employees`` is a {"rows", "skipped"} result of ``ExcelParser.parse_employee_file``."""
+    rows = employee_sheet_rows(employees["rows"])
+    duplicates = len(employees["rows"]) - len(rows)
+
+    if options.get("mode") == "delta":
+        # The sheet is the full list: apply only the differences
+        changes = apply_employee_delta(db, rows)
+        return {
+            "message": (
+                f"Employee milestones: {changes['inserted']} added, {changes['updated']} updated, "
+                f"{changes['deactivated']} deactivated, {changes['unchanged']} unchanged"
+            ),
+            "rows_written": changes["inserted"] + changes["updated"] + changes["deactivated"],
+            **changes,
+            "duplicates_in_file": duplicates,
+            "skipped": employees["skipped"],
+        }
+
+    # Rows that already exist from earlier uploads are updated in place by the upsert
+    written = _upsert_employees(db, rows.values())
+
+    return {
+        "message": f"Processed {written} employee milestones",
+        "rows_written": written,
+        "duplicates_in_file": duplicates,
+        "skipped": employees["skipped"],
+    }
+
+
+INGESTERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    FileType.REVENUE.value: ingest_revenue,
+    FileType.PAYMENTS.value: ingest_payments,
+    FileType.SYSTEM_PERFORMANCE.value: ingest_system_performance,
+    FileType.EMPLOYEE_DATA.value: ingest_employees,
+}
+
+WRITERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    FileType.REVENUE.value: write_revenue,
+    FileType.PAYMENTS.value: write_payments,
+    FileType.SYSTEM_PERFORMANCE.value: write_system_performance,
+    FileType.EMPLOYEE_DATA.value: write_employees,
+}
+
+
+# ---------------------------------------------------------------------------
+# Job lifecycle
+# ---------------------------------------------------------------------------
+
+def find_identical_job(db: Session, file_upload: FileUpload, options: Dict[str, Any]) -> Optional[IngestJob]:
+    """
+    The last successful job of this file type, if it ingested identical content
+    with the same options. Only the latest one counts: once a different file
+    has been applied, re-uploading an older one must run again.
+    """
+    if not file_upload.content_hash:
+        return None
+    previous = db.query(IngestJob).filter(
+        IngestJob.file_type == FileType(file_upload.file_type).value,
+        IngestJob.status == JobStatus.SUCCEEDED,
+    ).order_by(IngestJob.file_upload_id.desc()).first()
+    if previous is None or json.loads(previous.options or "{}") != options:
+        return None
+    previous_upload = db.query(FileUpload).filter(FileUpload.id == previous.file_upload_id).first()
+    if previous_upload is None or previous_upload.content_hash != file_upload.content_hash:
+        return None
+    return previous
+
+
+def create_job(
+    db: Session,
+    file_upload: FileUpload,
+    options: Optional[Dict[str, Any]] = None,
+    force: bool = False,
+) -> IngestJob:
+    """
+    Record a job for ``file_upload`` (flushes, does not commit). If the same
+    content was the last thing ingested for this type (and not ``force``), the
+    job is created already succeeded, pointing at the earlier result, and there
+    is nothing to submit.
+    """
+    options = options or {}
+    if file_upload.id is None:
+        db.flush()
+    job = IngestJob(
+        id=str(uuid.uuid4()),
+        file_upload_id=file_upload.id,
+        file_type=FileType(file_upload.file_type).value,
+        options=json.dumps(options),
+        status=JobStatus.QUEUED,
+        attempts=0,
+    )
+
+    previous = None if force else find_identical_job(db, file_upload, options)
+    if previous is not None:
+        file_upload.processed = 1
+        job.status = JobStatus.SUCCEEDED
+        job.stage = "done"
+        job.rows_written = 0
+        job.result = json.dumps({
+            "message": "File is identical to the last processed upload; nothing to update",
+            "rows_written": 0,
+            "duplicate_of_job": previous.id,
+            "previous_result": json.loads(previous.result or "{}"),
+        })
+        job.finished_at = _now()
+
+    db.add(job)
+    db.flush()
+    return job
+
+
+def _set_progress(job_id: str, stage: str, **counts) -> None:
+    """Record progress from a short separate transaction (only called before the ingest writes)."""
+    db = SessionLocal()
+    try:
+        db.query(IngestJob).filter(IngestJob.id == job_id).update({"stage": stage, "heartbeat_at": _now(), **counts})
+        db.commit()
+    finally:
+        db.close()
+
+
+def _heartbeat(job_id: str, stop: threading.Event) -> None:
+    """Refresh the job's ``heartbeat_at`` until ``stop`` is set, so it is not taken for abandoned."""
+    while not stop.wait(settings.ingest_heartbeat_seconds):
+        db = SessionLocal()
+        try:
+            db.query(IngestJob).filter(
+                IngestJob.id == job_id, IngestJob.status == JobStatus.RUNNING
+            ).update({"heartbeat_at": _now()}, synchronize_session=False)
+            db.commit()
+        except Exception as e:  # Keep beating: one failed refresh is not fatal
+            logger.warning("Could not refresh the heartbeat of ingest job %s: %s", job_id, e)
+        finally:
+            db.close()
+
+
+def _job_source(file_upload: FileUpload, content: Optional[bytes]) -> Source:
+    if content is None:
+        return str(Path(settings.upload_dir) / file_upload.stored_path)
+    buffer = io.BytesIO(content)
+    buffer.name = file_upload.stored_path
+    return buffer
+
+
+def run_job(job_id: str, content: Optional[bytes] = None) -> str:
+    """
+    Execute one ingest job; runs inside a pool worker process. Returns the
+    final status. Safe to call for a job another worker already claimed.
+    ``content`` is the upload itself when the caller still has it in memory;
+    otherwise the stored copy is read.
+    """
+    db = SessionLocal()
+    try:
+        # Atomically claim the job so a resumed copy is not processed twice
+        claimed = db.query(IngestJob).filter(
+            IngestJob.id == job_id, IngestJob.status == JobStatus.QUEUED
+        ).update({
+            "status": JobStatus.RUNNING,
+            "stage": "starting",
+            "started_at": _now(),
+            "heartbeat_at": _now(),
+            "attempts": IngestJob.attempts + 1,
+        }, synchronize_session=False)
+        db.commit()
+        job = db.query(IngestJob).filter(IngestJob.id == job_id).first()
+        if not claimed or job is None:
+            return job.status if job else JobStatus.FAILED
+
+        file_upload = db.query(FileUpload).filter(FileUpload.id == job.file_upload_id).first()
+        stop_heartbeat = threading.Event()
+        threading.Thread(target=_heartbeat, args=(job_id, stop_heartbeat), daemon=True).start()
+        try:
+            ingest = INGESTERS[job.file_type]
+            result = ingest(
+                db,
+                _job_source(file_upload, content),
+                json.loads(job.options or "{}"),
+                lambda stage, **counts: _set_progress(job_id, stage, **counts),
+            )
+            file_upload.processed = 1
+            job.status = JobStatus.SUCCEEDED
+            job.stage = "done"
+            job.rows_written = result.get("rows_written")
+            job.result = json.dumps(result, default=str)
+            job.finished_at = _now()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning("Ingest job %s failed: %s", job_id, e)
+            job.status = JobStatus.FAILED
+            job.error_message = str(e)
+            job.finished_at = _now()
+            if file_upload is not None:
+                file_upload.error_message = str(e)[:500]
+            db.commit()
+        finally:
+            stop_heartbeat.set()
+        return job.status
+    finally:
+        db.close()
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_tasks: set = set()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that runs an event loop and DB pools is not safe
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.ingest_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def _mark_failed(job_id: str, message: str) -> None:
+    db = SessionLocal()
+    try:
+        db.query(IngestJob).filter(
+            IngestJob.id == job_id, IngestJob.status.in_(JobStatus.PENDING)
+        ).update({"status": JobStatus.FAILED, "error_message": message, "finished_at": _now()},
+                 synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run_in_pool(fn: Callable[..., Any], *args) -> Any:
+    """
+    Run ``fn(*args)`` on the ingest process pool (``fn`` and its arguments must
+    be picklable). Raises ``BrokenProcessPool`` if the worker dies; the pool is
+    then replaced for later calls.
+    """
+    global _executor
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory); start a fresh pool for later jobs
+        _executor = None
+        raise
+
+
+async def _run_in_pool(job_id: str, content: Optional[bytes] = None) -> str:
+    try:
+        return await run_in_pool(run_job, job_id, content)
+    except BrokenProcessPool:
+        logger.error("Ingest worker crashed while running job %s", job_id)
+        await asyncio.to_thread(_mark_failed, job_id, "Ingest worker process crashed")
+        return JobStatus.FAILED
+
+
+def submit_job(job_id: str, content: Optional[bytes] = None) -> "asyncio.Task[str]":
+    """
+    Schedule a job on the process pool; await the returned task to wait for it.
+    Pass the upload's ``content`` to parse it from memory instead of from disk.
+    """
+    task = asyncio.create_task(_run_in_pool(job_id, content))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+def resume_pending_jobs() -> int:
+    """
+    Re-queue jobs left behind by a previous process: queued jobs, and running
+    jobs whose heartbeat is older than ``ingest_job_stale_seconds`` (a live
+    worker, in this or another app process, refreshes it far more often).
+    A stale job is taken over with a conditional UPDATE, so when several
+    processes start together only one of them re-queues it. Call from the
+    event loop.
+    """
+    stale_before = _now() - timedelta(seconds=settings.ingest_job_stale_seconds)
+    stale = or_(
+        IngestJob.heartbeat_at < stale_before,
+        # Rows from before heartbeats were recorded
+        (IngestJob.heartbeat_at.is_(None)) & or_(IngestJob.started_at.is_(None), IngestJob.started_at < stale_before),
+    )
+    db = SessionLocal()
+    try:
+        resumed = [job_id for (job_id,) in db.query(IngestJob.id).filter(IngestJob.status == JobStatus.QUEUED)]
+        stale_jobs = db.query(IngestJob.id, IngestJob.attempts).filter(IngestJob.status == JobStatus.RUNNING, stale).all()
+        for job_id, attempts in stale_jobs:
+            if (attempts or 0) >= MAX_ATTEMPTS:
+                values = {
+                    "status": JobStatus.FAILED,
+                    "error_message": f"Interrupted {attempts} times; giving up",
+                    "finished_at": _now(),
+                }
+            else:
+                values = {"status": JobStatus.QUEUED}
+            # Lease: only take the job over if its worker still has not beaten since we looked
+            taken = db.query(IngestJob).filter(
+                IngestJob.id == job_id, IngestJob.status == JobStatus.RUNNING, stale
+            ).update(values, synchronize_session=False)
+            if taken and values["status"] == JobStatus.QUEUED:
+                resumed.append(job_id)
+        db.commit()
+    finally:
+        db.close()
+
+    for job_id in resumed:
+        submit_job(job_id)
+    if resumed:
+        print(f"Resumed {len(resumed)} pending ingest job(s)")
+    return len(resumed)
+
+
+def shutdown() -> None:
+    """Stop the worker pool; unfinished jobs stay queued/running and resume on next start."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,355 @@
+"""
+Converting PowerPoint decks to PDF with LibreOffice.
+
+The soffice executable is looked up once (``LIBREOFFICE_PATH``, or the usual
+install locations) and cached. When the ``uno`` Python bridge is importable,
+``LIBREOFFICE_WORKERS`` headless LibreOffice processes are kept running, each
+with its own user profile and listening on its own UNO pipe. A conversion
+takes an idle worker, loads the deck over the pipe and stores it as PDF, so
+no process or profile start-up is paid per deck. A worker is checked before
+each job and restarted when it has died or stopped answering. A request has
+``LIBREOFFICE_TIMEOUT_SECONDS`` in all: a conversion gets what waiting for
+a free worker left of it, and one that runs past that has its worker killed,
+which fails the job; the worker is restarted for the next one.
+
+Without UNO (it ships with LibreOffice's bundled Python, or as the
+``python3-uno`` package) each conversion runs ``soffice --convert-to pdf``,
+still with the cached executable and a profile kept per worker slot, so only
+the first conversion in a slot pays for creating the profile.
+"""
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+from app.config import settings
+
+try:
+    import uno
+except ImportError:  # optional: falls back to one soffice process per conversion
+    uno = None
+
+logger = logging.getLogger(__name__)
+
+START_TIMEOUT = 60  # Seconds for a new worker to start listening
+STOP_TIMEOUT = 10
+
+
+class ConversionError(Exception):
+    """A deck could not be converted; ``timed_out`` when the job ran past its timeout."""
+
+    def __init__(self, message: str, timed_out: bool = False):
+        super().__init__(message)
+        self.timed_out = timed_out
+
+
+_executable: Optional[str] = None
+_discovery_lock = threading.Lock()
+
+
+def _candidates() -> List[str]:
+    if settings.libreoffice_path:
+        return [settings.libreoffice_path]
+    if sys.platform == "win32":
+        return [
+            r"C:\Program Files\LibreOffice\program\soffice.exe",
+            r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+            "soffice",
+            "libreoffice",
+        ]
+    if sys.platform == "darwin":
+        return [
+            "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+            "soffice",
+            "libreoffice",
+        ]
+    return [
+        "/usr/bin/soffice",
+        "/usr/bin/libreoffice",
+        "soffice",
+        "libreoffice",
+    ]
+
+
+def _discover() -> str:
+    for path in _candidates():
+        if os.sep not in path:
+            path = shutil.which(path)
+            if path is None:
+                continue
+        elif not os.path.exists(path):
+            continue
+        try:
+            result = subprocess.run(
+                [path, "--version"],
+                capture_output=True,
+                timeout=10,
+                text=True,
+                cwd=os.path.expanduser("~"),
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            continue
+        out = (result.stdout or "") + (result.stderr or "")
+        if result.returncode == 0 or "LibreOffice" in out:
+            return path
+    raise FileNotFoundError(
+        "LibreOffice not found. Install it: "
+        "Windows: https://www.libreoffice.org/download/download/ | "
+        "macOS: brew install --cask libreoffice | "
+        "Linux: sudo apt install libreoffice (or equivalent)."
+    )
+
+
+def find_libreoffice() -> str:
+    """The soffice executable, checked once and cached. Raises FileNotFoundError (and looks again next time)."""
+    global _executable
+    with _discovery_lock:
+        if _executable is None:
+            _executable = _discover()
+            print(f"[LibreOffice] Using {_executable}")
+        return _executable
+
+
+def _props(**values: Any) -> tuple:
+    props = []
+    for name, value in values.items():
+        prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+        prop.Name = name
+        prop.Value = value
+        props.append(prop)
+    return tuple(props)
+
+
+def _connect(pipe_name: str) -> Any:
+    """The Desktop of the LibreOffice listening on ``pipe_name``; raises until it listens."""
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+    context = resolver.resolve(f"uno:pipe,name={pipe_name};urp;StarOffice.ComponentContext")
+    return context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+
+
+class _Worker:
+    """
+    One conversion slot with its own LibreOffice user profile. With UNO it
+    keeps a headless LibreOffice running on its own pipe; otherwise each job
+    runs ``soffice --convert-to`` with the slot's profile.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.pipe_name = f"corpfront_libreoffice_{os.getpid()}_{index}"
+        self.profile = _profiles_dir() / f"worker-{index}"
+        self.process: Optional[subprocess.Popen] = None
+        self.desktop: Any = None
+
+    def _command(self, *args: str) -> List[str]:
+        return [
+            find_libreoffice(),
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--norestore",
+            "--nofirststartwizard",
+            f"-env:UserInstallation={self.profile.resolve().as_uri()}",
+            *args,
+        ]
+
+    def start(self) -> None:
+        """(Re)start the worker's LibreOffice and connect to it (blocking)."""
+        self.stop()
+        self.process = subprocess.Popen(
+            self._command("--nodefault", f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + START_TIMEOUT
+        while True:
+            if self.process.poll() is not None:
+                raise ConversionError(f"LibreOffice exited with code {self.process.returncode} on start-up")
+            try:
+                self.desktop = _connect(self.pipe_name)
+                logger.info("LibreOffice worker %d started (pid %d)", self.index, self.process.pid)
+                return
+            except Exception:  # NoConnectException until it listens
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise ConversionError("LibreOffice did not start listening in time", timed_out=True)
+                time.sleep(0.25)
+
+    def healthy(self) -> bool:
+        if self.process is None or self.process.poll() is not None or self.desktop is None:
+            return False
+        try:
+            self.desktop.getFrames()  # A round trip over the pipe
+            return True
+        except Exception:
+            return False
+
+    def kill(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+
+    def stop(self) -> None:
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass  # Already gone; the process is stopped below
+            self.desktop = None
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.terminate()
+                try:
+                    self.process.wait(STOP_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    self.process.kill()
+                    self.process.wait()
+            self.process = None
+
+    def convert(self, source: Path, target: Path, timeout: float) -> None:
+        """Store ``source`` as the PDF ``target`` (blocking). Raises ConversionError."""
+        if uno is None or settings.libreoffice_workers <= 0:
+            self._convert_once(source, target, timeout)
+            return
+        if not self.healthy():
+            if self.process is not None:
+                logger.warning("LibreOffice worker %d is not responding; restarting it", self.index)
+            self.start()
+
+        timed_out = threading.Event()
+
+        def expire() -> None:
+            timed_out.set()
+            self.kill()  # Unblocks the UNO call below
+
+        watchdog = threading.Timer(timeout, expire)
+        watchdog.start()
+        try:
+            doc = self.desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(str(source.resolve())), "_blank", 0, _props(Hidden=True, ReadOnly=True)
+            )
+            if doc is None:
+                raise ConversionError("LibreOffice could not open the presentation")
+            try:
+                doc.storeToURL(uno.systemPathToFileUrl(str(target.resolve())), _props(FilterName="impress_pdf_Export"))
+            finally:
+                doc.close(True)
+        except ConversionError:
+            raise
+        except Exception as e:
+            self.desktop = None  # Reconnect, or restart, before the next job
+            if timed_out.is_set():
+                raise ConversionError(f"Conversion took longer than {timeout:.0f} seconds", timed_out=True)
+            raise ConversionError(f"LibreOffice failed to convert the presentation: {e}")
+        finally:
+            watchdog.cancel()
+
+    def _convert_once(self, source: Path, target: Path, timeout: float) -> None:
+        try:
+            result = subprocess.run(
+                self._command("--convert-to", "pdf", "--outdir", str(target.parent.resolve()), str(source.resolve())),
+                capture_output=True,
+                timeout=timeout,
+                text=True,
+            )
+        except subprocess.TimeoutExpired:
+            raise ConversionError(f"Conversion took longer than {timeout:.0f} seconds", timed_out=True)
+        if result.returncode != 0 or not target.exists():
+            output = (result.stderr or result.stdout or "").strip()
+            raise ConversionError(f"LibreOffice exited with code {result.returncode}: {output[-500:]}")
+
+
+_workers: List[_Worker] = []
+_idle: "queue.Queue[_Worker]" = queue.Queue()
+_pool_lock = threading.Lock()
+
+
+def _profiles_dir() -> Path:
+    # Per process: two app processes on one host must not share a profile
+    return Path(tempfile.gettempdir()) / f"corpfront-libreoffice-{os.getpid()}"
+
+
+def _ensure_pool() -> None:
+    with _pool_lock:
+        if not _workers:
+            for index in range(max(1, settings.libreoffice_workers)):
+                worker = _Worker(index)
+                _workers.append(worker)
+                _idle.put(worker)
+
+
+def start() -> None:
+    """
+    Resolve the executable and start the workers, so the first deck does not
+    wait for them (blocking; run in a thread at startup). Problems are logged:
+    conversions retry them.
+    """
+    try:
+        find_libreoffice()
+    except FileNotFoundError as e:
+        print(f"[LibreOffice] Not available, PowerPoint decks cannot be rendered: {e}")
+        return
+    _ensure_pool()
+    if uno is None or settings.libreoffice_workers <= 0:
+        print("[LibreOffice] Python UNO bridge not available, converting with one soffice process per deck")
+        return
+    for _ in range(len(_workers)):
+        try:
+            worker = _idle.get_nowait()
+        except queue.Empty:
+            return  # Busy with conversions already
+        try:
+            worker.start()
+        except ConversionError as e:
+            logger.error("Could not start LibreOffice worker %d: %s", worker.index, e)
+        finally:
+            _idle.put(worker)
+
+
+def convert_to_pdf(source: Path, out_dir: Path) -> Path:
+    """
+    Convert the PPT/PPTX ``source`` to ``<out_dir>/<stem>.pdf`` on an idle
+    worker and return its path (blocking). Raises FileNotFoundError when
+    LibreOffice is not installed and ConversionError when the conversion fails
+    or waiting plus converting takes longer than ``LIBREOFFICE_TIMEOUT_SECONDS``.
+    """
+    find_libreoffice()
+    _ensure_pool()
+    timeout = settings.libreoffice_timeout_seconds
+    target = out_dir / f"{source.stem}.pdf"
+    waiting_since = time.monotonic()
+    try:
+        worker = _idle.get(timeout=timeout)
+    except queue.Empty:
+        raise ConversionError("All LibreOffice workers are busy", timed_out=True)
+    try:
+        # One budget for the whole request: the conversion gets what waiting left
+        remaining = timeout - (time.monotonic() - waiting_since)
+        if remaining <= 0:
+            raise ConversionError("All LibreOffice workers are busy", timed_out=True)
+        started = time.perf_counter()
+        worker.convert(source, target, remaining)
+        logger.info("LibreOffice worker %d converted %s in %.1fs", worker.index, source.name, time.perf_counter() - started)
+    finally:
+        _idle.put(worker)
+    return target
+
+
+def shutdown() -> None:
+    """Stop the workers and remove their profiles."""
+    with _pool_lock:
+        for worker in _workers:
+            try:
+                worker.stop()
+            except Exception as e:
+                logger.error("Could not stop LibreOffice worker %d: %s", worker.index, e)
+        _workers.clear()
+        while not _idle.empty():
+            _idle.get_nowait()
+    shutil.rmtree(_profiles_dir(), ignore_errors=True)
@@ -3,16 +3,24 @@ LinkedIn Posts Synchronization Service
 Periodically fetches posts from LinkedIn and stores them in the database
 """
 import asyncio
+import hashlib
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models.posts import SocialPost
 from app.services.linkedin_api import LinkedInService
+from app.utils.bulk import bulk_upsert
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def post_content_hash(post_type: str, content: str) -> str:
+    """Stable dedupe key for a synced post: sha256 of its type and whitespace-normalized content."""
+    normalized = " ".join((content or "").split())
+    return hashlib.sha256(f"{post_type}\n{normalized}".encode("utf-8")).hexdigest()
+
+
 class LinkedInSyncService:
     """Service to sync LinkedIn posts to database"""
     
@@ -37,46 +45,38 @@ class LinkedInSyncService:
                 logger.info(f"No posts fetched from LinkedIn for type: {post_type}")
                 return
             
-            # Store posts in database
-            new_posts_count = 0
-            updated_posts_count = 0
-            
+            # Dedupe within the batch on the content hash (last occurrence wins),
+            # then upsert the whole batch in one statement on the unique hash.
+            rows = {}
+            now = datetime.now()
             for post_data in posts:
-                # Check if post already exists (by content hash or unique identifier)
-                # For now, we'll check by content and created_at
-                existing_post = db.query(SocialPost).filter(
-                    SocialPost.content == post_data.get("content", "")[:500],  # First 500 chars for comparison
-                    SocialPost.post_type == post_type,
-                    SocialPost.is_active == 1
-                ).first()
-                
-                if existing_post:
-                    # Update existing post
-                    existing_post.likes = post_data.get("likes", 0)
-                    existing_post.comments = post_data.get("comments", 0)
-                    existing_post.time_ago = post_data.get("time_ago", "Just now")
-                    existing_post.updated_at = datetime.now()
-                    updated_posts_count += 1
-                else:
-                    # Create new post
-                    new_post = SocialPost(
-                        author=post_data.get("author", "Corpay"),
-                        content=post_data.get("content", ""),
-                        image_url=post_data.get("image_url"),
-                        likes=post_data.get("likes", 0),
-                        comments=post_data.get("comments", 0),
-                        post_type=post_type,
-                        time_ago=post_data.get("time_ago", "Just now"),
-                        created_at=post_data.get("created_at", datetime.now()),
-                        is_active=1
-                    )
-                    db.add(new_post)
-                    new_posts_count += 1
-            
+                content = post_data.get("content", "")
+                content_hash = post_content_hash(post_type, content)
+                rows[content_hash] = {
+                    "content_hash": content_hash,
+                    "author": post_data.get("author", "Corpay"),
+                    "content": content,
+                    "image_url": post_data.get("image_url"),
+                    "likes": post_data.get("likes", 0),
+                    "comments": post_data.get("comments", 0),
+                    "post_type": post_type,
+                    "time_ago": post_data.get("time_ago", "Just now"),
+                    "source": "api",
+                    "created_at": post_data.get("created_at", now),
+                    "is_active": 1,
+                }
+
+            synced_count = bulk_upsert(
+                db,
+                SocialPost,
+                rows.values(),
+                conflict_columns=["content_hash"],
+                update_columns=["likes", "comments", "time_ago"],
+            )
             db.commit()
             logger.info(
                 f"LinkedIn sync completed for {post_type}: "
-                f"{new_posts_count} new posts, {updated_posts_count} updated posts"
+                f"{synced_count} posts upserted ({len(posts) - synced_count} duplicates in batch)"
             )
             
         except Exception as e:
@@ -0,0 +1,337 @@
+"""
+Rendering slideshow decks to slide images, in the background.
+
+A deck is rendered as soon as it is uploaded (``start_rendering``) on a
+worker thread, so the public slides endpoint never converts anything: it
+reads the deck's manifest, or reports how far rendering has got
+(``slide_status``). PDFs are rasterized with PyMuPDF, split into page
+ranges across a process pool of ``PDF_RENDER_WORKERS``; PPT/PPTX are first
+converted to PDF by the LibreOffice workers (``app.services.libreoffice``).
+Slides are written to ``uploads/slideshow/slides`` as ``<deck stem>_<n>.png``
+and the manifest (slide names plus the deck's cache key) as
+``<deck stem><ext>.manifest.json``, written last so a manifest always
+describes a complete render. Decks are content-addressed, so an
+identical re-upload finds its manifest and is not rendered again.
+
+Slides are published while the deck renders: the first page is rendered
+before anything else, and ``progress["slides"]`` grows as the leading run of
+finished pages, so a show can start on slide 1 and play the rest in order
+as they arrive. ``next_update`` wakes whoever streams them.
+
+Progress is kept in memory per process, like the slideshow state itself; a
+deck without a manifest or a render in progress (e.g. after a restart, or
+after the upload GC evicted its slides) is rendered again on request.
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.config import settings
+from app.services import libreoffice
+
+logger = logging.getLogger(__name__)
+
+SLIDES_SUBDIR = Path("slideshow") / "slides"
+PDF_SCALE = 1.5  # 1.5x scale for faster conversion (was 2.0)
+PAGES_PER_TASK = 8  # Largest page range one worker renders per task; smaller ranges report progress sooner
+
+
+class RenderError(Exception):
+    """A deck could not be rendered; ``status_code`` is what the slides endpoint answers."""
+
+    def __init__(self, message: str, status_code: int = 500):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RenderStatus:
+    RENDERING = "rendering"
+    READY = "ready"
+    FAILED = "failed"
+
+
+# Deck path (relative to the upload directory) -> {"status", "done", "total", "slides", "error", "status_code"}
+_renders: Dict[str, Dict[str, Any]] = {}
+_tasks: Dict[str, "asyncio.Task[None]"] = {}
+# Deck path -> event set on its next progress update
+_updates: Dict[str, asyncio.Event] = {}
+
+
+def slides_dir() -> Path:
+    path = Path(settings.upload_dir) / SLIDES_SUBDIR
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _manifest_path(deck: Path) -> Path:
+    return slides_dir() / f"{deck.stem}{deck.suffix.lower()}.manifest.json"
+
+
+def _deck_key(deck: Path) -> str:
+    # Stored files never change content under their name, and re-uploads of identical
+    # content share one stored path (only touching its mtime), so path + size identify it
+    return f"{deck.resolve()}\n{deck.stat().st_size}"
+
+
+def read_manifest(file_path: str) -> Optional[List[str]]:
+    """Slide file names of a completed render of the deck at ``file_path``, or None."""
+    deck = Path(settings.upload_dir) / file_path
+    try:
+        manifest = json.loads(_manifest_path(deck).read_text())
+        if manifest.get("key") != _deck_key(deck):
+            return None
+        slides = manifest["slides"]
+        if not all((slides_dir() / name).exists() for name in slides[:1] + slides[-1:]):
+            return None  # Evicted by the upload GC
+        return slides
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _clear_outputs(deck: Path) -> None:
+    """Remove earlier outputs for this deck so stale slides are never returned."""
+    directory = slides_dir()
+    for old in list(directory.glob(f"{deck.stem}*.png")) + list(directory.glob(f"{deck.stem}*.meta")) + \
+            list(directory.glob(f"{deck.stem}*.manifest.json")):
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+def _write_manifest(deck: Path, slides: List[str]) -> None:
+    manifest_path = _manifest_path(deck)
+    temp = manifest_path.with_name(f".{manifest_path.name}.tmp")
+    temp.write_text(json.dumps({"key": _deck_key(deck), "slides": slides}))
+    temp.replace(manifest_path)
+
+
+def render_pages(pdf_path: str, start: int, stop: int, out_dir: str, stem: str, scale: float) -> List[str]:
+    """
+    Rasterize pages ``start`` to ``stop - 1`` of the PDF at ``pdf_path`` to
+    ``<stem>_<n>.png`` in ``out_dir``; returns the file names in page order.
+    Runs in a pool worker, which opens the document itself and holds one
+    page's pixmap at a time.
+    """
+    import fitz  # PyMuPDF
+    mat = fitz.Matrix(scale, scale)
+    names = []
+    doc = fitz.open(pdf_path)
+    try:
+        for i in range(start, stop):
+            pix = doc[i].get_pixmap(matrix=mat, alpha=False)
+            name = f"{stem}_{i + 1}.png"
+            pix.save(str(Path(out_dir) / name))
+            del pix
+            names.append(name)
+    finally:
+        doc.close()
+        fitz.TOOLS.store_shrink(100)  # Drop MuPDF's cached fonts and images between ranges
+    return names
+
+
+def page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    """Split ``page_count`` pages into contiguous ``(start, stop)`` ranges of at most ``PAGES_PER_TASK``, at least one per worker."""
+    size = max(1, min(PAGES_PER_TASK, -(-page_count // max(workers, 1))))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that runs an event loop and DB pools is not safe
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.pdf_render_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown() -> None:
+    """Stop the PDF render pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _render_pdf(deck: Path, progress: Dict[str, Any], on_update: Callable[[], None], stem: Optional[str] = None) -> List[str]:
+    """
+    Convert each page to PNG with PyMuPDF (no LibreOffice needed): the first
+    page right away on this thread, the rest in parallel page ranges. Slides
+    are named after ``stem`` (default: the PDF's own).
+    """
+    global _executor
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        raise RenderError("PDF support requires the pymupdf package. Install with: pip install pymupdf")
+    try:
+        doc = fitz.open(str(deck))
+    except fitz.FileDataError as e:
+        raise RenderError(f"Invalid or corrupted PDF: {e}", status_code=400)
+    try:
+        page_count = len(doc)
+    finally:
+        doc.close()
+    progress["total"] = page_count
+    if not page_count:
+        raise RenderError("PDF has no pages")
+
+    out_dir = str(slides_dir())
+    stem = stem or deck.stem
+    slides: Dict[int, List[str]] = {}
+
+    def publish(start: int, names: List[str]) -> None:
+        # Ranges finish in any order; only the leading run of pages is published, in page order
+        slides[start] = names
+        published = []
+        while len(published) in slides:
+            published += slides[len(published)]
+        progress.update(done=sum(len(names) for names in slides.values()), slides=published)
+        on_update()
+
+    ranges = [(start + 1, stop + 1) for start, stop in page_ranges(page_count - 1, settings.pdf_render_workers)]
+    if settings.pdf_render_workers <= 1 or len(ranges) <= 1:
+        # Not worth a round trip to the pool
+        for i in range(page_count):
+            publish(i, render_pages(str(deck), i, i + 1, out_dir, stem, PDF_SCALE))
+    else:
+        # Queued before the first page is rendered, so the pool starts on them meanwhile
+        futures = {
+            _get_executor().submit(render_pages, str(deck), start, stop, out_dir, stem, PDF_SCALE): start
+            for start, stop in ranges
+        }
+        try:
+            publish(0, render_pages(str(deck), 0, 1, out_dir, stem, PDF_SCALE))
+            for future in as_completed(futures):
+                publish(futures[future], future.result())
+        except BrokenProcessPool:
+            # A worker died (e.g. ran out of memory on a huge page); start a fresh pool next time
+            _executor = None
+            logger.error("PDF render worker crashed while rendering %s", deck)
+            raise RenderError("A render worker crashed while converting the PDF")
+        finally:
+            for future in futures:
+                future.cancel()
+
+    names = progress["slides"]
+    print(f"[Slideshow] PDF converted to {len(names)} slides")
+    return names
+
+
+def _render_with_libreoffice(deck: Path, progress: Dict[str, Any], on_update: Callable[[], None]) -> List[str]:
+    """Convert the deck to PDF with LibreOffice, then rasterize that like an uploaded PDF."""
+    if deck.suffix.lower() == ".pptx":
+        try:
+            from pptx import Presentation
+            progress["total"] = len(Presentation(str(deck)).slides)
+        except Exception:
+            pass  # Progress is only informative
+    print(f"[Slideshow] Converting {deck} to PDF using LibreOffice...")
+    with tempfile.TemporaryDirectory(prefix="slides_") as tmpdir:
+        try:
+            pdf = libreoffice.convert_to_pdf(deck, Path(tmpdir))
+        except FileNotFoundError as e:
+            print(f"[Slideshow] LibreOffice not found: {e}")
+            raise RenderError(str(e))
+        except libreoffice.ConversionError as e:
+            print(f"[Slideshow] LibreOffice conversion failed: {e}")
+            if e.timed_out:
+                raise RenderError(
+                    "Slide conversion timed out. Try a smaller presentation or use a PDF file.",
+                    status_code=504,
+                )
+            raise RenderError("Failed to convert PPT to images. Install LibreOffice or use a PDF file for best compatibility.")
+        return _render_pdf(pdf, progress, on_update, stem=deck.stem)
+
+
+def render_deck(file_path: str, progress: Dict[str, Any], on_update: Callable[[], None] = lambda: None) -> List[str]:
+    """
+    Render the deck at ``file_path`` (relative to the upload directory) and
+    write its manifest; returns the slide file names. Blocking; updates
+    ``progress["done"]`` / ``progress["total"]`` and publishes finished slides
+    in ``progress["slides"]`` as it goes, calling ``on_update`` after each
+    update. Raises RenderError.
+    """
+    deck = Path(settings.upload_dir) / file_path
+    if not deck.exists():
+        raise RenderError("Presentation file not found", status_code=404)
+    _clear_outputs(deck)
+    if deck.suffix.lower() == ".pdf":
+        slides = _render_pdf(deck, progress, on_update)
+    else:
+        slides = _render_with_libreoffice(deck, progress, on_update)
+    _write_manifest(deck, slides)
+    return slides
+
+
+def _notify(file_path: str) -> None:
+    event = _updates.pop(file_path, None)
+    if event is not None:
+        event.set()
+
+
+def next_update(file_path: str) -> asyncio.Event:
+    """An event set when rendering of the deck next makes progress or ends; take it before reading the status."""
+    return _updates.setdefault(file_path, asyncio.Event())
+
+
+async def _render(file_path: str) -> None:
+    progress = _renders[file_path]
+    loop = asyncio.get_running_loop()
+    try:
+        slides = await asyncio.to_thread(
+            render_deck, file_path, progress, lambda: loop.call_soon_threadsafe(_notify, file_path)
+        )
+        progress.update(status=RenderStatus.READY, done=len(slides), total=len(slides), slides=slides)
+    except RenderError as e:
+        progress.update(status=RenderStatus.FAILED, error=str(e), status_code=e.status_code)
+    except Exception as e:
+        print(f"[Slideshow] Conversion error: {e}")
+        import traceback
+        traceback.print_exc()
+        progress.update(status=RenderStatus.FAILED, error=f"Failed to convert the presentation: {e}", status_code=500)
+    finally:
+        _tasks.pop(file_path, None)
+        _notify(file_path)
+
+
+def start_rendering(file_path: str, retry: bool = False) -> None:
+    """
+    Render the deck in the background unless it already has a manifest or is
+    being rendered. A failed render is only retried with ``retry``. Call from
+    the event loop.
+    """
+    if file_path in _tasks:
+        return
+    previous = _renders.get(file_path)
+    if previous is not None and previous["status"] == RenderStatus.FAILED and not retry:
+        return
+    if read_manifest(file_path) is not None:
+        return
+    _renders[file_path] = {"status": RenderStatus.RENDERING, "done": 0, "total": None, "slides": []}
+    _tasks[file_path] = asyncio.create_task(_render(file_path))
+
+
+def slide_status(file_path: str) -> Dict[str, Any]:
+    """
+    Where rendering of the deck stands, without doing any of it: {"status":
+    "ready", "slides": [file names]}, {"status": "rendering", "done", "total",
+    "slides": [file names published so far]} or {"status": "failed", "error",
+    "status_code"}. Starts rendering a deck
+    that has neither a manifest nor a render in progress.
+    """
+    slides = read_manifest(file_path)
+    if slides is not None:
+        return {"status": RenderStatus.READY, "slides": slides}
+    start_rendering(file_path)
+    return dict(_renders[file_path])
@@ -0,0 +1,179 @@
+"""
+Streaming ingest for large CSV / Parquet exports (payments, system performance).
+
+Files are read in bounded chunks (``pd.read_csv(chunksize=...)`` or Parquet
+record batches) with only the needed columns, and results are aggregated
+incrementally, so peak memory depends on ``settings.ingest_chunk_rows`` rather
+than on the size of the export. Column resolution and per-row semantics are
+shared with ``ExcelParser`` so every format behaves the same. Value columns
+the header does not name are picked (by position) from the first chunk, once
+for the whole file, and coerced to numbers in every chunk, so each chunk reads
+the same columns with the same types.
+
+``file_path`` may also be a binary file object (e.g. an upload still in
+memory) with a ``name`` attribute, which decides the format.
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import pandas as pd
+from app.config import settings
+from app.services.excel_parser import (
+    ExcelParser,
+    _mapped_columns,
+    _resolve_payments_columns,
+    _resolve_system_performance_columns,
+)
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for .parquet uploads
+    pq = None
+
+# Parquet is only accepted when pyarrow is installed
+STREAM_EXTENSIONS = (".csv", ".parquet") if pq is not None else (".csv",)
+
+
+def _suffix(source) -> str:
+    return Path(str(getattr(source, "name", source))).suffix.lower()
+
+
+def _rewind(source) -> None:
+    # A file object is read once for the header and again for the rows
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def is_streamable(filename) -> bool:
+    return _suffix(filename) in STREAM_EXTENSIONS
+
+
+def _is_parquet(file_path) -> bool:
+    if _suffix(file_path) != ".parquet":
+        return False
+    if pq is None:
+        raise ValueError("Parquet uploads require pyarrow (pip install pyarrow)")
+    return True
+
+
+def read_header(file_path: str) -> List[str]:
+    """Column names of a CSV / Parquet file without reading any data rows."""
+    _rewind(file_path)
+    if _is_parquet(file_path):
+        return list(pq.ParquetFile(file_path).schema_arrow.names)
+    return list(pd.read_csv(file_path, nrows=0).columns)
+
+
+def _read_chunks(file_path: str, columns: Optional[List[str]], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    _rewind(file_path)
+    if _is_parquet(file_path):
+        parquet_file = pq.ParquetFile(file_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+    with pd.read_csv(file_path, usecols=columns, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_chunks(
+    file_path: str,
+    columns: Optional[Sequence[str]] = None,
+    chunk_rows: Optional[int] = None,
+    numeric: Sequence[str] = (),
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield DataFrames of at most ``chunk_rows`` rows, restricted to ``columns``
+    if given, with the ``numeric`` columns coerced to numbers (NaN where a
+    value is not one) whatever a chunk's own values look like.
+    """
+    chunk_rows = chunk_rows or settings.ingest_chunk_rows
+    columns = list(columns) if columns else None
+    for chunk in _read_chunks(file_path, columns, chunk_rows):
+        for column in numeric:
+            chunk[column] = pd.to_numeric(chunk[column], errors="coerce")
+        yield chunk
+
+
+def _layout(file_path, mappings, kind: str, resolve, complete) -> Dict[str, Optional[str]]:
+    """Resolve (or look up) the columns of a CSV / Parquet header; only complete layouts are cached."""
+    header = read_header(file_path)
+    cols, cached = _mapped_columns(mappings, kind, header, resolve)
+    if mappings is not None and not cached and complete(cols):
+        mappings.store(kind, header, cols)
+    return cols
+
+
+def _complete_layout(file_path, cols: Dict[str, Optional[str]], values: Sequence[str], infer) -> Dict[str, Optional[str]]:
+    """
+    Fill unresolved value columns the way ``ExcelParser`` does (first / second
+    numeric column), judged on the first chunk only and then used for every chunk.
+    """
+    if all(cols[value] for value in values):
+        return cols
+    first = next(iter_chunks(file_path), None)
+    return infer(first, cols) if first is not None else cols
+
+
+def _payment_columns(file_path: str, mappings=None):
+    """The payments layout, the columns to read and those to coerce to numbers."""
+    cols = _layout(file_path, mappings, "payments", _resolve_payments_columns,
+                   lambda cols: cols["amount"] and cols["transactions"])
+    cols = _complete_layout(file_path, cols, ("amount", "transactions"), ExcelParser.infer_payment_columns)
+    numeric = [c for c in (cols["amount"], cols["transactions"]) if c is not None]
+    return cols, [c for c in cols.values() if c is not None], numeric
+
+
+def stream_latest_payment(file_path: str, mappings=None) -> Dict[str, Any]:
+    """Streaming equivalent of ``ExcelParser.parse_payments_file``."""
+    try:
+        cols, columns, numeric = _payment_columns(file_path, mappings)
+        date_col = cols["date"]
+        latest: Optional[pd.DataFrame] = None
+        for chunk in iter_chunks(file_path, columns, numeric=numeric):
+            if chunk.empty:
+                continue
+            if not date_col:
+                latest = chunk.tail(1)
+                continue
+            chunk[date_col] = pd.to_datetime(chunk[date_col])
+            candidate = chunk.loc[[chunk[date_col].idxmax()]]
+            # Strictly greater keeps the first occurrence, like idxmax over the whole file
+            if latest is None or candidate[date_col].iloc[0] > latest[date_col].iloc[0]:
+                latest = candidate
+        if latest is None:
+            raise ValueError("File has no data rows")
+        return ExcelParser.latest_payment(latest, cols)
+    except Exception as e:
+        raise ValueError(f"Error parsing payments file: {str(e)}")
+
+
+def stream_payments_history(file_path: str, mappings=None) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming equivalent of ``ExcelParser.parse_payments_history``: yields one
+    {"rows", "skipped"} result per chunk. A date may appear in several chunks;
+    callers accumulate totals across chunks.
+    """
+    try:
+        cols, columns, numeric = _payment_columns(file_path, mappings)
+        for chunk in iter_chunks(file_path, columns, numeric=numeric):
+            yield ExcelParser.normalize_payments_history(chunk, cols)
+    except Exception as e:
+        raise ValueError(f"Error parsing payments file: {str(e)}")
+
+
+def stream_latest_system_performance(file_path: str, mappings=None) -> Dict[str, Any]:
+    """Streaming equivalent of ``ExcelParser.parse_system_performance_file`` (last row wins)."""
+    try:
+        cols = _layout(file_path, mappings, "system_performance", _resolve_system_performance_columns,
+                       lambda cols: cols["uptime"] and cols["success"])
+        cols = _complete_layout(file_path, cols, ("uptime", "success"), ExcelParser.infer_system_performance_columns)
+        columns = [c for c in (cols["uptime"], cols["success"]) if c is not None]
+        latest: Optional[pd.DataFrame] = None
+        for chunk in iter_chunks(file_path, columns, numeric=columns):
+            if not chunk.empty:
+                latest = chunk.tail(1)
+        if latest is None:
+            raise ValueError("File has no data rows")
+        return ExcelParser.latest_system_performance(latest, cols)
+    except Exception as e:
+        raise ValueError(f"Error parsing system performance file: {str(e)}")
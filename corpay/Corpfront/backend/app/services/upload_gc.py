@@ -0,0 +1,230 @@
+"""
+Garbage collection of the upload directory.
+
+Files stay on disk after nothing needs them any more: superseded sheets,
+replaced employee photos, earlier slideshow decks and their rendered slides,
+photos uploaded but never attached, and partial files left in ``.incoming``
+by interrupted uploads. ``collect_garbage`` walks the upload directory and
+cross-references it with the database and the slideshow state. A file is
+live when it is:
+
+- the latest upload of a sheet type, an upload whose ingest job has not
+  finished, or any sheet upload newer than ``UPLOAD_RETENTION_DAYS``
+  (sheets are kept so jobs can be re-run from them);
+- an employee milestone's photo or one of its avatar variants;
+- referenced in ``stored_files`` by more rows than its ``FileUpload``
+  history (e.g. an avatar, or any future reference kind);
+- the current slideshow deck or one of its rendered slides;
+- a hard link to a live file (legacy paths kept by scripts/dedupe_uploads.py).
+
+Anything else whose mtime is older than ``GC_GRACE_HOURS`` is deleted (uploads
+in flight and just-rendered files are younger than that; re-uploading stored
+content touches it). The mtime is checked again right before deleting, so an
+identical re-upload that lands while GC runs keeps its file. ``FileUpload``
+rows are kept as history; the ``stored_files`` row of a deleted file goes
+with it, since only that expired history still counted towards it.
+
+If the directory is still over ``UPLOAD_QUOTA_MB`` afterwards, rendered
+slides are evicted least recently used first, one deck at a time, since they
+can be rendered again from the deck. Runs every ``GC_INTERVAL_MINUTES`` and on
+demand from ``POST /api/admin/storage/gc``.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.employees import EmployeeMilestone
+from app.models.file_upload import FileUpload, FileType
+from app.models.ingest_job import IngestJob, JobStatus
+from app.models.stored_file import StoredFile
+from app.services.slide_renderer import SLIDES_SUBDIR
+
+logger = logging.getLogger(__name__)
+
+# Uploads whose stored file is only history once superseded; the rest are ingested sheets
+UNINGESTED_TYPES = (FileType.EMPLOYEE_PHOTO, FileType.SLIDESHOW)
+
+
+def live_paths(db: Session, extra: Iterable[str] = ()) -> Set[str]:
+    """Upload-relative paths of every file still needed (besides rendered slides)."""
+    live = {path for path in extra if path}
+
+    retained_since = datetime.now(timezone.utc) - timedelta(days=settings.upload_retention_days)
+    sheets = db.query(FileUpload.stored_path).filter(FileUpload.file_type.notin_(UNINGESTED_TYPES))
+    live.update(path for (path,) in sheets.filter(FileUpload.created_at >= retained_since))
+    latest = db.query(func.max(FileUpload.id)).filter(
+        FileUpload.file_type.notin_(UNINGESTED_TYPES)
+    ).group_by(FileUpload.file_type)
+    live.update(path for (path,) in db.query(FileUpload.stored_path).filter(FileUpload.id.in_(latest)))
+    pending = db.query(FileUpload.stored_path).join(IngestJob, IngestJob.file_upload_id == FileUpload.id)
+    live.update(path for (path,) in pending.filter(IngestJob.status.in_(JobStatus.PENDING)))
+
+    # Files counted by more rows than their upload history are held by something else
+    history = db.query(FileUpload.stored_path, func.count().label("uploads")).group_by(FileUpload.stored_path).subquery()
+    held = db.query(StoredFile.path).outerjoin(history, history.c.stored_path == StoredFile.path).filter(
+        StoredFile.ref_count > func.coalesce(history.c.uploads, 0)
+    )
+    live.update(path for (path,) in held)
+
+    avatars = db.query(EmployeeMilestone.avatar_path, EmployeeMilestone.avatar_variants).filter(
+        EmployeeMilestone.avatar_path.isnot(None)
+    )
+    for avatar_path, variants in avatars:
+        live.add(avatar_path)
+        if variants:
+            live.update(path for sizes in json.loads(variants).values() for path in sizes.values())
+    return live
+
+
+def _walk(upload_dir: Path) -> List[Tuple[str, os.stat_result]]:
+    files = []
+    for root, _, names in os.walk(upload_dir):
+        for name in names:
+            full_path = Path(root) / name
+            try:
+                files.append((full_path.relative_to(upload_dir).as_posix(), full_path.stat()))
+            except FileNotFoundError:
+                continue
+    return files
+
+
+def _is_render(path: str) -> bool:
+    return Path(path).parent == SLIDES_SUBDIR
+
+
+def _render_deck(path: str) -> str:
+    """The deck stem a rendered slide (<stem>.png, <stem>_<n>.png, <stem><ext>.manifest.json) belongs to."""
+    name = Path(path).name
+    stem = name.split(".", 1)[0]
+    head, _, tail = stem.rpartition("_")
+    return head if head and tail.isdigit() else stem
+
+
+def _delete(upload_dir: Path, path: str, dry_run: bool, modified_before: Optional[float] = None) -> Optional[int]:
+    """
+    Delete one file; returns the bytes freed (zero while other hard links to
+    it remain). Re-stats first and returns None, keeping the file, if it was
+    modified at or after ``modified_before`` since it was scanned (an
+    identical re-upload touches the stored file).
+    """
+    full_path = upload_dir / path
+    try:
+        stat_result = full_path.stat()
+        if modified_before is not None and stat_result.st_mtime >= modified_before:
+            return None
+        if not dry_run:
+            full_path.unlink()
+    except FileNotFoundError:
+        return 0
+    return stat_result.st_size if stat_result.st_nlink == 1 else 0
+
+
+def collect_garbage(
+    extra_live: Iterable[str] = (),
+    dry_run: bool = False,
+    now: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Delete unneeded files from the upload directory, then evict rendered
+    slides while over quota. ``extra_live`` are upload-relative paths to keep
+    besides those known to the database (the current slideshow deck).
+    Blocking; run in a thread. Returns a report; ``dry_run`` only reports.
+    """
+    upload_dir = Path(settings.upload_dir)
+    started = datetime.now(timezone.utc)
+    now = time.time() if now is None else now
+    grace_before = now - settings.gc_grace_hours * 3600
+
+    db = SessionLocal()
+    try:
+        live = live_paths(db, extra_live)
+    finally:
+        db.close()
+
+    files = _walk(upload_dir)
+    live_decks = {Path(path).stem for path in live}
+    live_inodes = {(stat_result.st_dev, stat_result.st_ino) for path, stat_result in files if path in live}
+
+    report = {"dry_run": dry_run, "scanned_files": len(files), "deleted_files": 0,
+              "evicted_renders": 0, "bytes_reclaimed": 0}
+    deleted = []
+    remaining = []
+    for path, stat_result in files:
+        if _is_render(path):
+            keep = _render_deck(path) in live_decks
+        else:
+            keep = path in live or (stat_result.st_dev, stat_result.st_ino) in live_inodes
+        if keep or stat_result.st_mtime > grace_before:
+            remaining.append((path, stat_result))
+            continue
+        freed = _delete(upload_dir, path, dry_run, modified_before=grace_before)
+        if freed is None:
+            remaining.append((path, stat_result))  # Re-uploaded since the scan
+            continue
+        report["bytes_reclaimed"] += freed
+        report["deleted_files"] += 1
+        deleted.append(path)
+
+    total = sum(stat_result.st_size for _, stat_result in remaining)
+    quota = settings.upload_quota_mb * 1024 * 1024
+    if quota and total > quota:
+        # Evict whole decks' renders, least recently used first (a partial set would be served as complete)
+        decks: Dict[str, List[Tuple[str, os.stat_result]]] = {}
+        for path, stat_result in remaining:
+            if _is_render(path):
+                decks.setdefault(_render_deck(path), []).append((path, stat_result))
+        by_last_use = sorted(decks.values(), key=lambda renders: max(max(s.st_atime, s.st_mtime) for _, s in renders))
+        for renders in by_last_use:
+            if total <= quota:
+                break
+            for path, stat_result in renders:
+                report["bytes_reclaimed"] += _delete(upload_dir, path, dry_run) or 0
+                total -= stat_result.st_size
+                report["evicted_renders"] += 1
+                deleted.append(path)
+
+    if deleted and not dry_run:
+        _forget(deleted, started)
+    report["total_bytes"] = total
+    report["quota_bytes"] = quota or None
+    if quota and total > quota:
+        logger.warning("Uploads use %d bytes after GC, over the %d byte quota", total, quota)
+    return report
+
+
+def _forget(paths: List[str], started: datetime) -> None:
+    """
+    Drop the reference-count rows of deleted files. Their remaining references
+    are expired upload history (anything else kept the file live), unless the
+    path was referenced again after this run started.
+    """
+    db = SessionLocal()
+    try:
+        db.query(StoredFile).filter(
+            StoredFile.path.in_(paths), StoredFile.last_referenced_at < started
+        ).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run_periodic_gc(extra_live: Callable[[], Iterable[str]], interval_minutes: int) -> None:
+    """Collect garbage every ``interval_minutes``; ``extra_live`` is re-read each run."""
+    while True:
+        await asyncio.sleep(interval_minutes * 60)
+        try:
+            report = await asyncio.to_thread(collect_garbage, list(extra_live()))
+            logger.info("Upload GC: %s", report)
+            if report["deleted_files"] or report["evicted_renders"]:
+                print(f"[Upload GC] Deleted {report['deleted_files']} files and evicted "
+                      f"{report['evicted_renders']} renders, reclaiming {report['bytes_reclaimed']} bytes")
+        except Exception as e:
+            logger.error(f"Error in upload GC: {e}")
@@ -0,0 +1,127 @@
+"""
+Recording uploaded files in the content-addressed store.
+
+Uploads are hashed (SHA-256) as they are read and stored once per content at
+``ab/cd/<sha256><ext>`` under the upload directory (see
+``file_handler.content_path``). A re-upload of identical content points its
+``FileUpload`` row at the existing file instead of writing another copy, so
+it reuses anything cached against that path, such as rendered slides, and
+stored URLs are stable.
+
+``stored_files`` counts the rows referring to each stored file (FileUpload
+rows and employee avatars): ``retain_file`` when a row starts pointing at a
+path, ``release_file`` when it stops. Files at zero references are what a
+cleanup can remove.
+"""
+import asyncio
+from pathlib import Path
+from typing import NamedTuple, Optional
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from starlette.concurrency import run_in_threadpool
+from app.models.file_upload import FileUpload, FileType
+from app.models.stored_file import StoredFile
+from app.utils.bulk import dialect_insert
+from app.utils.file_handler import SavedUpload, STREAMED_EXTENSIONS, read_upload, save_upload_stream, content_path, write_content
+
+# Spreadsheets up to this size are parsed from memory while they are written to disk;
+# anything larger (and every CSV / Parquet export) is streamed to disk and parsed from there
+MAX_BUFFERED_BYTES = 8 * 1024 * 1024
+
+
+class ReceivedUpload(NamedTuple):
+    file_upload: FileUpload
+    # The upload itself, so ingest can parse it without reading the stored copy back
+    # (None when it was received straight to disk)
+    content: Optional[bytes]
+    persisted: "asyncio.Future[None]"  # Done once the original is on disk
+
+
+def retain_file(db: Session, path: str, content_hash: Optional[str] = None, size: Optional[int] = None) -> None:
+    """Count one more reference to the stored file at ``path`` (does not commit)."""
+    stmt = dialect_insert(db, StoredFile).values(
+        path=path, content_hash=content_hash, size=size, ref_count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["path"],
+        set_={
+            "ref_count": StoredFile.ref_count + 1,
+            "content_hash": func.coalesce(StoredFile.content_hash, stmt.excluded.content_hash),
+            "size": func.coalesce(StoredFile.size, stmt.excluded.size),
+            "last_referenced_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def release_file(db: Session, path: Optional[str]) -> None:
+    """Drop one reference to the stored file at ``path`` (does not commit or delete the file)."""
+    if not path:
+        return
+    db.query(StoredFile).filter(StoredFile.path == path, StoredFile.ref_count > 0).update(
+        {StoredFile.ref_count: StoredFile.ref_count - 1}, synchronize_session=False
+    )
+
+
+def replace_reference(db: Session, old_path: Optional[str], new_path: Optional[str]) -> None:
+    """Move a row's reference from ``old_path`` to ``new_path`` (either may be empty)."""
+    if old_path == new_path:
+        return
+    release_file(db, old_path)
+    if new_path:
+        retain_file(db, new_path)
+
+
+async def receive_upload(
+    db: Session,
+    file: UploadFile,
+    file_type: FileType,
+    uploaded_by: str,
+) -> ReceivedUpload:
+    """
+    Receive ``file`` and add its FileUpload row and file reference (does not
+    commit). A small spreadsheet is read into ``content`` and, unless
+    identical content is already stored, written to disk in the background
+    while the caller starts parsing it; await ``persisted`` before relying on
+    the stored file. Anything else is streamed straight to the store in
+    chunks and ``content`` is None, so ingest reads the stored path and the
+    upload is never held in memory or sent to the worker.
+    """
+    if (
+        Path(file.filename or "").suffix.lower() in STREAMED_EXTENSIONS
+        or file.size is None
+        or file.size > MAX_BUFFERED_BYTES
+    ):
+        saved = await save_upload_stream(file)
+        return stored_upload(db, saved, file.filename, file_type, uploaded_by)
+
+    buffered = await read_upload(file)
+    file_path = content_path(buffered.content_hash, file.filename)
+    persisted = asyncio.ensure_future(run_in_threadpool(write_content, file_path, buffered.content))
+
+    saved = SavedUpload(file_path, buffered.content_hash, buffered.size)
+    file_upload = record_upload(db, saved, file.filename, file_type, uploaded_by)
+    return ReceivedUpload(file_upload, buffered.content, persisted)
+
+
+def record_upload(db: Session, saved: SavedUpload, filename: str, file_type: FileType, uploaded_by: str) -> FileUpload:
+    """Add the FileUpload row and file reference of a stored upload (does not commit)."""
+    file_upload = FileUpload(
+        original_filename=filename,
+        stored_path=saved.path,
+        file_type=file_type,
+        file_size=saved.size,
+        content_hash=saved.content_hash,
+        uploaded_by=uploaded_by
+    )
+    db.add(file_upload)
+    retain_file(db, saved.path, saved.content_hash, saved.size)
+    return file_upload
+
+
+def stored_upload(db: Session, saved: SavedUpload, filename: str, file_type: FileType, uploaded_by: str) -> ReceivedUpload:
+    """``receive_upload`` for a file already in the store (e.g. assembled from chunks); ingest reads it from disk."""
+    persisted = asyncio.get_running_loop().create_future()
+    persisted.set_result(None)
+    return ReceivedUpload(record_upload(db, saved, filename, file_type, uploaded_by), None, persisted)
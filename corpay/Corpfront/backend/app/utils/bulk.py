@@ -0,0 +1,64 @@
+"""
+Bulk write helpers shared by the sync and upload paths.
+
+Rows are written with a dialect-specific ``INSERT ... ON CONFLICT DO UPDATE``
+(PostgreSQL and SQLite both support it) executed executemany-style, one
+round-trip per batch instead of one SELECT + INSERT per row.
+"""
+from typing import Any, Dict, Iterable, List, Sequence
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def dialect_insert(db: Session, model):
+    """Return an ``insert()`` construct that supports ``on_conflict_do_update``."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Bulk upsert is not supported for dialect: {dialect}")
+    return insert(model.__table__)
+
+
+def iter_batches(rows: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE):
+    """Yield lists of at most ``batch_size`` rows."""
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_upsert(
+    db: Session,
+    model,
+    rows: Iterable[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """
+    Insert ``rows`` into ``model``'s table, updating ``update_columns`` on rows
+    whose ``conflict_columns`` already exist (these must be covered by a unique
+    index). ``updated_at`` is bumped on conflict when the table has one.
+
+    Does not commit; callers own the transaction. Returns the number of rows sent.
+    """
+    stmt = dialect_insert(db, model)
+    set_ = {col: stmt.excluded[col] for col in update_columns}
+    if "updated_at" in model.__table__.c and "updated_at" not in set_:
+        set_["updated_at"] = func.now()
+    stmt = stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=set_)
+
+    written = 0
+    for batch in iter_batches(rows, batch_size):
+        db.execute(stmt, batch)
+        written += len(batch)
+    return written
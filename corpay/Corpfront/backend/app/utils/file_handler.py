@@ -1,10 +1,14 @@
+import hashlib
 import os
-import shutil
+import uuid
 from pathlib import Path
-from typing import Optional
-from fastapi import UploadFile
+from typing import BinaryIO, NamedTuple, Optional
+from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
 
+COPY_CHUNK_SIZE = 1024 * 1024
+
 
 def ensure_upload_dir():
     """Ensure upload directory exists"""
@@ -13,30 +17,208 @@ def ensure_upload_dir():
     return upload_path
 
 
-def save_uploaded_file(file: UploadFile, subdirectory: str = "") -> str:
+class SavedUpload(NamedTuple):
+    path: str  # Relative to settings.upload_dir
+    content_hash: str  # SHA-256 hex digest
+    size: int  # Bytes
+
+
+class BufferedUpload(NamedTuple):
+    content: bytes
+    content_hash: str  # SHA-256 hex digest
+    size: int  # Bytes
+
+
+# CSV / Parquet exports are ingested in constant memory (app/services/tabular_stream.py),
+# so they get the larger MAX_STREAM_FILE_SIZE_MB limit
+STREAMED_EXTENSIONS = ('.csv', '.parquet')
+
+
+def max_upload_mb(filename: Optional[str]) -> int:
+    """Upload size limit in MB for a file of this name."""
+    if filename and Path(filename).suffix.lower() in STREAMED_EXTENSIONS:
+        return max(settings.max_stream_file_size_mb, settings.max_file_size_mb)
+    return settings.max_file_size_mb
+
+
+def too_large(filename: Optional[str]) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File exceeds the {max_upload_mb(filename)} MB upload limit",
+    )
+
+
+def content_path(content_hash: str, filename: str) -> str:
     """
-    Save uploaded file and return the stored path
+    Content-addressed path (relative to the upload directory) for a file with
+    this SHA-256 digest: ``ab/cd/<sha256><ext>``. Identical content uploaded
+    under the same extension always maps to the same path, so the file is
+    stored once and its URL never changes meaning.
     """
-    upload_dir = ensure_upload_dir()
-    
-    if subdirectory:
-        target_dir = upload_dir / subdirectory
-        target_dir.mkdir(parents=True, exist_ok=True)
-    else:
-        target_dir = upload_dir
-    
-    # Generate unique filename
-    file_extension = Path(file.filename).suffix
-    import uuid
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = target_dir / unique_filename
+    suffix = Path(filename).suffix.lower()
+    return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{suffix}"
+
+
+def incoming_dir() -> Path:
+    """Directory for files being received, on the same filesystem as the store (never served)."""
+    incoming = ensure_upload_dir() / ".incoming"
+    incoming.mkdir(exist_ok=True)
+    return incoming
+
+
+def _incoming_path() -> Path:
+    """A fresh temporary path for a file being received."""
+    return incoming_dir() / uuid.uuid4().hex
+
+
+def _touch(path: Path) -> bool:
+    """
+    Mark an already stored file as just uploaded again, so the garbage
+    collector's grace period restarts (see app/services/upload_gc.py).
+    Returns False if there is no such file.
+    """
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _promote(temp_path: Path, relative_path: str) -> None:
+    """Move a fully written temporary file to its content-addressed path, or drop it if already stored."""
+    target = Path(settings.upload_dir) / relative_path
+    if _touch(target):
+        temp_path.unlink(missing_ok=True)
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(temp_path, target)
+
+
+async def save_upload_stream(file: UploadFile) -> SavedUpload:
+    """
+    Stream an upload to disk in chunks, hashing and counting bytes as it goes,
+    and store it at its content-addressed path (see ``content_path``).
+
+    Disk writes run in the threadpool so the event loop keeps serving other
+    requests. Uploads over ``max_upload_mb`` are rejected with 413
+    as soon as the limit is crossed (or up front when the size is known) and
+    the partial file is removed.
+    """
+    max_bytes = max_upload_mb(file.filename) * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        raise too_large(file.filename)
+
+    temp_path = await run_in_threadpool(_incoming_path)
     
-    # Save file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    digest = hashlib.sha256()
+    size = 0
+    buffer = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        while chunk := await file.read(COPY_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                raise too_large(file.filename)
+            digest.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+    except BaseException:
+        await run_in_threadpool(buffer.close)
+        await run_in_threadpool(temp_path.unlink, True)
+        raise
+    await run_in_threadpool(buffer.close)
     
-    # Return relative path
-    return str(file_path.relative_to(upload_dir))
+    relative_path = content_path(digest.hexdigest(), file.filename)
+    await run_in_threadpool(_promote, temp_path, relative_path)
+    return SavedUpload(relative_path, digest.hexdigest(), size)
+
+
+async def read_upload(file: UploadFile) -> BufferedUpload:
+    """
+    Read an upload from its spooled buffer into memory, hashing and counting
+    bytes as it goes, without writing it anywhere. Same 413 limit as
+    ``save_upload_stream``.
+    """
+    max_bytes = max_upload_mb(file.filename) * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        raise too_large(file.filename)
+
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    while chunk := await file.read(COPY_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise too_large(file.filename)
+        digest.update(chunk)
+        chunks.append(chunk)
+    return BufferedUpload(b"".join(chunks), digest.hexdigest(), size)
+
+
+def write_content(relative_path: str, content: bytes) -> None:
+    """
+    Store ``content`` at its content-addressed ``relative_path`` unless it is
+    already there (blocking; run in the threadpool). Written to a temporary
+    file first so a reader never sees a partial file at the final path.
+    """
+    if _touch(Path(settings.upload_dir) / relative_path):
+        return
+    temp_path = _incoming_path()
+    try:
+        temp_path.write_bytes(content)
+        _promote(temp_path, relative_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def store_incoming(temp_path: Path, filename: str, expected_hash: Optional[str] = None) -> SavedUpload:
+    """
+    Hash a fully received file in ``incoming_dir()`` and move it to its
+    content-addressed path (blocking; run in the threadpool). Raises
+    ValueError, leaving the file in place, if it does not match ``expected_hash``.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(temp_path, "rb") as f:
+        while chunk := f.read(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    if expected_hash is not None and digest.hexdigest() != expected_hash.lower():
+        raise ValueError(f"SHA-256 of the assembled file is {digest.hexdigest()}, expected {expected_hash.lower()}")
+    relative_path = content_path(digest.hexdigest(), filename)
+    _promote(temp_path, relative_path)
+    return SavedUpload(relative_path, digest.hexdigest(), size)
+
+
+def store_stream(source: BinaryIO, filename: str, max_bytes: int) -> SavedUpload:
+    """
+    Copy a readable binary stream to its content-addressed path in chunks,
+    hashing as it goes (blocking; run in the threadpool). Raises ValueError,
+    leaving nothing behind, as soon as more than ``max_bytes`` have been read.
+    """
+    temp_path = _incoming_path()
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp_path, "wb") as f:
+            while chunk := source.read(COPY_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(f"{filename} is larger than {max_bytes} bytes")
+                digest.update(chunk)
+                f.write(chunk)
+        relative_path = content_path(digest.hexdigest(), filename)
+        _promote(temp_path, relative_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return SavedUpload(relative_path, digest.hexdigest(), size)
+
+
+async def save_uploaded_file(file: UploadFile) -> str:
+    """
+    Save uploaded file and return the stored path
+    """
+    return (await save_upload_stream(file)).path
 
 
 def delete_file(file_path: str) -> bool:
@@ -0,0 +1,156 @@
+"""
+SQL instrumentation: per-request query counts and DB time, slow-query logging
+and N+1 detection, attributed to the matched route.
+
+Engine-level cursor events record every statement; the HTTP middleware in
+``app.main`` opens a ``RequestQueryStats`` for each request (held in a
+ContextVar so threadpool dependencies see it too), then folds it into the
+per-route totals served by ``/api/admin/metrics/sql``.
+"""
+import re
+import threading
+import time
+import logging
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import event
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar[Optional["RequestQueryStats"]] = ContextVar("sql_request_stats", default=None)
+
+_route_stats: Dict[str, Dict[str, Any]] = {}
+_route_lock = threading.Lock()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Expanding IN lists render one placeholder per value; collapse them to one shape
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so repeated executions of the same query compare equal."""
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    return _IN_LIST_RE.sub("IN (...)", shape)
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters without logging their values."""
+    if executemany:
+        return f"<executemany: {len(parameters)} parameter sets redacted>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}=?" for key in parameters) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return f"<{len(parameters)} parameters redacted>"
+    return "<redacted>"
+
+
+class RequestQueryStats:
+    """Statements executed while serving a single request."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.query_count += 1
+        self.db_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self) -> Dict[str, int]:
+        """Statement shapes executed often enough in this request to look like N+1."""
+        threshold = settings.sql_n_plus_one_threshold
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if elapsed * 1000 >= settings.sql_slow_query_ms:
+        logger.warning(
+            "Slow query (%.1f ms): %s params=%s",
+            elapsed * 1000,
+            statement_shape(statement),
+            redact_parameters(parameters, executemany),
+        )
+
+
+def install(engine) -> None:
+    """Attach the timing hooks to an engine (idempotent)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def start_request() -> Tuple[RequestQueryStats, Token]:
+    """
+    Begin collecting statements for the current request context. Returns the
+    stats and the token to pass to ``end_request`` (call it in a ``finally``).
+    """
+    stats = RequestQueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def end_request(token: Token) -> None:
+    """Stop collecting statements for the request, even if it raised."""
+    _current_stats.reset(token)
+
+
+def finish_request(route: str, stats: RequestQueryStats) -> None:
+    """Fold a finished request into the per-route totals and flag N+1 patterns."""
+    repeated = stats.repeated_shapes()
+    for shape, count in repeated.items():
+        logger.warning("Possible N+1 on %s: statement executed %d times: %s", route, count, shape)
+
+    with _route_lock:
+        entry = _route_stats.setdefault(route, {
+            "requests": 0,
+            "queries": 0,
+            "db_time_ms": 0.0,
+            "max_queries": 0,
+            "n_plus_one": {},
+        })
+        entry["requests"] += 1
+        entry["queries"] += stats.query_count
+        entry["db_time_ms"] += stats.db_time * 1000
+        entry["max_queries"] = max(entry["max_queries"], stats.query_count)
+        for shape, count in repeated.items():
+            entry["n_plus_one"][shape] = max(entry["n_plus_one"].get(shape, 0), count)
+
+
+def get_route_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of per-route totals with averages, busiest routes first."""
+    with _route_lock:
+        snapshot = {}
+        for route, entry in _route_stats.items():
+            requests = entry["requests"] or 1
+            snapshot[route] = {
+                **entry,
+                "n_plus_one": dict(entry["n_plus_one"]),
+                "db_time_ms": round(entry["db_time_ms"], 3),
+                "avg_queries": round(entry["queries"] / requests, 2),
+                "avg_db_time_ms": round(entry["db_time_ms"] / requests, 3),
+            }
+    return dict(sorted(snapshot.items(), key=lambda item: item[1]["db_time_ms"], reverse=True))
+
+
+def reset_route_stats() -> None:
+    with _route_lock:
+        _route_stats.clear()
@@ -0,0 +1,72 @@
+"""
+Static serving of the upload directory at /uploads.
+
+Stored uploads never change content under a given name: originals and
+avatar variants live at content-addressed paths (``ab/cd/<sha256>...``, see
+``file_handler.content_path``) and older uploads under unique uuid4 names.
+``UploadFiles`` therefore marks those responses ``immutable`` for a year, so
+kiosks load each photo or deck once and never revalidate it. Content-addressed
+files get their SHA-256 as a strong ETag. Other files (such as rendered slide
+images, which are regenerated in place) are sent with ``no-cache`` and
+revalidated by ETag, which costs a 304.
+
+Range requests (video / PDF seeking, resumed downloads) are handled by
+Starlette's ``FileResponse``, which also hands the file to the server for
+zero-copy sending where the ASGI server supports ``http.response.pathsend``.
+Behind nginx, set ``UPLOADS_ACCEL_REDIRECT`` to an ``internal`` location
+aliased to the upload directory and the response is only headers plus
+``X-Accel-Redirect``, so nginx sends the file with sendfile.
+"""
+import os
+import re
+from pathlib import PurePath
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.datastructures import Headers
+from starlette.types import Scope
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# <sha256>[-<variant>].<ext>: content-addressed original or derived avatar
+CONTENT_ADDRESSED_NAME = re.compile(r"^(?P<digest>[0-9a-f]{64}(?:-\d+)?)\.\w+$")
+UUID_NAME = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.\w+$")
+
+
+def cache_headers(filename: str) -> dict:
+    """Cache-Control (and ETag, when the name is the content hash) for a stored file name."""
+    match = CONTENT_ADDRESSED_NAME.match(filename)
+    if match:
+        return {"cache-control": IMMUTABLE, "etag": f'"{match.group("digest")}"'}
+    if UUID_NAME.match(filename):
+        return {"cache-control": IMMUTABLE}
+    return {"cache-control": REVALIDATE}
+
+
+class UploadFiles(StaticFiles):
+    """``StaticFiles`` for the upload directory with cache headers and optional nginx offload."""
+
+    def __init__(self, *, directory: str, accel_redirect: str = "", **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.root = os.path.realpath(directory)
+        self.accel_redirect = accel_redirect.rstrip("/")
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        # Temporary files (.incoming/, .<name>.tmp) are never served
+        if any(part.startswith(".") for part in PurePath(path).parts):
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        headers = cache_headers(PurePath(full_path).name)
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        if self.accel_redirect:
+            relative = PurePath(os.path.relpath(full_path, self.root)).as_posix()
+            # nginx serves the body (and any Range) and keeps these headers
+            headers = {key: value for key, value in response.headers.items() if key not in ("content-length", "accept-ranges")}
+            headers["x-accel-redirect"] = f"{self.accel_redirect}/{relative}"
+            return Response(status_code=status_code, headers=headers, media_type=response.media_type)
+        return response
@@ -0,0 +1 @@
+# Ingest benchmarks (run from the backend directory: python -m benchmarks.<module>)
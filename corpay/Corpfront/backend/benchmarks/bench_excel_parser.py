@@ -0,0 +1,173 @@
+"""
+Parse-time and peak-RSS benchmark for ExcelParser.parse_revenue_file.
+
+Compares the current single-handle, column-pruned streaming parser against the
+previous approach (one ``pd.read_excel`` per sheet, all columns), with and
+without the optional calamine reader. Each measurement runs in a fresh process
+so peak RSS is not polluted by earlier runs.
+
+The ``employee_normalization`` section times only the row-normalization step
+(sheet already in memory): the old ``iterrows`` loop against the vectorized
+``ExcelParser.normalize_employees``.
+
+    python -m benchmarks.bench_excel_parser --rows 100000
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.workbooks import employee_workbook, revenue_workbook
+
+
+def _legacy_parse_revenue(file_path: str) -> int:
+    """Reproduces the pre-optimization read pattern (re-opens the workbook per sheet)."""
+    excel_file = pd.ExcelFile(file_path)
+    rows = len(pd.read_excel(file_path, sheet_name=0))
+    for sheet in excel_file.sheet_names:
+        if "trend" in sheet.lower() or "proportion" in sheet.lower():
+            df = pd.read_excel(file_path, sheet_name=sheet)
+            rows += sum(1 for _ in df.iterrows())
+    return rows
+
+
+def _current_parse_revenue(file_path: str) -> int:
+    from app.services.excel_parser import ExcelParser
+    data = ExcelParser.parse_revenue_file(file_path)
+    return len(data["revenue_trends"]) + len(data["revenue_proportions"])
+
+
+def _current_parse_revenue_openpyxl(file_path: str) -> int:
+    """Current parser with calamine disabled, to separate its gain from pruning."""
+    from app.services import excel_parser
+    excel_parser.python_calamine = None
+    return _current_parse_revenue(file_path)
+
+
+def _legacy_normalize_employees(df: pd.DataFrame, date_col) -> list:
+    """The pre-vectorization per-row loop from parse_employee_file."""
+    color_map = {
+        "anniversary": {"border": "#981239", "background": "#fef5f8"},
+        "birthday": {"border": "#BE1549", "background": "#fff5f9"},
+        "promotion": {"border": "#981239", "background": "#fef5f8"},
+        "new_hire": {"border": "#0085C2", "background": "#f0f9fd"},
+    }
+    employees = []
+    for _, row in df.iterrows():
+        milestone_type = str(row.get('Milestone Type', row.get('milestone_type', 'anniversary'))).lower()
+        department = str(row.get('Department', row.get('department', '')))
+        colors = color_map.get(milestone_type, {"border": "#981239", "background": "#fef5f8"})
+        employees.append({
+            "name": str(row.get('Name', row.get('name', ''))),
+            "description": str(row.get('Description', row.get('description', ''))),
+            "milestone_type": milestone_type,
+            "department": department if department else None,
+            "milestone_date": pd.to_datetime(row[date_col]) if date_col else time.time(),
+            "border_color": colors["border"],
+            "background_color": colors["background"],
+        })
+    return employees
+
+
+def measure_employee_normalization(file_path: str) -> dict:
+    from app.services.excel_parser import ExcelParser, ExcelWorkbook, _resolve_employee_date_column
+
+    with ExcelWorkbook(file_path) as workbook:
+        df = workbook.read(0)
+    date_col = _resolve_employee_date_column(list(df.columns))
+    # Warm up both paths so one-off import/dispatch costs are not attributed to either
+    _legacy_normalize_employees(df.head(10), date_col)
+    ExcelParser.normalize_employees(df.head(10), date_col)
+
+    start = time.perf_counter()
+    legacy_rows = len(_legacy_normalize_employees(df, date_col))
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    current_rows = len(ExcelParser.normalize_employees(df, date_col)["rows"])
+    current_seconds = time.perf_counter() - start
+
+    return {
+        "rows": current_rows,
+        "legacy_seconds": round(legacy_seconds, 3),
+        "current_seconds": round(current_seconds, 3),
+        "speedup": round(legacy_seconds / max(current_seconds, 1e-9), 1),
+        "rows_match": legacy_rows == current_rows,
+    }
+
+
+def peak_rss_mb() -> float:
+    # VmHWM is per address space; ru_maxrss survives exec and would report the parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(target, file_path: str, queue) -> None:
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+    rows = target(file_path)
+    queue.put({
+        "seconds": round(time.perf_counter() - start, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - baseline_rss, 1),
+        "rows": rows,
+    })
+
+
+def measure_in_subprocess(target, file_path: str) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(target, file_path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--output", help="Write the JSON report here as well as stdout")
+    args = parser.parse_args(argv)
+
+    from app.services.excel_parser import python_calamine
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = revenue_workbook(Path(tmp) / "revenue.xlsx", args.rows)
+        report = {
+            "rows": args.rows,
+            "engine": "calamine" if python_calamine is not None else "openpyxl",
+            "file_size_mb": round(path.stat().st_size / (1024 * 1024), 2),
+            "legacy": measure_in_subprocess(_legacy_parse_revenue, str(path)),
+            "current": measure_in_subprocess(_current_parse_revenue, str(path)),
+            "current_openpyxl": measure_in_subprocess(_current_parse_revenue_openpyxl, str(path)),
+        }
+        employee_path = employee_workbook(Path(tmp) / "employees.xlsx", args.rows)
+        report["employee_normalization"] = measure_employee_normalization(str(employee_path))
+    report["speedup"] = round(report["legacy"]["seconds"] / max(report["current"]["seconds"], 1e-9), 2)
+    report["peak_rss_saved_mb"] = round(
+        report["legacy"]["peak_rss_mb"] - report["current"]["peak_rss_mb"], 1
+    )
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Ingest benchmark suite: every ExcelParser.parse_* method and every upload endpoint.
+
+Generates synthetic revenue, payments, system performance and employee
+workbooks at each requested size and measures, per target, wall time, peak
+RSS and rows/sec. Parser targets run in a fresh process each. Upload targets
+post the workbook with ``?wait=true`` to the real app (TestClient) backed by
+a throwaway SQLite database, so the time covers receiving, parsing in the
+ingest worker and writing; the worker's peak RSS is reported separately.
+
+    python -m benchmarks.bench_ingest --sizes 1000,10000,100000 --output ingest.json
+
+Generating the 1M-row workbooks takes several minutes; pass ``--cache-dir``
+to keep them between runs.
+"""
+import argparse
+import functools
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_excel_parser import measure_in_subprocess, peak_rss_mb
+from benchmarks.workbooks import GENERATORS
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+PARSERS = {
+    "revenue": ["parse_revenue_file"],
+    "payments": ["parse_payments_file", "parse_payments_history"],
+    "system_performance": ["parse_system_performance_file"],
+    "employees": ["parse_employee_file"],
+}
+
+UPLOADS = {
+    "revenue": ["/api/admin/revenue/upload"],
+    "payments": ["/api/admin/payments/upload?mode=latest", "/api/admin/payments/upload?mode=history"],
+    "system_performance": ["/api/admin/system/upload"],
+    "employees": ["/api/admin/employees/upload"],
+}
+
+
+def _parse(method: str, file_path: str) -> None:
+    from app.services.excel_parser import ExcelParser
+    getattr(ExcelParser, method)(file_path)
+
+
+def _children_peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure_upload(url: str, file_path: str, work_dir: str, queue) -> None:
+    # Point the app at a throwaway database and upload directory before it is imported
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(work_dir) / 'bench.db'}"
+    os.environ["UPLOAD_DIR"] = str(Path(work_dir) / "uploads")
+    os.environ["MAX_FILE_SIZE_MB"] = str(1024 * 1024)
+    os.environ["INGEST_WORKERS"] = "1"
+
+    from fastapi.testclient import TestClient
+    from app.database import Base, engine
+    from app.main import app
+    from app.models.user import User
+    from app.services import ingest
+    from app.utils.auth import get_current_admin_user
+
+    Base.metadata.create_all(engine)
+    app.dependency_overrides[get_current_admin_user] = lambda: User(email="bench@example.com", is_admin=1)
+    separator = "&" if "?" in url else "?"
+
+    with TestClient(app) as client:
+        # Start the ingest worker and import the parser in it before timing
+        ingest._get_executor().submit(ingest._no_progress, "warm-up").result()
+        with open(file_path, "rb") as f:
+            baseline_rss = peak_rss_mb()
+            start = time.perf_counter()
+            response = client.post(
+                f"{url}{separator}wait=true",
+                files={"file": (Path(file_path).name, f, "application/octet-stream")},
+            )
+            seconds = time.perf_counter() - start
+        ingest._executor.shutdown(wait=True)
+        ingest._executor = None
+
+    result = {
+        "seconds": round(seconds, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - baseline_rss, 1),
+        "worker_peak_rss_mb": round(_children_peak_rss_mb(), 1),
+        "status_code": response.status_code,
+    }
+    if response.status_code != 200:
+        result["error"] = response.text[:500]
+    queue.put(result)
+
+
+def measure_upload(url: str, file_path: str) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    with tempfile.TemporaryDirectory() as work_dir:
+        proc = ctx.Process(target=_measure_upload, args=(url, file_path, work_dir, queue))
+        proc.start()
+        result = queue.get()
+        proc.join()
+    return result
+
+
+def _run(kind: str, target: str, rows: int, path: Path, measure) -> dict:
+    entry = {"kind": kind, "target": target, "rows": rows,
+             "file_size_mb": round(path.stat().st_size / (1024 * 1024), 2)}
+    try:
+        result = measure()
+    except Exception as e:  # keep going: one failing size should not lose the rest of the report
+        entry["error"] = f"{type(e).__name__}: {e}"
+        return entry
+    result.pop("rows", None)  # the parser's return value; throughput is per input row
+    entry.update(result)
+    if entry.get("seconds") and "error" not in entry:
+        entry["rows_per_sec"] = round(rows / entry["seconds"], 1)
+    print(json.dumps(entry), file=sys.stderr)
+    return entry
+
+
+def workbook(kind: str, rows: int, directory: Path) -> Path:
+    path = directory / f"{kind}-{rows}.xlsx"
+    if not path.exists():
+        GENERATORS[kind](path, rows)
+    return path
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated row counts")
+    parser.add_argument("--kinds", default=",".join(GENERATORS), help="Comma-separated workbook kinds")
+    parser.add_argument("--skip-uploads", action="store_true", help="Only benchmark the parsers")
+    parser.add_argument("--cache-dir", help="Keep generated workbooks here and reuse them")
+    parser.add_argument("--output", help="Write the JSON report here as well as stdout")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    kinds = [k for k in args.kinds.split(",") if k]
+
+    from app.services.excel_parser import python_calamine
+
+    report = {
+        "engine": "calamine" if python_calamine is not None else "openpyxl",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "sizes": sizes,
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(args.cache_dir or tmp)
+        directory.mkdir(parents=True, exist_ok=True)
+        for kind in kinds:
+            for rows in sizes:
+                path = workbook(kind, rows, directory)
+                for method in PARSERS[kind]:
+                    target = functools.partial(_parse, method)
+                    measure = functools.partial(measure_in_subprocess, target, str(path))
+                    report["results"].append(_run(kind, f"ExcelParser.{method}", rows, path, measure))
+                if args.skip_uploads:
+                    continue
+                for url in UPLOADS[kind]:
+                    measure = functools.partial(measure_upload, url, str(path))
+                    report["results"].append(_run(kind, f"POST {url}", rows, path, measure))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
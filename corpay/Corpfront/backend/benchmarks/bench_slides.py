@@ -0,0 +1,147 @@
+"""
+PDF slide rendering benchmark: how render time scales with PDF_RENDER_WORKERS.
+
+Generates a synthetic deck (text, vector shapes and a photo-like image on
+every page) and renders it with ``slide_renderer.render_deck`` once per
+worker count, each in a fresh process pointed at a throwaway upload
+directory. The pool is started before timing (its startup is reported
+separately), so ``seconds`` is the rasterization itself. Peak RSS is
+reported for the parent and, separately, for the largest worker.
+
+    python -m benchmarks.bench_slides --pages 60 --workers 1,2,4,8 --output slides.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_excel_parser import peak_rss_mb
+
+
+def _children_peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def make_deck(path: Path, pages: int) -> None:
+    """A landscape deck whose pages cost about as much to rasterize as real slides."""
+    import fitz  # PyMuPDF
+
+    width, height = 640, 400
+    samples = bytes(
+        channel for y in range(height) for x in range(width)
+        for channel in ((x * 7 + y) % 256, (x + y * 3) % 256, (x * y) % 256)
+    )
+    image = fitz.Pixmap(fitz.csRGB, width, height, samples, False).tobytes("png")
+
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page(width=960, height=540)
+        page.insert_text((48, 72), f"Quarterly review - slide {n + 1}", fontsize=32)
+        for line in range(12):
+            page.insert_text((48, 120 + line * 26), f"Bullet point {line + 1}: revenue, payments and uptime", fontsize=16)
+        for bar in range(10):
+            bar_height = 40 + (n * 13 + bar * 29) % 200
+            page.draw_rect(fitz.Rect(520 + bar * 20, 500 - bar_height, 536 + bar * 20, 500), color=(0, 0.3, 0.6), fill=(0.2, 0.5, 0.8))
+        page.insert_image(fitz.Rect(540, 40, 920, 277), stream=image)
+    doc.save(str(path))
+    doc.close()
+
+
+def _measure(deck: str, workers: int, work_dir: str, queue) -> None:
+    # Point the app at a throwaway upload directory before it is imported
+    os.environ["UPLOAD_DIR"] = str(Path(work_dir) / "uploads")
+    os.environ["PDF_RENDER_WORKERS"] = str(workers)
+
+    from app.services import slide_renderer
+
+    upload_dir = Path(os.environ["UPLOAD_DIR"])
+    upload_dir.mkdir(parents=True)
+    shutil.copy(deck, upload_dir / "deck.pdf")
+
+    start = time.perf_counter()
+    if workers > 1:
+        list(slide_renderer._get_executor().map(abs, range(workers)))  # Spawn every worker before timing
+    pool_start = time.perf_counter() - start
+
+    progress = {}
+    start = time.perf_counter()
+    slides = slide_renderer.render_deck("deck.pdf", progress)
+    seconds = time.perf_counter() - start
+    if slide_renderer._executor is not None:
+        slide_renderer._executor.shutdown(wait=True)  # Reap the workers so their peak RSS is counted
+        slide_renderer._executor = None
+
+    queue.put({
+        "seconds": round(seconds, 3),
+        "pool_start_seconds": round(pool_start, 3),
+        "slides": len(slides),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "worker_peak_rss_mb": round(_children_peak_rss_mb(), 1) if workers > 1 else None,
+    })
+
+
+def measure(deck: str, workers: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    with tempfile.TemporaryDirectory() as work_dir:
+        proc = ctx.Process(target=_measure, args=(deck, workers, work_dir, queue))
+        proc.start()
+        result = queue.get()
+        proc.join()
+    return result
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=60, help="Pages in the synthetic deck")
+    parser.add_argument("--workers", default=",".join(str(w) for w in sorted({1, 2, 4, os.cpu_count() or 1})),
+                        help="Comma-separated PDF_RENDER_WORKERS values")
+    parser.add_argument("--deck", help="Render this PDF instead of a synthetic deck")
+    parser.add_argument("--output", help="Write the JSON report here as well as stdout")
+    args = parser.parse_args(argv)
+
+    worker_counts = [int(w) for w in args.workers.split(",") if w]
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        deck = Path(args.deck) if args.deck else Path(tmp) / f"deck-{args.pages}.pdf"
+        if not args.deck:
+            make_deck(deck, args.pages)
+        report["deck_size_mb"] = round(deck.stat().st_size / (1024 * 1024), 2)
+
+        baseline = None
+        for workers in worker_counts:
+            entry = {"workers": workers}
+            try:
+                entry.update(measure(str(deck), workers))
+            except Exception as e:  # keep going: one failing run should not lose the rest of the report
+                entry["error"] = f"{type(e).__name__}: {e}"
+            else:
+                entry["pages_per_sec"] = round(entry["slides"] / entry["seconds"], 1)
+                baseline = baseline or entry["seconds"]
+                entry["speedup"] = round(baseline / entry["seconds"], 2)
+            print(json.dumps(entry), file=sys.stderr)
+            report["results"].append(entry)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
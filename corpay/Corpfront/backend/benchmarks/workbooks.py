@@ -0,0 +1,100 @@
+"""
+Synthetic workbook generators for the ingest benchmarks.
+
+Sheets carry realistic extra columns the parser does not use, so column
+pruning shows up in the numbers.
+"""
+from functools import partial
+from pathlib import Path
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+CATEGORIES = ["Fleet", "Corporate", "Lodging"]
+EXTRA_COLUMNS = 8
+
+
+def _with_extra_columns(df: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    for i in range(EXTRA_COLUMNS):
+        df[f"Notes {i + 1}"] = rng.integers(0, 1_000_000, len(df)).astype(str)
+    return df
+
+
+def revenue_workbook(path: Path, rows: int, seed: int = 0, proportion_rows: Optional[int] = None) -> Path:
+    """
+    Revenue workbook: total sheet, a `rows`-long Trends sheet and a Proportions
+    sheet (`rows` long too unless `proportion_rows` is given).
+    """
+    proportion_rows = rows if proportion_rows is None else proportion_rows
+    rng = np.random.default_rng(seed)
+    total = pd.DataFrame({"Total Revenue": [976_000_000.0], "Percentage Change": [12.5]})
+    trends = _with_extra_columns(pd.DataFrame({
+        "Month": [MONTHS[i % 12] for i in range(rows)],
+        "Value": rng.uniform(50, 120, rows).round(2),
+        "Highlight": rng.random(rows) > 0.9,
+    }), rng)
+    proportions = _with_extra_columns(pd.DataFrame({
+        "Category": [CATEGORIES[i % 3] for i in range(proportion_rows)],
+        "Percentage": rng.uniform(0, 100, proportion_rows).round(2),
+    }), rng)
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        total.to_excel(writer, sheet_name="Total", index=False)
+        trends.to_excel(writer, sheet_name="Trends", index=False)
+        proportions.to_excel(writer, sheet_name="Proportions", index=False)
+    return path
+
+
+MILESTONE_TYPES = ["Anniversary", "birthday", "Promotion", "new_hire"]
+DEPARTMENTS = ["Finance", "Engineering", "Sales", "Operations", None]
+
+
+def employee_workbook(path: Path, rows: int, seed: int = 0) -> Path:
+    """Employee milestone workbook with `rows` rows."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D")
+    df = _with_extra_columns(pd.DataFrame({
+        "Name": [f"Employee {i}" for i in range(rows)],
+        "Description": [f"Milestone {i}" for i in range(rows)],
+        "Department": [DEPARTMENTS[i % len(DEPARTMENTS)] for i in range(rows)],
+        "Milestone Type": [MILESTONE_TYPES[i % len(MILESTONE_TYPES)] for i in range(rows)],
+        "Milestone Date": dates,
+    }), rng)
+    df.to_excel(path, index=False, engine="openpyxl")
+    return path
+
+
+def payments_workbook(path: Path, rows: int, seed: int = 0) -> Path:
+    """Payments workbook with `rows` transactions-per-batch rows spread over ten years of dates."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2016-01-01") + pd.to_timedelta(rng.integers(0, 3650, rows), unit="D")
+    df = _with_extra_columns(pd.DataFrame({
+        "Date": dates,
+        "Amount Processed": rng.uniform(1_000, 5_000_000, rows).round(2),
+        "Transaction Count": rng.integers(1, 50_000, rows),
+    }), rng)
+    df.to_excel(path, index=False, engine="openpyxl")
+    return path
+
+
+def system_performance_workbook(path: Path, rows: int, seed: int = 0) -> Path:
+    """System performance workbook with `rows` uptime / success-rate samples."""
+    rng = np.random.default_rng(seed)
+    df = _with_extra_columns(pd.DataFrame({
+        "Timestamp": pd.Timestamp("2024-01-01") + pd.to_timedelta(np.arange(rows), unit="min"),
+        "Uptime Percentage": rng.uniform(99.0, 100.0, rows).round(3),
+        "Success Rate": rng.uniform(95.0, 100.0, rows).round(3),
+    }), rng)
+    df.to_excel(path, index=False, engine="openpyxl")
+    return path
+
+
+# Generators for the ingest suite. Revenue uploads store one row per category,
+# so the Proportions sheet keeps the real three; Trends carries the row count.
+GENERATORS = {
+    "revenue": partial(revenue_workbook, proportion_rows=len(CATEGORIES)),
+    "payments": payments_workbook,
+    "system_performance": system_performance_workbook,
+    "employees": employee_workbook,
+}
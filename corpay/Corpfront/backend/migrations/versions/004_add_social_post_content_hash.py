@@ -0,0 +1,53 @@
+"""add content_hash to social_posts for LinkedIn sync upserts
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import hashlib
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def _content_hash(post_type, content):
+    # Must match app.services.linkedin_sync.post_content_hash
+    normalized = " ".join((content or "").split())
+    return hashlib.sha256(f"{post_type}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column('social_posts', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # Backfill hashes for previously synced posts so the next sync updates them
+    # instead of inserting copies. When duplicates already exist, only the
+    # oldest row gets the hash; the others keep NULL (allowed by the unique index).
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, post_type, content FROM social_posts "
+        "WHERE source IS NULL OR source = 'api' ORDER BY id"
+    )).fetchall()
+    seen = set()
+    for row in rows:
+        content_hash = _content_hash(row.post_type, row.content)
+        if content_hash in seen:
+            continue
+        seen.add(content_hash)
+        conn.execute(
+            sa.text("UPDATE social_posts SET content_hash = :h WHERE id = :id"),
+            {"h": content_hash, "id": row.id},
+        )
+
+    op.create_index('ix_social_posts_content_hash', 'social_posts', ['content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_social_posts_content_hash', table_name='social_posts')
+    op.drop_column('social_posts', 'content_hash')
@@ -0,0 +1,41 @@
+"""add natural-key unique index to employee_milestones
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Earlier uploads appended every row, so collapse existing duplicates first,
+    # keeping the most recently inserted row for each (name, type, date).
+    op.execute("""
+        DELETE FROM employee_milestones
+        WHERE id NOT IN (
+            SELECT keep_id FROM (
+                SELECT MAX(id) AS keep_id
+                FROM employee_milestones
+                GROUP BY name, milestone_type, milestone_date
+            ) AS keepers
+        )
+    """)
+
+    op.create_index(
+        'uq_employee_milestones_natural_key',
+        'employee_milestones',
+        ['name', 'milestone_type', 'milestone_date'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_employee_milestones_natural_key', table_name='employee_milestones')
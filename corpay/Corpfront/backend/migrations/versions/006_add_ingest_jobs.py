@@ -0,0 +1,48 @@
+"""add ingest_jobs table for background upload processing
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingest_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('file_upload_id', sa.Integer(), nullable=False),
+        sa.Column('file_type', sa.String(length=50), nullable=False),
+        sa.Column('options', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('stage', sa.String(length=50), nullable=True),
+        sa.Column('rows_parsed', sa.Integer(), nullable=True),
+        sa.Column('rows_written', sa.Integer(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['file_upload_id'], ['file_uploads.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_ingest_jobs_file_upload_id', 'ingest_jobs', ['file_upload_id'])
+    op.create_index('ix_ingest_jobs_status', 'ingest_jobs', ['status'])
+    op.create_index('ix_ingest_jobs_created_at', 'ingest_jobs', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ingest_jobs_created_at', table_name='ingest_jobs')
+    op.drop_index('ix_ingest_jobs_status', table_name='ingest_jobs')
+    op.drop_index('ix_ingest_jobs_file_upload_id', table_name='ingest_jobs')
+    op.drop_table('ingest_jobs')
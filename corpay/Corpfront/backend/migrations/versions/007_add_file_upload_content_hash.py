@@ -0,0 +1,39 @@
+"""add content_hash to file_uploads and a slideshow file type
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('file_uploads', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_file_uploads_content_hash', 'file_uploads', ['content_hash'])
+
+    # Slideshow decks were recorded as EMPLOYEE_DATA for lack of a type.
+    # SQLAlchemy stores enum member names; ADD VALUE must run outside a transaction.
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE filetype ADD VALUE IF NOT EXISTS 'SLIDESHOW'")
+        op.execute("""
+            UPDATE file_uploads SET file_type = 'SLIDESHOW'
+            WHERE file_type = 'EMPLOYEE_DATA' AND stored_path LIKE 'slideshow/%'
+        """)
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop an enum value; map slideshow rows back to the old placeholder
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("UPDATE file_uploads SET file_type = 'EMPLOYEE_DATA' WHERE file_type = 'SLIDESHOW'")
+    op.drop_index('ix_file_uploads_content_hash', table_name='file_uploads')
+    op.drop_column('file_uploads', 'content_hash')
@@ -0,0 +1,33 @@
+"""add column_mappings table caching resolved upload layouts
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'column_mappings',
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('header', sa.Text(), nullable=False),
+        sa.Column('mapping', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('fingerprint'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('column_mappings')
@@ -0,0 +1,29 @@
+"""add row_key / row_fingerprint to employee_milestones for delta uploads
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing rows: the next upload of the sheet fills them in
+    op.add_column('employee_milestones', sa.Column('row_key', sa.String(length=64), nullable=True))
+    op.add_column('employee_milestones', sa.Column('row_fingerprint', sa.String(length=64), nullable=True))
+    op.create_index('ix_employee_milestones_row_key', 'employee_milestones', ['row_key'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_employee_milestones_row_key', table_name='employee_milestones')
+    op.drop_column('employee_milestones', 'row_fingerprint')
+    op.drop_column('employee_milestones', 'row_key')
@@ -0,0 +1,47 @@
+"""add stored_files table reference-counting content-addressed uploads
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stored_files',
+        sa.Column('path', sa.String(length=500), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('size', sa.Integer(), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('last_referenced_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('path'),
+    )
+    op.create_index('ix_stored_files_content_hash', 'stored_files', ['content_hash'])
+
+    # Count the references to files stored before content addressing
+    op.execute("""
+        INSERT INTO stored_files (path, content_hash, size, ref_count)
+        SELECT path, MAX(content_hash), MAX(size), COUNT(*)
+        FROM (
+            SELECT stored_path AS path, content_hash, file_size AS size FROM file_uploads
+            UNION ALL
+            SELECT avatar_path, NULL, NULL FROM employee_milestones WHERE avatar_path IS NOT NULL
+        ) AS refs
+        GROUP BY path
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stored_files_content_hash', table_name='stored_files')
+    op.drop_table('stored_files')
@@ -0,0 +1,25 @@
+"""add avatar_variants to employee_milestones
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing rows: variants are rendered on the next photo upload or milestone update
+    op.add_column('employee_milestones', sa.Column('avatar_variants', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('employee_milestones', 'avatar_variants')
@@ -0,0 +1,53 @@
+"""add upload_sessions / upload_chunks for resumable chunked uploads
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'upload_sessions',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('file_type', sa.String(length=50), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('chunk_size', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('error_message', sa.String(length=500), nullable=True),
+        sa.Column('file_upload_id', sa.Integer(), nullable=True),
+        sa.Column('uploaded_by', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['file_upload_id'], ['file_uploads.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_upload_sessions_status', 'upload_sessions', ['status'])
+    op.create_table(
+        'upload_chunks',
+        sa.Column('upload_id', sa.String(length=36), nullable=False),
+        sa.Column('index', sa.Integer(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['upload_id'], ['upload_sessions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('upload_id', 'index'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('upload_chunks')
+    op.drop_index('ix_upload_sessions_status', table_name='upload_sessions')
+    op.drop_table('upload_sessions')
@@ -0,0 +1,25 @@
+"""add heartbeat_at to ingest_jobs
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing rows: running jobs without a heartbeat are judged by started_at
+    op.add_column('ingest_jobs', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ingest_jobs', 'heartbeat_at')
@@ -0,0 +1,115 @@
+"""
+Move uploads stored before content addressing into the content-addressed store.
+
+Every file referenced by file_uploads.stored_path or employee_milestones.avatar_path
+that is not yet at ab/cd/<sha256><ext> is hashed and moved there (identical
+files collapse into one), the rows are repointed, and the old path is kept
+as a hard link to the stored object so URLs handed out before still work.
+Reference counts in stored_files are then recomputed from the rows.
+
+    python scripts/dedupe_uploads.py [--dry-run]
+"""
+import argparse
+import hashlib
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+_here = os.path.dirname(os.path.abspath(__file__))
+_backend = os.path.dirname(_here)
+sys.path.insert(0, _backend)
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.employees import EmployeeMilestone
+from app.models.file_upload import FileUpload
+from app.models.stored_file import StoredFile
+from app.utils.bulk import bulk_upsert
+from app.utils.file_handler import COPY_CHUNK_SIZE, content_path
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(COPY_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def move_to_store(upload_dir: Path, legacy_path: str, content_hash: str, dry_run: bool) -> str:
+    """Store the file at ``legacy_path`` content-addressed, leaving a hard link behind; returns the new path."""
+    new_path = content_path(content_hash, legacy_path)
+    source, target = upload_dir / legacy_path, upload_dir / new_path
+    if dry_run:
+        return new_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not target.exists():
+        os.link(source, target)  # The legacy path and the stored object are now the same file
+        return new_path
+    if os.path.samefile(source, target):
+        return new_path
+    # Replace the legacy file with a link to the stored object (atomically, via a temporary name)
+    temp = source.with_name(f".{source.name}.link")
+    os.link(target, temp)
+    os.replace(temp, source)
+    return new_path
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without moving anything")
+    args = parser.parse_args(argv)
+
+    upload_dir = Path(settings.upload_dir)
+    db = SessionLocal()
+    try:
+        rows = [(row, "stored_path") for row in db.query(FileUpload).all()]
+        rows += [(row, "avatar_path") for row in db.query(EmployeeMilestone).filter(EmployeeMilestone.avatar_path.isnot(None))]
+
+        moved, missing, sizes = {}, set(), {}
+        for row, column in rows:
+            legacy_path = getattr(row, column)
+            if legacy_path not in moved and legacy_path not in missing:
+                full_path = upload_dir / legacy_path
+                if not full_path.is_file():
+                    missing.add(legacy_path)
+                    continue
+                content_hash = file_digest(full_path)
+                if content_path(content_hash, legacy_path) == legacy_path:
+                    moved[legacy_path] = legacy_path
+                else:
+                    moved[legacy_path] = move_to_store(upload_dir, legacy_path, content_hash, args.dry_run)
+                sizes[moved[legacy_path]] = (content_hash, full_path.stat().st_size)
+            if legacy_path in moved:
+                setattr(row, column, moved[legacy_path])
+                if column == "stored_path" and row.content_hash is None:
+                    row.content_hash = sizes[moved[legacy_path]][0]
+
+        counts = Counter(getattr(row, column) for row, column in rows)
+        db.query(StoredFile).update({StoredFile.ref_count: 0}, synchronize_session=False)
+        bulk_upsert(
+            db,
+            StoredFile,
+            ({"path": path, "content_hash": sizes.get(path, (None, None))[0],
+              "size": sizes.get(path, (None, None))[1], "ref_count": count} for path, count in counts.items()),
+            conflict_columns=["path"],
+            update_columns=["content_hash", "size", "ref_count"],
+        )
+
+        relocated = sum(1 for old, new in moved.items() if old != new)
+        print(f"{relocated} files moved into the content-addressed store, "
+              f"{len(set(moved.values()))} distinct stored files, {len(missing)} referenced files missing")
+        for path in sorted(missing):
+            print(f"  missing: {path}")
+        if args.dry_run:
+            db.rollback()
+            print("Dry run: nothing changed")
+        else:
+            db.commit()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
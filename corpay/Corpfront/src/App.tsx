@@ -3,7 +3,7 @@ import { Linkedin } from 'lucide-react';
 import { LineChart, Line, BarChart, Bar, PieChart, Pie, Cell, XAxis, YAxis, CartesianGrid, ResponsiveContainer } from 'recharts';
 import { StatCard } from './components/StatCard';
 import { LinkedInPostCard } from './components/LinkedInPostCard';
-import { EmployeeMilestone } from './components/EmployeeMilestone';
+import { EmployeeMilestone, type AvatarSrcSets } from './components/EmployeeMilestone';
 import { CompanyAnnouncement } from './components/CompanyAnnouncement';
 import { NewsroomCard } from './components/NewsroomCard';
 import { ResourceCard } from './components/ResourceCard';
@@ -16,6 +16,17 @@ import axios from 'axios';
 
 const MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
 
+/** Build srcSet strings from the API's avatar_variants ({format: {size: path under /uploads}}). */
+function avatarSrcSets(variants: Record<string, Record<string, string>> | null | undefined): AvatarSrcSets | undefined {
+  if (!variants) return undefined;
+  const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+  const srcSet = (sizes?: Record<string, string>) =>
+    sizes && Object.keys(sizes).length > 0
+      ? Object.entries(sizes).map(([size, path]) => `${API_BASE_URL}/uploads/${path} ${size}w`).join(', ')
+      : undefined;
+  return { webp: srcSet(variants.webp), jpeg: srcSet(variants.jpeg) };
+}
+
 /** Return true only if s looks like a real date; reject junk like "is showing". */
 function isValidDateString(s: string): boolean {
   if (!s || typeof s !== 'string') return false;
@@ -287,6 +298,7 @@ export default function App() {
     name: string;
     description: string;
     avatar: string;
+    avatarSrcSets?: AvatarSrcSets;
     borderColor: string;
     backgroundColor: string;
     emoji?: string;
@@ -548,6 +560,7 @@ export default function App() {
               name: emp.name || '',
               description: emp.description || '',
               avatar: avatarUrl,
+              avatarSrcSets: avatarSrcSets(emp.avatar_variants),
               borderColor: emp.border_color || '#981239',
               backgroundColor: emp.background_color || '#fef5f8',
               emoji: MILESTONE_EMOJI[emp.milestone_type] || '🎉'
@@ -918,6 +931,7 @@ export default function App() {
               name: emp.name || '',
               description: emp.description || '',
               avatar: avatarUrl,
+              avatarSrcSets: avatarSrcSets(emp.avatar_variants),
               borderColor: emp.border_color || '#981239',
               backgroundColor: emp.background_color || '#fef5f8',
               emoji: MILESTONE_EMOJI[emp.milestone_type] || '🎉'
@@ -1309,6 +1323,7 @@ export default function App() {
                     name={milestone.name}
                     description={milestone.description}
                     avatar={milestone.avatar}
+                    avatarSrcSets={milestone.avatarSrcSets}
                     borderColor={milestone.borderColor}
                     backgroundColor={milestone.backgroundColor}
                     emoji={milestone.emoji}
@@ -1,15 +1,22 @@
 import { ImageWithFallback } from './figma/ImageWithFallback';
 
+/** `srcSet` strings of the photo's resized variants, per format (see avatarSrcSets in App.tsx). */
+export interface AvatarSrcSets {
+  webp?: string;
+  jpeg?: string;
+}
+
 interface EmployeeMilestoneProps {
   name: string;
   description: string;
   avatar: string;
+  avatarSrcSets?: AvatarSrcSets;
   borderColor: string;
   backgroundColor: string;
   emoji?: string;
 }
 
-export function EmployeeMilestone({ name, description, avatar, borderColor, backgroundColor, emoji = '🎉' }: EmployeeMilestoneProps) {
+export function EmployeeMilestone({ name, description, avatar, avatarSrcSets, borderColor, backgroundColor, emoji = '🎉' }: EmployeeMilestoneProps) {
   return (
     <div 
       className="flex items-center gap-4 p-4 rounded-xl relative overflow-hidden"
@@ -21,11 +28,17 @@ export function EmployeeMilestone({ name, description, avatar, borderColor, back
     >
       
       <div className="relative">
-        <ImageWithFallback 
-          src={avatar} 
-          alt={name}
-          className="w-14 h-14 rounded-full object-cover ring-2 ring-white shadow-md"
-        />
+        {/* 56px circle: the browser picks the 64px variant, or 128px on high-DPI screens */}
+        <picture>
+          {avatarSrcSets?.webp && <source type="image/webp" srcSet={avatarSrcSets.webp} sizes="56px" />}
+          <ImageWithFallback 
+            src={avatar} 
+            srcSet={avatarSrcSets?.jpeg}
+            sizes={avatarSrcSets?.jpeg ? '56px' : undefined}
+            alt={name}
+            className="w-14 h-14 rounded-full object-cover ring-2 ring-white shadow-md"
+          />
+        </picture>
         {/* Badge indicator */}
         <div 
           className="absolute -bottom-0.5 -right-0.5 w-4 h-4 rounded-full border-2 border-white"
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import JSZip from 'jszip';
 import axios from 'axios';
 
@@ -37,8 +37,18 @@ export function FullScreenSlideshow({ fileUrl, intervalSeconds = 5, onClose }: F
 
   const intervalSec = Math.max(1, Math.min(300, Number(intervalSeconds) || 5));
 
+  const pollTimer = useRef<ReturnType<typeof setTimeout> | null>(null);
+  const streamAbort = useRef<AbortController | null>(null);
+  const [progress, setProgress] = useState<string | null>(null);
+
   useEffect(() => {
-    loadSlides();
+    streamSlides().then((streamed) => {
+      if (!streamed) loadSlides();
+    });
+    return () => {
+      if (pollTimer.current) clearTimeout(pollTimer.current);
+      streamAbort.current?.abort();
+    };
   }, [fileUrl]);
 
   // Show "taking longer" hint after 12 seconds
@@ -58,19 +68,85 @@ export function FullScreenSlideshow({ fileUrl, intervalSeconds = 5, onClose }: F
     return () => clearInterval(timer);
   }, [slides.length, intervalSec]);
 
-  const loadSlides = async () => {
+  // Use empty string so /api goes through Vite proxy to backend (avoids CORS)
+  const API_BASE = import.meta.env.VITE_API_URL || '';
+
+  // Receive slides as the server renders them (newline-delimited JSON), so the show starts with
+  // the first slide. Resolves false if streaming is unavailable or the stream ended early; the
+  // caller then falls back to polling loadSlides.
+  const streamSlides = async (): Promise<boolean> => {
+    setLoading(true);
+    setError(null);
+    setLoadingSlow(false);
+    setProgress(null);
+    const controller = new AbortController();
+    streamAbort.current = controller;
+    try {
+      const response = await fetch(`${API_BASE}/api/dashboard/slideshow/slides/stream`, { signal: controller.signal });
+      if (!response.ok || !response.body) return false;
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffered = '';
+      let received: string[] = [];
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) return false;
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split('\n');
+        buffered = lines.pop() ?? '';
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const update = JSON.parse(line);
+          if (update.status === 'failed') {
+            setError(String(update.error));
+            setLoading(false);
+            return true;
+          }
+          if (update.slides?.length) {
+            received = [...received.slice(0, update.offset), ...update.slides];
+            setSlides(received);
+            if (update.offset === 0) setCurrentIndex(0);
+            setLoading(false);
+          }
+          if (update.total) setProgress(`Rendering slides, ${update.done} of ${update.total} done`);
+          if (update.status === 'ready') {
+            console.log('[Slideshow] ✅ Streamed', received.length, 'slides from backend');
+            return received.length > 0;
+          }
+        }
+      }
+    } catch (err: any) {
+      if (controller.signal.aborted) return true;
+      console.warn('[Slideshow] Slide stream failed, polling instead:', err);
+      return false;
+    }
+  };
+
+  const loadSlides = async (polling = false) => {
     try {
-      setLoading(true);
-      setError(null);
-      setLoadingSlow(false);
+      if (!polling) {
+        setLoading(true);
+        setError(null);
+        setLoadingSlow(false);
+        setProgress(null);
+      }
       console.log('[Slideshow] Loading slides from backend...');
 
-      // Use empty string so /api goes through Vite proxy to backend (avoids CORS)
-      const API_BASE = import.meta.env.VITE_API_URL || '';
       const slidesUrl = API_BASE ? `${API_BASE}/api/dashboard/slideshow/slides` : '/api/dashboard/slideshow/slides';
-      const response = await axios.get(slidesUrl, { timeout: 120000 });
+      const response = await axios.get(slidesUrl, { timeout: 30000 });
       console.log('[Slideshow] Backend response:', response.data);
 
+      // 202: the server is still rendering the deck; show the slides rendered so far and poll until all are ready
+      if (response.status === 202) {
+        setProgress(response.data.message ?? null);
+        if (response.data.slides?.length) {
+          setSlides(response.data.slides);
+          setLoading(false);
+        }
+        pollTimer.current = setTimeout(() => loadSlides(true), 2000);
+        return;
+      }
+
       if (response.data.slides && Array.isArray(response.data.slides) && response.data.slides.length > 0) {
         console.log('[Slideshow] ✅ Loaded', response.data.slides.length, 'slides from backend');
         setSlides(response.data.slides);
@@ -92,7 +168,10 @@ export function FullScreenSlideshow({ fileUrl, intervalSeconds = 5, onClose }: F
     return (
       <div style={loadingScreenStyle}>
         <div>Loading presentation...</div>
-        {loadingSlow && (
+        {progress && (
+          <div style={{ marginTop: 12, fontSize: 16, color: '#ccc' }}>{progress}</div>
+        )}
+        {loadingSlow && !progress && (
           <div style={{ marginTop: 16, fontSize: 14, color: '#aaa', textAlign: 'center', maxWidth: 320 }}>
             Taking longer than usual. The server may be converting the file.
             <br />Check that the backend is running and check the browser console (F12) for errors.
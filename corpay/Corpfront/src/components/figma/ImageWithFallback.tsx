@@ -10,7 +10,7 @@ export function ImageWithFallback(props: React.ImgHTMLAttributes<HTMLImageElemen
     setDidError(true)
   }
 
-  const { src, alt, style, className, ...rest } = props
+  const { src, srcSet, sizes, alt, style, className, ...rest } = props
 
   return didError ? (
     <div
@@ -22,6 +22,6 @@ export function ImageWithFallback(props: React.ImgHTMLAttributes<HTMLImageElemen
       </div>
     </div>
   ) : (
-    <img src={src} alt={alt} className={className} style={style} {...rest} onError={handleError} />
+    <img src={src} srcSet={srcSet} sizes={sizes} alt={alt} className={className} style={style} {...rest} onError={handleError} />
   )
 }